@@ -0,0 +1,136 @@
+"""Initial schema
+
+The tables as originally created by Base.metadata.create_all(). Databases
+created that way before migrations existed should be stamped with this
+revision (alembic stamp 0001) and then upgraded.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Enum values are stored by name, matching SQLAlchemy's Enum(<enum class>)
+user_role = sa.Enum("STUDENT", "ADMIN", name="userrole")
+branch = sa.Enum(
+    "CSE", "MECHANICAL", "ECE", "EEE", "CIVIL", "CHEMICAL", "AEROSPACE", "BIOMEDICAL",
+    name="branch"
+)
+career_goal = sa.Enum(
+    "PYTHON_BACKEND_DEVELOPER", "DATA_ENGINEER", "DEVOPS_ENGINEER", "CLOUD_ENGINEER",
+    "FRONTEND_DEVELOPER", "FULL_STACK_DEVELOPER", "MACHINE_LEARNING_ENGINEER", "MOBILE_DEVELOPER",
+    name="careergoal"
+)
+step_status = sa.Enum("NOT_STARTED", "IN_PROGRESS", "COMPLETED", name="stepstatus")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=True),
+        sa.Column("role", user_role, nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "student_profiles",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("branch", branch, nullable=False),
+        sa.Column("current_year", sa.Integer(), nullable=False),
+        sa.Column("current_semester", sa.Integer(), nullable=False),
+        sa.Column("career_goal", career_goal, nullable=False),
+        sa.Column("current_skills", sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id"),
+    )
+    op.create_index("ix_student_profiles_id", "student_profiles", ["id"])
+
+    op.create_table(
+        "roadmap_templates",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("branch", branch, nullable=True),
+        sa.Column("career_goal", career_goal, nullable=False),
+        sa.Column("start_year", sa.Integer(), nullable=True),
+        sa.Column("end_year", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_roadmap_templates_id", "roadmap_templates", ["id"])
+
+    op.create_table(
+        "roadmap_steps",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("template_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("order", sa.Integer(), nullable=False),
+        sa.Column("estimated_duration", sa.String(), nullable=True),
+        sa.Column("resources", sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(["template_id"], ["roadmap_templates.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_roadmap_steps_id", "roadmap_steps", ["id"])
+
+    op.create_table(
+        "user_roadmaps",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("template_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(["template_id"], ["roadmap_templates.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_user_roadmaps_id", "user_roadmaps", ["id"])
+
+    op.create_table(
+        "user_roadmap_steps",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("roadmap_id", sa.Integer(), nullable=False),
+        sa.Column("step_id", sa.Integer(), nullable=False),
+        sa.Column("status", step_status, nullable=False),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("completed_at", sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(["roadmap_id"], ["user_roadmaps.id"]),
+        sa.ForeignKeyConstraint(["step_id"], ["roadmap_steps.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_user_roadmap_steps_id", "user_roadmap_steps", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_roadmap_steps_id", table_name="user_roadmap_steps")
+    op.drop_table("user_roadmap_steps")
+    op.drop_index("ix_user_roadmaps_id", table_name="user_roadmaps")
+    op.drop_table("user_roadmaps")
+    op.drop_index("ix_roadmap_steps_id", table_name="roadmap_steps")
+    op.drop_table("roadmap_steps")
+    op.drop_index("ix_roadmap_templates_id", table_name="roadmap_templates")
+    op.drop_table("roadmap_templates")
+    op.drop_index("ix_student_profiles_id", table_name="student_profiles")
+    op.drop_table("student_profiles")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_table("users")
+
+    bind = op.get_bind()
+    for enum_type in (step_status, career_goal, branch, user_role):
+        enum_type.drop(bind, checkfirst=True)
@@ -0,0 +1,88 @@
+"""Denormalized roadmap progress counters
+
+Adds the step counters and current step pointer maintained by
+roadmap_service, and backfills them from user_roadmap_steps.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+COUNTERS = ("total_steps", "completed_steps", "in_progress_steps", "not_started_steps")
+
+user_roadmaps = sa.table(
+    "user_roadmaps",
+    sa.column("id", sa.Integer),
+    *[sa.column(name, sa.Integer) for name in COUNTERS],
+    sa.column("current_step_id", sa.Integer),
+)
+user_roadmap_steps = sa.table(
+    "user_roadmap_steps",
+    sa.column("roadmap_id", sa.Integer),
+    sa.column("step_id", sa.Integer),
+    sa.column("status", sa.String),
+)
+roadmap_steps = sa.table(
+    "roadmap_steps",
+    sa.column("id", sa.Integer),
+    sa.column("order", sa.Integer),
+)
+
+
+def _count_steps(status=None):
+    query = sa.select(sa.func.count()).select_from(user_roadmap_steps).where(
+        user_roadmap_steps.c.roadmap_id == user_roadmaps.c.id
+    )
+    if status is not None:
+        query = query.where(user_roadmap_steps.c.status == status)
+    return query.scalar_subquery()
+
+
+def _first_step_with_status(status):
+    return sa.select(user_roadmap_steps.c.step_id).join(
+        roadmap_steps, roadmap_steps.c.id == user_roadmap_steps.c.step_id
+    ).where(
+        user_roadmap_steps.c.roadmap_id == user_roadmaps.c.id,
+        user_roadmap_steps.c.status == status
+    ).order_by(roadmap_steps.c.order).limit(1).scalar_subquery()
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("user_roadmaps") as batch_op:
+        for name in COUNTERS:
+            batch_op.add_column(sa.Column(name, sa.Integer(), server_default="0", nullable=False))
+        batch_op.add_column(sa.Column("current_step_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_user_roadmaps_current_step_id_roadmap_steps",
+            "roadmap_steps",
+            ["current_step_id"],
+            ["id"]
+        )
+
+    op.execute(
+        user_roadmaps.update().values(
+            total_steps=_count_steps(),
+            completed_steps=_count_steps("COMPLETED"),
+            in_progress_steps=_count_steps("IN_PROGRESS"),
+            not_started_steps=_count_steps("NOT_STARTED"),
+            current_step_id=sa.func.coalesce(
+                _first_step_with_status("IN_PROGRESS"),
+                _first_step_with_status("NOT_STARTED")
+            ),
+        )
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("user_roadmaps") as batch_op:
+        batch_op.drop_constraint("fk_user_roadmaps_current_step_id_roadmap_steps", type_="foreignkey")
+        batch_op.drop_column("current_step_id")
+        for name in reversed(COUNTERS):
+            batch_op.drop_column(name)
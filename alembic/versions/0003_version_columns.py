@@ -0,0 +1,27 @@
+"""Version counters for conditional GETs
+
+Adds the version columns that back the roadmap and profile ETags.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table_name in ("user_roadmaps", "student_profiles"):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+
+
+def downgrade() -> None:
+    for table_name in ("student_profiles", "user_roadmaps"):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column("version")
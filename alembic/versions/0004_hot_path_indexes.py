@@ -0,0 +1,73 @@
+"""Indexes for hot query paths
+
+Every roadmap request filters user_roadmaps by user_id and the roadmap's
+steps by (roadmap_id, status) or (roadmap_id, step_id); template steps are
+read by (template_id, order) and templates matched by
+(career_goal, branch, is_active).
+
+On PostgreSQL the indexes are built CONCURRENTLY so the tables stay
+writable. The unique indexes fail on duplicate rows, so the upgrade checks
+for them first and reports what to clean up instead of guessing which rows
+to delete.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, unique)
+INDEXES = (
+    ("ix_user_roadmaps_user_id", "user_roadmaps", ["user_id"], True),
+    ("ix_user_roadmap_steps_roadmap_id_status", "user_roadmap_steps", ["roadmap_id", "status"], False),
+    ("ix_user_roadmap_steps_roadmap_id_step_id", "user_roadmap_steps", ["roadmap_id", "step_id"], True),
+    ("ix_roadmap_steps_template_id_order", "roadmap_steps", ["template_id", "order"], True),
+    (
+        "ix_roadmap_templates_career_goal_branch_is_active",
+        "roadmap_templates",
+        ["career_goal", "branch", "is_active"],
+        False
+    ),
+)
+
+
+def _check_unique(bind, table_name, columns):
+    table = sa.table(table_name, *[sa.column(name) for name in columns])
+    key = [table.c[name] for name in columns]
+    duplicates = bind.execute(
+        sa.select(*key, sa.func.count().label("rows")).group_by(*key).having(sa.func.count() > 1).limit(5)
+    ).all()
+    if duplicates:
+        raise RuntimeError(
+            f"Cannot create a unique index on {table_name}({', '.join(columns)}): "
+            f"duplicate rows exist, e.g. {[tuple(row) for row in duplicates]}. "
+            "Remove the duplicates and rerun the migration."
+        )
+
+
+def upgrade() -> None:
+    context = op.get_context()
+    if not context.as_sql:
+        for _, table_name, columns, unique in INDEXES:
+            if unique:
+                _check_unique(op.get_bind(), table_name, columns)
+
+    if context.dialect.name == "postgresql":
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+        with op.get_context().autocommit_block():
+            for name, table_name, columns, unique in INDEXES:
+                op.create_index(name, table_name, columns, unique=unique, postgresql_concurrently=True)
+    else:
+        for name, table_name, columns, unique in INDEXES:
+            op.create_index(name, table_name, columns, unique=unique)
+
+
+def downgrade() -> None:
+    for name, table_name, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table_name)
@@ -0,0 +1,66 @@
+"""Native timestamps for roadmap progress
+
+Converts user_roadmaps.created_at and user_roadmap_steps.completed_at from
+ISO 8601 strings to TIMESTAMP (naive UTC, as written by the application).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# (table, column, nullable)
+COLUMNS = (
+    ("user_roadmaps", "created_at", False),
+    ("user_roadmap_steps", "completed_at", True),
+)
+
+
+def upgrade() -> None:
+    dialect_name = op.get_context().dialect.name
+    for table_name, column_name, nullable in COLUMNS:
+        if dialect_name == "postgresql":
+            op.alter_column(
+                table_name, column_name,
+                type_=sa.DateTime(), existing_nullable=nullable,
+                postgresql_using=f"{column_name}::timestamp"
+            )
+        else:
+            # SQLite keeps datetimes as text. Changing the type in place would CAST
+            # the values to DATETIME (numeric affinity) and truncate them, so copy
+            # them into a new column in SQLAlchemy's storage format
+            # ("YYYY-MM-DD HH:MM:SS.ffffff") and swap it in
+            temp_name = f"{column_name}_new"
+            with op.batch_alter_table(table_name) as batch_op:
+                batch_op.add_column(sa.Column(temp_name, sa.DateTime(), nullable=True))
+            table = sa.table(table_name, sa.column(column_name, sa.String), sa.column(temp_name, sa.String))
+            op.execute(table.update().values({temp_name: sa.func.replace(table.c[column_name], "T", " ")}))
+            with op.batch_alter_table(table_name) as batch_op:
+                batch_op.drop_column(column_name)
+                batch_op.alter_column(
+                    temp_name, new_column_name=column_name,
+                    existing_type=sa.DateTime(), nullable=nullable
+                )
+
+
+def downgrade() -> None:
+    dialect_name = op.get_context().dialect.name
+    for table_name, column_name, nullable in COLUMNS:
+        if dialect_name == "postgresql":
+            op.alter_column(
+                table_name, column_name,
+                type_=sa.String(), existing_nullable=nullable,
+                postgresql_using=f"to_char({column_name}, 'YYYY-MM-DD\"T\"HH24:MI:SS.US')"
+            )
+        else:
+            with op.batch_alter_table(table_name) as batch_op:
+                batch_op.alter_column(column_name, type_=sa.String(), existing_nullable=nullable)
+            table = sa.table(table_name, sa.column(column_name, sa.String))
+            column = table.c[column_name]
+            op.execute(table.update().where(column.like("% %")).values({column_name: sa.func.replace(column, " ", "T")}))
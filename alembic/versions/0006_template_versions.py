@@ -0,0 +1,66 @@
+"""Template versions for imports
+
+Adds roadmap_templates.version and updated_at and a unique index on
+(name, version), which template imports upsert on, and an index on
+user_roadmap_steps.step_id, which imports probe before deleting a step
+(built CONCURRENTLY on PostgreSQL, as in 0004).
+
+Templates that share a name (e.g. from running the seed script twice) are
+numbered by id, oldest first, rather than collapsed: user roadmaps may
+reference the steps of any of them.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+roadmap_templates = sa.table(
+    "roadmap_templates",
+    sa.column("id", sa.Integer),
+    sa.column("name", sa.String),
+    sa.column("version", sa.Integer),
+)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("roadmap_templates") as batch_op:
+        batch_op.add_column(sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+        batch_op.add_column(sa.Column("updated_at", sa.DateTime(), nullable=True))
+
+    earlier = roadmap_templates.alias("earlier")
+    op.execute(
+        roadmap_templates.update().values(
+            version=sa.select(sa.func.count() + 1).select_from(earlier).where(
+                earlier.c.name == roadmap_templates.c.name,
+                earlier.c.id < roadmap_templates.c.id
+            ).scalar_subquery()
+        )
+    )
+
+    op.create_index(
+        "ix_roadmap_templates_name_version", "roadmap_templates", ["name", "version"], unique=True
+    )
+
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_user_roadmap_steps_step_id", "user_roadmap_steps", ["step_id"],
+                postgresql_concurrently=True
+            )
+    else:
+        op.create_index("ix_user_roadmap_steps_step_id", "user_roadmap_steps", ["step_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_roadmap_steps_step_id", table_name="user_roadmap_steps")
+    op.drop_index("ix_roadmap_templates_name_version", table_name="roadmap_templates")
+    with op.batch_alter_table("roadmap_templates") as batch_op:
+        batch_op.drop_column("updated_at")
+        batch_op.drop_column("version")
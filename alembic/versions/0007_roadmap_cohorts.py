@@ -0,0 +1,145 @@
+"""Cohort analytics
+
+Adds the profile snapshot that defines a roadmap's analytics cohort
+(user_roadmaps.cohort_branch, cohort_year, cohort_career_goal), and the
+roadmap_cohorts table of per-cohort progress aggregates maintained by
+app/services/cohort_analytics.py.
+
+Existing roadmaps take their snapshot from the current profile, which is the
+best information available, and roadmap_cohorts is filled from their
+progress counters.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+# The enum types already exist (0001); values are stored by name
+branch = postgresql.ENUM(
+    "CSE", "MECHANICAL", "ECE", "EEE", "CIVIL", "CHEMICAL", "AEROSPACE", "BIOMEDICAL",
+    name="branch", create_type=False
+)
+career_goal = postgresql.ENUM(
+    "PYTHON_BACKEND_DEVELOPER", "DATA_ENGINEER", "DEVOPS_ENGINEER", "CLOUD_ENGINEER",
+    "FRONTEND_DEVELOPER", "FULL_STACK_DEVELOPER", "MACHINE_LEARNING_ENGINEER", "MOBILE_DEVELOPER",
+    name="careergoal", create_type=False
+)
+
+COHORT_COLUMNS = ("template_id", "cohort_branch", "cohort_year", "cohort_career_goal")
+COUNTERS = ("total_steps", "completed_steps", "in_progress_steps", "not_started_steps")
+
+user_roadmaps = sa.table(
+    "user_roadmaps",
+    sa.column("id", sa.Integer),
+    sa.column("user_id", sa.Integer),
+    sa.column("template_id", sa.Integer),
+    sa.column("cohort_branch", sa.String),
+    sa.column("cohort_year", sa.Integer),
+    sa.column("cohort_career_goal", sa.String),
+    *[sa.column(name, sa.Integer) for name in COUNTERS],
+)
+student_profiles = sa.table(
+    "student_profiles",
+    sa.column("user_id", sa.Integer),
+    sa.column("branch", sa.String),
+    sa.column("current_year", sa.Integer),
+    sa.column("career_goal", sa.String),
+)
+roadmap_cohorts = sa.table(
+    "roadmap_cohorts",
+    sa.column("template_id", sa.Integer),
+    sa.column("branch", sa.String),
+    sa.column("current_year", sa.Integer),
+    sa.column("career_goal", sa.String),
+    sa.column("roadmaps", sa.Integer),
+    sa.column("completed_roadmaps", sa.Integer),
+    *[sa.column(name, sa.Integer) for name in COUNTERS],
+    sa.column("updated_at", sa.DateTime),
+)
+
+
+def _profile_value(column_name):
+    return sa.select(student_profiles.c[column_name]).where(
+        student_profiles.c.user_id == user_roadmaps.c.user_id
+    ).scalar_subquery()
+
+
+def upgrade() -> None:
+    op.create_table(
+        "roadmap_cohorts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("template_id", sa.Integer(), nullable=False),
+        sa.Column("branch", branch, nullable=False),
+        sa.Column("current_year", sa.Integer(), nullable=False),
+        sa.Column("career_goal", career_goal, nullable=False),
+        sa.Column("roadmaps", sa.Integer(), nullable=False),
+        sa.Column("completed_roadmaps", sa.Integer(), nullable=False),
+        *[sa.Column(name, sa.Integer(), nullable=False) for name in COUNTERS],
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["template_id"], ["roadmap_templates.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_roadmap_cohorts_id", "roadmap_cohorts", ["id"])
+    op.create_index(
+        "ix_roadmap_cohorts_cohort", "roadmap_cohorts",
+        ["template_id", "branch", "current_year", "career_goal"], unique=True
+    )
+
+    with op.batch_alter_table("user_roadmaps") as batch_op:
+        batch_op.add_column(sa.Column("cohort_branch", branch, nullable=True))
+        batch_op.add_column(sa.Column("cohort_year", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("cohort_career_goal", career_goal, nullable=True))
+
+    op.execute(
+        user_roadmaps.update().values(
+            cohort_branch=_profile_value("branch"),
+            cohort_year=_profile_value("current_year"),
+            cohort_career_goal=_profile_value("career_goal"),
+        )
+    )
+
+    op.create_index("ix_user_roadmaps_cohort", "user_roadmaps", list(COHORT_COLUMNS))
+
+    now = (
+        sa.text("timezone('utc', now())")
+        if op.get_context().dialect.name == "postgresql" else sa.func.current_timestamp()
+    )
+    is_completed = sa.and_(
+        user_roadmaps.c.total_steps > 0,
+        user_roadmaps.c.completed_steps == user_roadmaps.c.total_steps
+    )
+    cohort = [user_roadmaps.c[name] for name in COHORT_COLUMNS]
+    op.execute(
+        roadmap_cohorts.insert().from_select(
+            [
+                "template_id", "branch", "current_year", "career_goal",
+                "roadmaps", "completed_roadmaps", *COUNTERS, "updated_at",
+            ],
+            sa.select(
+                *cohort,
+                sa.func.count(),
+                sa.func.sum(sa.case((is_completed, 1), else_=0)),
+                *[sa.func.sum(user_roadmaps.c[name]) for name in COUNTERS],
+                now,
+            ).where(user_roadmaps.c.cohort_branch.isnot(None)).group_by(*cohort)
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_roadmaps_cohort", table_name="user_roadmaps")
+    with op.batch_alter_table("user_roadmaps") as batch_op:
+        batch_op.drop_column("cohort_career_goal")
+        batch_op.drop_column("cohort_year")
+        batch_op.drop_column("cohort_branch")
+    op.drop_index("ix_roadmap_cohorts_cohort", table_name="roadmap_cohorts")
+    op.drop_index("ix_roadmap_cohorts_id", table_name="roadmap_cohorts")
+    op.drop_table("roadmap_cohorts")
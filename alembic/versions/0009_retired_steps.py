@@ -0,0 +1,27 @@
+"""Retired template steps
+
+Adds roadmap_steps.is_retired. A template import that drops a step still
+referenced by user roadmaps keeps the row for them but retires it, so new
+roadmaps and the template catalog no longer include it.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("roadmap_steps") as batch_op:
+        batch_op.add_column(sa.Column("is_retired", sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("roadmap_steps") as batch_op:
+        batch_op.drop_column("is_retired")
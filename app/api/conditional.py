@@ -0,0 +1,35 @@
+"""Helpers for conditional GET (ETag / If-None-Match) on versioned resources."""
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+# Clients may cache but must revalidate with If-None-Match before reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(resource: str, resource_id: int, version: int) -> str:
+    """Build a strong ETag from a resource's id and version counter."""
+    return f'"{resource}-{resource_id}-{version}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag."""
+    if_none_match: Optional[str] = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
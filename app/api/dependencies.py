@@ -1,48 +1,139 @@
+from typing import AsyncIterator, Iterator
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.user import User
+from app.database import get_async_replica_session_factory, get_db, get_async_db, get_replica_session_factory, get_session_factory
+from app.models.user import User, UserRole
+from app.core.read_routing import tag_principal, use_replica
 from app.core.security import decode_access_token
+from app.services.principal_cache import Principal, cache_principal, get_cached_principal
 
 # HTTPBearer for JWT Bearer token authentication
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Dependency to get the current authenticated user."""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
-    # Extract token from credentials
-    token = credentials.credentials
-    
+
+
+def _user_id_from_token(token: str) -> int:
+    """Decode the bearer token and return the user id it was issued for."""
     payload = decode_access_token(token)
     if payload is None:
-        raise credentials_exception
-    
-    email: str = payload.get("sub")
-    if email is None:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
-    
-    if not user.is_active:
+        raise _credentials_exception()
+
+    user_id = payload.get("user_id")
+    if payload.get("sub") is None or not isinstance(user_id, int):
+        raise _credentials_exception()
+
+    return user_id
+
+
+def _ensure_active(principal: Principal) -> Principal:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is inactive"
         )
-    
-    return user
 
+    return principal
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """Dependency to get the current authenticated user."""
+    # Extract token from credentials
+    user_id = _user_id_from_token(credentials.credentials)
+    # Commits on this session pin the user's reads to the primary
+    tag_principal(db, user_id)
+
+    # Most requests are served from the principal cache; misses go by primary key
+    principal = get_cached_principal(user_id)
+    if principal is None:
+        user = db.get(User, user_id)
+        if user is None:
+            raise _credentials_exception()
+        principal = cache_principal(user)
 
+    return _ensure_active(principal)
 
 
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """Async dependency to get the current authenticated user."""
+    user_id = _user_id_from_token(credentials.credentials)
+    tag_principal(db, user_id)
+
+    principal = get_cached_principal(user_id)
+    if principal is None:
+        user = await db.get(User, user_id)
+        if user is None:
+            raise _credentials_exception()
+        principal = cache_principal(user)
+
+    return _ensure_active(principal)
+
+
+def get_streaming_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Principal:
+    """get_current_user for long-lived responses: no session is held while the response streams."""
+    user_id = _user_id_from_token(credentials.credentials)
+
+    principal = get_cached_principal(user_id)
+    if principal is None:
+        db = get_session_factory()()
+        try:
+            user = db.get(User, user_id)
+            if user is None:
+                raise _credentials_exception()
+            principal = cache_principal(user)
+        finally:
+            db.close()
+
+    return _ensure_active(principal)
+
+
+def get_read_db(
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Iterator[Session]:
+    """Session for read-only routes: the replica, unless none is configured or the user wrote recently."""
+    if not use_replica(current_user.id):
+        yield db
+        return
+    replica_db = get_replica_session_factory()()
+    try:
+        yield replica_db
+    finally:
+        replica_db.close()
+
+
+async def get_async_read_db(
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+) -> AsyncIterator[AsyncSession]:
+    """Async counterpart of get_read_db."""
+    if not use_replica(current_user.id):
+        yield db
+        return
+    async with get_async_replica_session_factory()() as replica_db:
+        yield replica_db
+
+
+def get_current_admin(current_user: Principal = Depends(get_current_user)) -> Principal:
+    """Dependency restricting a route to admin users."""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+
+    return current_user
@@ -0,0 +1,55 @@
+"""Server-Sent Events responses fed from a pub/sub topic."""
+import asyncio
+from typing import AsyncIterator, Hashable
+
+from fastapi.responses import StreamingResponse
+
+from app.api.serialization import dumps
+from app.core.config import settings
+from app.core.pubsub import get_broker
+
+# Sent on idle streams so proxies keep them open and dead clients are noticed
+KEEPALIVE = b": keepalive\n\n"
+# Reconnection delay EventSource clients use after a stream ends
+RETRY_MILLISECONDS = 1000
+
+
+def format_event(name: str, data) -> bytes:
+    return b"event: " + name.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+async def _events(topic: Hashable) -> AsyncIterator[bytes]:
+    loop = asyncio.get_running_loop()
+    # Streams end after PROGRESS_STREAM_MAX_SECONDS and clients reconnect, which
+    # rebalances them across workers and bounds how long a graceful shutdown
+    # waits for open streams
+    deadline = loop.time() + settings.PROGRESS_STREAM_MAX_SECONDS
+    async with get_broker().subscribe(topic) as subscription:
+        # Subscribed: changes from here on reach the client, so it can load
+        # the current state now without missing any
+        yield f"retry: {RETRY_MILLISECONDS}\n".encode() + format_event("ready", {})
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                event = await asyncio.wait_for(
+                    subscription.get(), min(settings.PROGRESS_STREAM_HEARTBEAT_SECONDS, remaining)
+                )
+            except asyncio.TimeoutError:
+                yield KEEPALIVE
+                continue
+            if event is None:
+                # The broker closed (shutdown); EventSource clients reconnect
+                return
+            yield format_event(event["event"], event["data"])
+
+
+def event_stream_response(topic: Hashable) -> StreamingResponse:
+    """Stream a topic's events until the client disconnects, the broker closes or the stream's time is up."""
+    return StreamingResponse(
+        _events(topic),
+        media_type="text/event-stream",
+        # X-Accel-Buffering stops nginx from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
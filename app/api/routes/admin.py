@@ -0,0 +1,179 @@
+import io
+import tempfile
+import time
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.api.dependencies import get_current_admin, get_read_db
+from app.database import get_async_engine, get_async_replica_engine, get_db, get_engine, get_replica_engine
+from app.core.admission import admission_stats
+from app.core.hashing import get_hashing_pool
+from app.core.instrumentation import query_budget
+from app.core.pool_metrics import pool_status
+from app.core.pubsub import get_broker
+from app.core.read_routing import read_routing
+from app.core.security import token_cache
+from app.models.student_profile import Branch, CareerGoal
+from app.schemas.analytics import CohortRebuildResponse, CohortStatsResponse
+from app.schemas.template import TemplateDiffResponse, TemplateImportReport, TemplateResyncReport
+from app.services.cohort_analytics import get_cohort_stats, rebuild_cohorts
+from app.services.principal_cache import Principal, principal_cache
+from app.services.template_catalog import template_catalog
+from app.services.template_import import FORMATS, TemplateFileError, detect_format, import_templates
+from app.services.template_resync import (
+    DEFAULT_BATCH_SIZE, TemplateDiff, TemplateResyncError, count_roadmaps, diff_templates, resync_roadmaps
+)
+
+# Uploads larger than this are spooled to a temporary file instead of memory
+IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/metrics")
+def get_metrics(current_admin: Principal = Depends(get_current_admin)):
+    """Get in-process cache and worker pool metrics."""
+    return {
+        "principal_cache": principal_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "password_hashing": get_hashing_pool().stats(),
+        "template_catalog": {"reloads": template_catalog.reloads},
+        "read_routing": read_routing.stats(),
+        "admission": admission_stats(),
+        "progress_stream": get_broker().stats(),
+    }
+
+
+@router.get("/metrics/pool")
+def get_pool_metrics(current_admin: Principal = Depends(get_current_admin)):
+    """Get database connection pool occupancy and checkout latency."""
+    pools = {"primary": pool_status("primary", get_engine())}
+    for name, engine in (
+        ("async", get_async_engine()),
+        ("replica", get_replica_engine()),
+        ("async_replica", get_async_replica_engine()),
+    ):
+        if engine is not None:
+            pools[name] = pool_status(name, getattr(engine, "sync_engine", engine))
+    return pools
+
+
+@router.post("/templates/import", response_model=TemplateImportReport)
+async def import_roadmap_templates(
+    request: Request,
+    format: Optional[str] = Query(None, description=f"One of {', '.join(FORMATS)}; defaults to the Content-Type"),
+    current_admin: Principal = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Import roadmap templates from an NDJSON or CSV request body.
+
+    Templates are upserted by (name, version); invalid records are skipped
+    and listed in the report.
+    """
+    file_format = format or detect_format(request.headers.get("content-type"))
+    if file_format not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Send application/x-ndjson or text/csv, or pass format={'|'.join(FORMATS)}"
+        )
+
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        stream = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        try:
+            return await run_in_threadpool(import_templates, db, stream, file_format)
+        except (TemplateFileError, UnicodeDecodeError) as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        finally:
+            stream.detach()
+
+
+def _template_diff(db: Session, template_id: int, target_template_id: Optional[int]) -> TemplateDiff:
+    try:
+        diff = diff_templates(db, template_id, target_template_id)
+    except TemplateResyncError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if diff is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
+    return diff
+
+
+@router.get("/templates/{template_id}/diff", response_model=TemplateDiffResponse)
+def get_template_diff(
+    template_id: int,
+    target_template_id: Optional[int] = Query(None, description="Defaults to the newest later version"),
+    current_admin: Principal = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Preview the step changes a resync onto another template version would apply."""
+    diff = _template_diff(db, template_id, target_template_id)
+    return {
+        "source_template_id": diff.source_template_id,
+        "target_template_id": diff.target_template_id,
+        "steps_matched": len(diff.step_mapping),
+        "added": diff.added,
+        "removed": diff.removed,
+        "reordered": diff.reordered,
+        "roadmaps_affected": count_roadmaps(db, template_id),
+    }
+
+
+@router.post("/templates/{template_id}/resync", response_model=TemplateResyncReport)
+def resync_template_roadmaps(
+    template_id: int,
+    target_template_id: Optional[int] = Query(None, description="Defaults to the newest later version"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=2000),
+    current_admin: Principal = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Move every user roadmap of a template onto another version of it.
+
+    Steps are matched by title; matched steps keep their status and notes.
+    Roadmaps are moved in batches, one transaction each.
+    """
+    return resync_roadmaps(db, _template_diff(db, template_id, target_template_id), batch_size)
+
+
+@router.get(
+    "/analytics/cohorts",
+    response_model=List[CohortStatsResponse],
+    dependencies=[Depends(query_budget(1))]
+)
+def get_cohort_analytics(
+    template_id: Optional[int] = None,
+    branch: Optional[Branch] = None,
+    current_year: Optional[int] = Query(None, ge=1, le=4),
+    career_goal: Optional[CareerGoal] = None,
+    current_admin: Principal = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get completion statistics per template, branch, year and career goal.
+
+    A roadmap counts towards the profile it was generated for. Figures are
+    read from precomputed aggregates, updated in the same transaction as
+    each step update.
+    """
+    return get_cohort_stats(
+        db,
+        template_id=template_id,
+        branch=branch,
+        current_year=current_year,
+        career_goal=career_goal
+    )
+
+
+@router.post("/analytics/cohorts/rebuild", response_model=CohortRebuildResponse)
+def rebuild_cohort_analytics(
+    current_admin: Principal = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Recompute every cohort from the roadmaps' progress counters."""
+    started = time.perf_counter()
+    cohorts = rebuild_cohorts(db)
+    return {"cohorts": cohorts, "elapsed_seconds": round(time.perf_counter() - started, 3)}
@@ -0,0 +1,113 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import timedelta
+from app.core.instrumentation import query_budget
+from app.database import get_async_db
+from app.models.user import User
+from app.schemas.user import RefreshTokenRequest, UserCreate, UserLogin, UserResponse, Token
+from app.core.security import create_access_token
+from app.core.hashing import hash_password_async, verify_password_with_upgrade_async
+from app.core.config import settings
+from app.services.refresh_tokens import (
+    RefreshTokenRejected,
+    issue_refresh_token_async,
+    revoke_refresh_token_async,
+    rotate_refresh_token_async
+)
+
+router = APIRouter(prefix="/auth", tags=["authentication"])
+
+
+def _token_response(user_id: int, email: str, refresh_token: str) -> dict:
+    access_token = create_access_token(
+        data={"sub": email, "user_id": user_id},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(query_budget(3))])
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """Register a new user."""
+    # Check if user already exists
+    existing_user = (await db.execute(
+        select(User).where(User.email == user_data.email).limit(1)
+    )).scalars().first()
+    if existing_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+    
+    # bcrypt runs on the bounded hashing pool, off the event loop
+    hashed_password = await hash_password_async(user_data.password)
+    new_user = User(
+        email=user_data.email,
+        hashed_password=hashed_password,
+        full_name=user_data.full_name
+    )
+    db.add(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    
+    return new_user
+
+
+@router.post("/login", response_model=Token, dependencies=[Depends(query_budget(3))])
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    """Login and get a JWT access token and a refresh token."""
+    user = (await db.execute(
+        select(User).where(User.email == credentials.email).limit(1)
+    )).scalars().first()
+    
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await verify_password_with_upgrade_async(credentials.password, user.hashed_password)
+    
+    if not verified:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive"
+        )
+    
+    # Transparently re-hash when BCRYPT_ROUNDS has changed since the last login
+    if new_hash:
+        user.hashed_password = new_hash
+    refresh_token = await issue_refresh_token_async(db, user.id)
+    await db.commit()
+    
+    return _token_response(user.id, user.email, refresh_token)
+
+
+@router.post("/refresh", response_model=Token, dependencies=[Depends(query_budget(3))])
+async def refresh(token_request: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
+    """Exchange a refresh token for a new access token and refresh token, without a password."""
+    try:
+        user, refresh_token = await rotate_refresh_token_async(db, token_request.refresh_token)
+    except RefreshTokenRejected as exc:
+        if exc.reason == "inactive":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="User account is inactive"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return _token_response(user.user_id, user.email, refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(query_budget(1))])
+async def logout(token_request: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
+    """Revoke the refresh token and every token rotated from the same login."""
+    await revoke_refresh_token_async(db, token_request.refresh_token)
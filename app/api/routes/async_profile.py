@@ -0,0 +1,109 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.instrumentation import query_budget
+from app.database import get_async_db
+from app.services.principal_cache import Principal
+from app.models.student_profile import StudentProfile
+from app.schemas.profile import StudentProfileCreate, StudentProfileUpdate, StudentProfileResponse
+from app.api.conditional import etag_matches, make_etag, not_modified, set_etag
+from app.api.dependencies import get_current_user_async, get_async_read_db
+from app.api.routes.profile import validate_year_and_semester
+
+router = APIRouter(prefix="/profile", tags=["profile"])
+
+
+async def _get_user_profile(db: AsyncSession, user_id: int):
+    return (await db.execute(
+        select(StudentProfile).where(StudentProfile.user_id == user_id).limit(1)
+    )).scalars().first()
+
+
+@router.get("", response_model=StudentProfileResponse, dependencies=[Depends(query_budget(2))])
+async def get_profile(
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get current user's student profile."""
+    profile = await _get_user_profile(db, current_user.id)
+    
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found. Please create your profile first."
+        )
+    
+    etag = make_etag("profile", profile.id, profile.version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    set_etag(response, etag)
+    return profile
+
+
+@router.post("", response_model=StudentProfileResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(query_budget(4))])
+async def create_profile(
+    profile_data: StudentProfileCreate,
+    response: Response,
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create a new student profile."""
+    # Check if profile already exists
+    if await _get_user_profile(db, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Profile already exists. Use PUT to update."
+        )
+    
+    # Validate year and semester
+    validate_year_and_semester(profile_data.model_dump())
+    
+    new_profile = StudentProfile(
+        user_id=current_user.id,
+        **profile_data.model_dump()
+    )
+    db.add(new_profile)
+    await db.commit()
+    await db.refresh(new_profile)
+    
+    set_etag(response, make_etag("profile", new_profile.id, new_profile.version))
+    return new_profile
+
+
+@router.put("", response_model=StudentProfileResponse, dependencies=[Depends(query_budget(4))])
+async def update_profile(
+    profile_data: StudentProfileUpdate,
+    response: Response,
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update student profile."""
+    profile = await _get_user_profile(db, current_user.id)
+    
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found. Please create your profile first."
+        )
+    
+    # Update only provided fields
+    update_data = profile_data.model_dump(exclude_unset=True)
+    
+    # Validate year and semester if provided
+    validate_year_and_semester(update_data)
+    
+    for field, value in update_data.items():
+        setattr(profile, field, value)
+    
+    # Any write invalidates cached copies held by clients; incremented in the
+    # UPDATE itself so concurrent writes cannot both reuse the loaded version
+    profile.version = StudentProfile.version + 1
+    
+    await db.commit()
+    await db.refresh(profile)
+    
+    set_etag(response, make_etag("profile", profile.id, profile.version))
+    return profile
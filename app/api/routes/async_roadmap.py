@@ -0,0 +1,249 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.instrumentation import query_budget
+from app.database import get_async_db
+from app.services.principal_cache import Principal
+from app.models.student_profile import StudentProfile
+from app.schemas.roadmap import (
+    MAX_BATCH_STEP_UPDATES,
+    MAX_STEP_PAGE_SIZE,
+    MAX_STEP_WINDOW_SIZE,
+    RoadmapResponse,
+    RoadmapStepPageResponse,
+    RoadmapSummaryResponse,
+    StepStatusBatchUpdate,
+    StepStatusUpdate
+)
+from app.services.roadmap_service import (
+    generate_roadmap_for_user_async,
+    get_roadmap_document_async,
+    get_roadmap_step_page_async,
+    get_roadmap_step_window_async,
+    get_user_roadmap_async,
+    get_roadmap_summary_async,
+    update_step_status_async,
+    update_step_statuses_async
+)
+from app.api.conditional import etag_matches, make_etag, not_modified, set_etag
+from app.api.serialization import FastJSONResponse
+from app.api.dependencies import get_current_user_async, get_async_read_db, get_streaming_user
+from app.api.event_stream import event_stream_response
+from app.services.progress_events import progress_topic
+
+router = APIRouter(prefix="/roadmap", tags=["roadmap"])
+
+
+@router.get("", response_model=RoadmapResponse, dependencies=[Depends(query_budget(3))])
+async def get_roadmap(
+    request: Request,
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get user's personalized roadmap with progress."""
+    roadmap = await get_user_roadmap_async(db, current_user.id)
+    
+    if not roadmap:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Roadmap not found. Please generate a roadmap first."
+        )
+    
+    # Unchanged roadmaps are answered from the version alone, without loading steps
+    etag = make_etag("roadmap", roadmap.id, roadmap.version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    # Built from plain rows and encoded directly, bypassing response_model validation
+    response = FastJSONResponse(await get_roadmap_document_async(db, roadmap))
+    set_etag(response, etag)
+    return response
+
+
+@router.get("/summary", response_model=RoadmapSummaryResponse, dependencies=[Depends(query_budget(2))])
+async def get_summary(
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get roadmap progress counters without loading the step list."""
+    summary = await get_roadmap_summary_async(db, current_user.id)
+    
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Roadmap not found. Please generate a roadmap first."
+        )
+    
+    etag = make_etag("roadmap", summary["id"], summary["version"])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    set_etag(response, etag)
+    return summary
+
+
+@router.get("/steps", response_model=RoadmapStepPageResponse, dependencies=[Depends(query_budget(3))])
+async def list_steps(
+    request: Request,
+    response: Response,
+    after: Optional[int] = Query(None, description="Return steps with an order greater than this (next_cursor)"),
+    before: Optional[int] = Query(None, description="Return steps with an order less than this (prev_cursor)"),
+    limit: int = Query(50, ge=1, le=MAX_STEP_PAGE_SIZE),
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get one page of roadmap steps, keyset-paginated by step order, with progress counters."""
+    if after is not None and before is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pass either after or before, not both"
+        )
+    
+    summary = await get_roadmap_summary_async(db, current_user.id)
+    
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Roadmap not found. Please generate a roadmap first."
+        )
+    
+    etag = make_etag("roadmap", summary["id"], summary["version"])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    set_etag(response, etag)
+    return await get_roadmap_step_page_async(db, summary, limit=limit, after=after, before=before)
+
+
+@router.get("/window", response_model=RoadmapStepPageResponse, dependencies=[Depends(query_budget(4))])
+async def get_step_window(
+    request: Request,
+    response: Response,
+    steps_before: int = Query(5, ge=0, le=MAX_STEP_WINDOW_SIZE),
+    steps_after: int = Query(20, ge=0, le=MAX_STEP_WINDOW_SIZE),
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get the steps around the current step, with progress counters.
+    
+    Returns the current step, up to steps_before steps before it and up to
+    steps_after after it. Once every step is completed the window ends at
+    the last step. Continue from either edge with GET /roadmap/steps.
+    """
+    summary = await get_roadmap_summary_async(db, current_user.id)
+    
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Roadmap not found. Please generate a roadmap first."
+        )
+    
+    etag = make_etag("roadmap", summary["id"], summary["version"])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    set_etag(response, etag)
+    return await get_roadmap_step_window_async(db, summary, steps_before=steps_before, steps_after=steps_after)
+
+
+@router.post("/generate", response_model=RoadmapResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(query_budget(13))])
+async def generate_roadmap(
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Generate a new roadmap based on user's profile."""
+    # Check if profile exists
+    profile = (await db.execute(
+        select(StudentProfile).where(StudentProfile.user_id == current_user.id).limit(1)
+    )).scalars().first()
+    
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Profile not found. Please create your profile first."
+        )
+    
+    # Generate roadmap
+    roadmap = await generate_roadmap_for_user_async(db, current_user.id, profile)
+    
+    if not roadmap:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No matching roadmap template found for your profile. Please contact admin."
+        )
+    
+    # Get roadmap with progress
+    roadmap = await get_user_roadmap_async(db, current_user.id)
+    return FastJSONResponse(await get_roadmap_document_async(db, roadmap), status_code=status.HTTP_201_CREATED)
+
+
+@router.put("/steps", response_model=RoadmapSummaryResponse, dependencies=[Depends(query_budget(MAX_BATCH_STEP_UPDATES + 4))])
+async def update_steps(
+    batch: StepStatusBatchUpdate,
+    response: Response,
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Apply several step status updates in order, in one transaction.
+    
+    Returns the resulting roadmap summary. If any step does not belong to the
+    user's roadmap, none of the updates are applied.
+    """
+    summary = await update_step_statuses_async(
+        db=db,
+        user_id=current_user.id,
+        updates=[(item.step_id, item.status, item.notes) for item in batch.updates]
+    )
+    
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Step not found or does not belong to your roadmap"
+        )
+    
+    set_etag(response, make_etag("roadmap", summary["id"], summary["version"]))
+    return summary
+
+
+@router.put("/steps/{step_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(query_budget(4))])
+async def update_step(
+    step_id: int,
+    step_update: StepStatusUpdate,
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update the status of a roadmap step."""
+    updated_step = await update_step_status_async(
+        db=db,
+        user_id=current_user.id,
+        step_id=step_id,
+        status=step_update.status,
+        notes=step_update.notes
+    )
+    
+    if not updated_step:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Step not found or does not belong to your roadmap"
+        )
+    
+    return {
+        "message": "Step updated successfully",
+        "step_id": updated_step.step_id,
+        "status": updated_step.status
+    }
+
+
+@router.get("/events", dependencies=[Depends(query_budget(1))])
+async def stream_progress(current_user: Principal = Depends(get_streaming_user)):
+    """Server-Sent Events stream of the user's roadmap progress changes.
+    
+    Sends "ready" once subscribed, then a "progress" delta (changed steps and
+    new counters) after every step update and "roadmap" when a roadmap is
+    generated. "resync" means events were dropped for a slow client: reload
+    GET /api/roadmap.
+    """
+    return event_stream_response(progress_topic(current_user.id))
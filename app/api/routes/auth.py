@@ -1,16 +1,32 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import timedelta
+from app.core.instrumentation import query_budget
 from app.database import get_db
 from app.models.user import User
-from app.schemas.user import UserCreate, UserLogin, UserResponse, Token
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.schemas.user import RefreshTokenRequest, UserCreate, UserLogin, UserResponse, Token
+from app.core.security import create_access_token
+from app.core.hashing import hash_password, verify_password_with_upgrade
 from app.core.config import settings
+from app.services.refresh_tokens import (
+    RefreshTokenRejected,
+    issue_refresh_token,
+    revoke_refresh_token,
+    rotate_refresh_token
+)
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+def _token_response(user_id: int, email: str, refresh_token: str) -> dict:
+    access_token = create_access_token(
+        data={"sub": email, "user_id": user_id},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(query_budget(3))])
 def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user."""
     # Check if user already exists
@@ -22,7 +38,8 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    # bcrypt runs on the bounded hashing pool, not the request thread
+    hashed_password = hash_password(user_data.password)
     new_user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -35,12 +52,16 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     return new_user
 
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(query_budget(3))])
 def login(credentials: UserLogin, db: Session = Depends(get_db)):
-    """Login and get JWT token."""
+    """Login and get a JWT access token and a refresh token."""
     user = db.query(User).filter(User.email == credentials.email).first()
     
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = verify_password_with_upgrade(credentials.password, user.hashed_password)
+    
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -53,15 +74,36 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
             detail="User account is inactive"
         )
     
-    # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email, "user_id": user.id},
-        expires_delta=access_token_expires
-    )
+    # Transparently re-hash when BCRYPT_ROUNDS has changed since the last login
+    if new_hash:
+        user.hashed_password = new_hash
+    refresh_token = issue_refresh_token(db, user.id)
+    db.commit()
     
-    return {"access_token": access_token, "token_type": "bearer"}
+    return _token_response(user.id, user.email, refresh_token)
 
 
+@router.post("/refresh", response_model=Token, dependencies=[Depends(query_budget(3))])
+def refresh(token_request: RefreshTokenRequest, db: Session = Depends(get_db)):
+    """Exchange a refresh token for a new access token and refresh token, without a password."""
+    try:
+        user, refresh_token = rotate_refresh_token(db, token_request.refresh_token)
+    except RefreshTokenRejected as exc:
+        if exc.reason == "inactive":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="User account is inactive"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return _token_response(user.user_id, user.email, refresh_token)
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(query_budget(1))])
+def logout(token_request: RefreshTokenRequest, db: Session = Depends(get_db)):
+    """Revoke the refresh token and every token rotated from the same login."""
+    revoke_refresh_token(db, token_request.refresh_token)
@@ -1,18 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
+from app.core.instrumentation import query_budget
 from app.database import get_db
-from app.models.user import User
+from app.services.principal_cache import Principal
 from app.models.student_profile import StudentProfile
 from app.schemas.profile import StudentProfileCreate, StudentProfileUpdate, StudentProfileResponse
-from app.api.dependencies import get_current_user
+from app.api.conditional import etag_matches, make_etag, not_modified, set_etag
+from app.api.dependencies import get_current_user, get_read_db
 
 router = APIRouter(prefix="/profile", tags=["profile"])
 
 
-@router.get("", response_model=StudentProfileResponse)
+def validate_year_and_semester(profile_data: dict) -> None:
+    """Validate current_year and current_semester when they are provided."""
+    if "current_year" in profile_data:
+        if profile_data["current_year"] < 1 or profile_data["current_year"] > 4:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Current year must be between 1 and 4"
+            )
+    
+    if "current_semester" in profile_data:
+        if profile_data["current_semester"] < 1 or profile_data["current_semester"] > 2:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Current semester must be 1 or 2"
+            )
+
+
+@router.get("", response_model=StudentProfileResponse, dependencies=[Depends(query_budget(2))])
 def get_profile(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get current user's student profile."""
     profile = db.query(StudentProfile).filter(StudentProfile.user_id == current_user.id).first()
@@ -23,13 +44,19 @@ def get_profile(
             detail="Profile not found. Please create your profile first."
         )
     
+    etag = make_etag("profile", profile.id, profile.version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    set_etag(response, etag)
     return profile
 
 
-@router.post("", response_model=StudentProfileResponse, status_code=status.HTTP_201_CREATED)
+@router.post("", response_model=StudentProfileResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(query_budget(4))])
 def create_profile(
     profile_data: StudentProfileCreate,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new student profile."""
@@ -45,17 +72,7 @@ def create_profile(
         )
     
     # Validate year and semester
-    if profile_data.current_year < 1 or profile_data.current_year > 4:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Current year must be between 1 and 4"
-        )
-    
-    if profile_data.current_semester < 1 or profile_data.current_semester > 2:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Current semester must be 1 or 2"
-        )
+    validate_year_and_semester(profile_data.model_dump())
     
     new_profile = StudentProfile(
         user_id=current_user.id,
@@ -65,13 +82,15 @@ def create_profile(
     db.commit()
     db.refresh(new_profile)
     
+    set_etag(response, make_etag("profile", new_profile.id, new_profile.version))
     return new_profile
 
 
-@router.put("", response_model=StudentProfileResponse)
+@router.put("", response_model=StudentProfileResponse, dependencies=[Depends(query_budget(4))])
 def update_profile(
     profile_data: StudentProfileUpdate,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update student profile."""
@@ -87,28 +106,17 @@ def update_profile(
     update_data = profile_data.model_dump(exclude_unset=True)
     
     # Validate year and semester if provided
-    if "current_year" in update_data:
-        if update_data["current_year"] < 1 or update_data["current_year"] > 4:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Current year must be between 1 and 4"
-            )
-    
-    if "current_semester" in update_data:
-        if update_data["current_semester"] < 1 or update_data["current_semester"] > 2:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Current semester must be 1 or 2"
-            )
+    validate_year_and_semester(update_data)
     
     for field, value in update_data.items():
         setattr(profile, field, value)
     
+    # Any write invalidates cached copies held by clients; incremented in the
+    # UPDATE itself so concurrent writes cannot both reuse the loaded version
+    profile.version = StudentProfile.version + 1
+    
     db.commit()
     db.refresh(profile)
     
+    set_etag(response, make_etag("profile", profile.id, profile.version))
     return profile
-
-
-
-
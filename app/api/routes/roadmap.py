@@ -1,40 +1,157 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
+from app.core.instrumentation import query_budget
 from app.database import get_db
-from app.models.user import User
+from app.services.principal_cache import Principal
 from app.models.student_profile import StudentProfile
-from app.schemas.roadmap import RoadmapResponse, StepStatusUpdate
+from app.schemas.roadmap import (
+    MAX_BATCH_STEP_UPDATES,
+    MAX_STEP_PAGE_SIZE,
+    MAX_STEP_WINDOW_SIZE,
+    RoadmapResponse,
+    RoadmapStepPageResponse,
+    RoadmapSummaryResponse,
+    StepStatusBatchUpdate,
+    StepStatusUpdate
+)
 from app.services.roadmap_service import (
     generate_roadmap_for_user,
-    get_roadmap_with_progress,
-    update_step_status
+    get_roadmap_document,
+    get_roadmap_step_page,
+    get_roadmap_step_window,
+    get_user_roadmap,
+    get_roadmap_summary,
+    update_step_status,
+    update_step_statuses
 )
-from app.api.dependencies import get_current_user
+from app.api.conditional import etag_matches, make_etag, not_modified, set_etag
+from app.api.serialization import FastJSONResponse
+from app.api.dependencies import get_current_user, get_read_db, get_streaming_user
+from app.api.event_stream import event_stream_response
+from app.services.progress_events import progress_topic
 from app.models.roadmap_steps import StepStatus
 
 router = APIRouter(prefix="/roadmap", tags=["roadmap"])
 
 
-@router.get("", response_model=RoadmapResponse)
+@router.get("", response_model=RoadmapResponse, dependencies=[Depends(query_budget(3))])
 def get_roadmap(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get user's personalized roadmap with progress."""
-    roadmap_data = get_roadmap_with_progress(db, current_user.id)
+    roadmap = get_user_roadmap(db, current_user.id)
+    
+    if not roadmap:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Roadmap not found. Please generate a roadmap first."
+        )
+    
+    # Unchanged roadmaps are answered from the version alone, without loading steps
+    etag = make_etag("roadmap", roadmap.id, roadmap.version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    # Built from plain rows and encoded directly, bypassing response_model validation
+    response = FastJSONResponse(get_roadmap_document(db, roadmap))
+    set_etag(response, etag)
+    return response
+
+
+@router.get("/summary", response_model=RoadmapSummaryResponse, dependencies=[Depends(query_budget(2))])
+def get_summary(
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get roadmap progress counters without loading the step list."""
+    summary = get_roadmap_summary(db, current_user.id)
+    
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Roadmap not found. Please generate a roadmap first."
+        )
+    
+    etag = make_etag("roadmap", summary["id"], summary["version"])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    set_etag(response, etag)
+    return summary
+
+
+@router.get("/steps", response_model=RoadmapStepPageResponse, dependencies=[Depends(query_budget(3))])
+def list_steps(
+    request: Request,
+    response: Response,
+    after: Optional[int] = Query(None, description="Return steps with an order greater than this (next_cursor)"),
+    before: Optional[int] = Query(None, description="Return steps with an order less than this (prev_cursor)"),
+    limit: int = Query(50, ge=1, le=MAX_STEP_PAGE_SIZE),
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get one page of roadmap steps, keyset-paginated by step order, with progress counters."""
+    if after is not None and before is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pass either after or before, not both"
+        )
+    
+    summary = get_roadmap_summary(db, current_user.id)
+    
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Roadmap not found. Please generate a roadmap first."
+        )
+    
+    etag = make_etag("roadmap", summary["id"], summary["version"])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    set_etag(response, etag)
+    return get_roadmap_step_page(db, summary, limit=limit, after=after, before=before)
+
+
+@router.get("/window", response_model=RoadmapStepPageResponse, dependencies=[Depends(query_budget(4))])
+def get_step_window(
+    request: Request,
+    response: Response,
+    steps_before: int = Query(5, ge=0, le=MAX_STEP_WINDOW_SIZE),
+    steps_after: int = Query(20, ge=0, le=MAX_STEP_WINDOW_SIZE),
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get the steps around the current step, with progress counters.
     
-    if not roadmap_data:
+    Returns the current step, up to steps_before steps before it and up to
+    steps_after after it. Once every step is completed the window ends at
+    the last step. Continue from either edge with GET /roadmap/steps.
+    """
+    summary = get_roadmap_summary(db, current_user.id)
+    
+    if not summary:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Roadmap not found. Please generate a roadmap first."
         )
     
-    return roadmap_data
+    etag = make_etag("roadmap", summary["id"], summary["version"])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    set_etag(response, etag)
+    return get_roadmap_step_window(db, summary, steps_before=steps_before, steps_after=steps_after)
 
 
-@router.post("/generate", response_model=RoadmapResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/generate", response_model=RoadmapResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(query_budget(13))])
 def generate_roadmap(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Generate a new roadmap based on user's profile."""
@@ -57,15 +174,43 @@ def generate_roadmap(
         )
     
     # Get roadmap with progress
-    roadmap_data = get_roadmap_with_progress(db, current_user.id)
-    return roadmap_data
+    roadmap = get_user_roadmap(db, current_user.id)
+    return FastJSONResponse(get_roadmap_document(db, roadmap), status_code=status.HTTP_201_CREATED)
+
+
+@router.put("/steps", response_model=RoadmapSummaryResponse, dependencies=[Depends(query_budget(MAX_BATCH_STEP_UPDATES + 4))])
+def update_steps(
+    batch: StepStatusBatchUpdate,
+    response: Response,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Apply several step status updates in order, in one transaction.
+    
+    Returns the resulting roadmap summary. If any step does not belong to the
+    user's roadmap, none of the updates are applied.
+    """
+    summary = update_step_statuses(
+        db=db,
+        user_id=current_user.id,
+        updates=[(item.step_id, item.status, item.notes) for item in batch.updates]
+    )
+    
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Step not found or does not belong to your roadmap"
+        )
+    
+    set_etag(response, make_etag("roadmap", summary["id"], summary["version"]))
+    return summary
 
 
-@router.put("/steps/{step_id}", status_code=status.HTTP_200_OK)
+@router.put("/steps/{step_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(query_budget(4))])
 def update_step(
     step_id: int,
     step_update: StepStatusUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update the status of a roadmap step."""
@@ -90,5 +235,13 @@ def update_step(
     }
 
 
-
-
+@router.get("/events", dependencies=[Depends(query_budget(1))])
+async def stream_progress(current_user: Principal = Depends(get_streaming_user)):
+    """Server-Sent Events stream of the user's roadmap progress changes.
+    
+    Sends "ready" once subscribed, then a "progress" delta (changed steps and
+    new counters) after every step update and "roadmap" when a roadmap is
+    generated. "resync" means events were dropped for a slow client: reload
+    GET /api/roadmap.
+    """
+    return event_stream_response(progress_topic(current_user.id))
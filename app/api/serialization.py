@@ -0,0 +1,39 @@
+"""Fast JSON responses for payloads that are already shaped like their response model."""
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder produces the same bytes
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content exactly as Starlette's JSONResponse would, using orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(content)
+        except TypeError:
+            # orjson rejects a few inputs the stdlib accepts (e.g. ints over 64 bits)
+            pass
+
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that skips response_model validation.
+
+    Returning it from a route bypasses FastAPI's serialization, so the content
+    must already match the declared response model, key order included.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,203 @@
+"""
+Per-router admission control.
+
+Every route group (auth, refresh, profile, roadmap) may run a limited number of
+requests at once. Requests over the limit wait in a bounded FIFO queue for up
+to ADMISSION_QUEUE_TIMEOUT_SECONDS. When the queue is full, or the wait runs
+out, the request is shed with 503 and Retry-After before any work is done.
+Sync routes share one threadpool (40 threads by default). Keeping the sum of
+the group limits below that size stops a login storm, whose requests sit on
+threads waiting for bcrypt, from starving roadmap reads.
+
+AdmissionControlMiddleware is a plain ASGI middleware, so a shed request
+costs almost nothing. It sits outside the SQL instrumentation, so shed
+requests are counted here and are not logged per request. The limiter runs
+on the event loop and needs no locks. A slot is held until the response
+starts, so streaming bodies do not hold it. Admin and health routes are not
+limited, so metrics stay reachable under overload.
+"""
+import asyncio
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+
+# Path prefix -> route group; the first matching prefix wins, so more
+# specific prefixes come first. Refreshes are cheap and must not queue
+# behind bcrypt-bound logins.
+ROUTE_GROUPS = {
+    "/api/auth/refresh": "refresh",
+    "/api/auth": "auth",
+    "/api/profile": "profile",
+    "/api/roadmap": "roadmap",
+}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a route group is at its concurrency limit and its queue is full or the wait timed out."""
+
+    def __init__(self, group: str, reason: str):
+        super().__init__(f"{group}: {reason}")
+        self.group = group
+        self.reason = reason
+
+
+class AdmissionLimiter:
+    """Concurrency limit with a bounded FIFO wait queue for one route group."""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout_seconds: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.active = 0
+        self._waiters: "deque[asyncio.Future]" = deque()
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        self.peak_queued = 0
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting in the queue if needed; raises AdmissionRejected."""
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.shed_queue_full += 1
+            raise AdmissionRejected(self.name, "queue full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.peak_queued = max(self.peak_queued, len(self._waiters))
+        try:
+            # asyncio.wait does not cancel the future on timeout, so a slot
+            # handed over at the deadline is not lost
+            await asyncio.wait((waiter,), timeout=self.queue_timeout_seconds)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        if not waiter.done():
+            self._abandon(waiter)
+            self.shed_timeout += 1
+            raise AdmissionRejected(self.name, "queue timeout")
+        self.admitted += 1
+
+    def release(self) -> None:
+        """Give the slot to the next waiter, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot passes straight to the waiter; active is unchanged
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # Granted just as the wait ended: hand the slot on
+            self.release()
+            return
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queued": sum(1 for waiter in self._waiters if not waiter.done()),
+            "peak_queued": self.peak_queued,
+            "admitted": self.admitted,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+        }
+
+
+_limiters: Optional[Dict[str, AdmissionLimiter]] = None
+_limiters_lock = threading.Lock()
+
+
+def get_limiters() -> Dict[str, AdmissionLimiter]:
+    """Get the per-group limiters, creating them from the settings on first use."""
+    global _limiters
+    if _limiters is None:
+        with _limiters_lock:
+            if _limiters is None:
+                _limiters = {
+                    group: AdmissionLimiter(
+                        group,
+                        max_concurrent=getattr(settings, f"ADMISSION_{group.upper()}_CONCURRENCY"),
+                        max_queue=getattr(settings, f"ADMISSION_{group.upper()}_QUEUE"),
+                        queue_timeout_seconds=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+                    )
+                    for group in ROUTE_GROUPS.values()
+                }
+    return _limiters
+
+
+def limiter_for_path(path: str) -> Optional[AdmissionLimiter]:
+    """The limiter guarding a request path, or None if the path is not limited."""
+    if not settings.ADMISSION_CONTROL:
+        return None
+    for prefix, group in ROUTE_GROUPS.items():
+        if path == prefix or path.startswith(prefix + "/"):
+            return get_limiters()[group]
+    return None
+
+
+def admission_stats() -> dict:
+    return {
+        "enabled": settings.ADMISSION_CONTROL,
+        "queue_timeout_seconds": settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        "groups": {group: limiter.stats() for group, limiter in get_limiters().items()},
+    }
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware applying the per-group limiters to HTTP requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        limiter = limiter_for_path(scope["path"]) if scope["type"] == "http" else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limiter.acquire()
+        except AdmissionRejected:
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": "Server is busy. Please retry shortly."},
+                headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+            )
+            await response(scope, receive, send)
+            return
+
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                limiter.release()
+
+        async def send_and_release(message):
+            if message["type"] == "http.response.start":
+                release()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_release)
+        finally:
+            release()
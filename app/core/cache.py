@@ -0,0 +1,81 @@
+"""Small thread-safe TTL + LRU cache with hit/miss counters."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Union
+
+
+class TTLCache:
+    """Bounded mapping whose entries expire after a TTL; least recently used entries are evicted first.
+
+    maxsize and ttl_seconds may be zero-argument callables, resolved on first
+    use, so a module-level cache sized from the settings does not read them
+    at import.
+    """
+
+    def __init__(self, maxsize: Union[int, Callable[[], int]], ttl_seconds: Union[float, Callable[[], float]]):
+        self._maxsize = maxsize
+        self._ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def maxsize(self) -> int:
+        if callable(self._maxsize):
+            self._maxsize = self._maxsize()
+        return self._maxsize
+
+    @property
+    def ttl_seconds(self) -> float:
+        if callable(self._ttl_seconds):
+            self._ttl_seconds = self._ttl_seconds()
+        return self._ttl_seconds
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value; ttl_seconds may shorten (never extend) the default TTL."""
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.maxsize,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
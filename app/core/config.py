@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -6,10 +7,86 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     
+    # Connection pool (defaults match SQLAlchemy's); DB_POOL_RECYCLE=-1 disables recycling
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    
+    # Startup (FastAPI lifespan): connections opened per engine before the
+    # app reports ready (default: DB_POOL_SIZE, 0 disables), and whether to
+    # create missing tables (turn off where Alembic manages the schema)
+    DB_POOL_WARMUP_CONNECTIONS: Optional[int] = None
+    DB_CREATE_TABLES: bool = True
+    
+    # Opt-in async database and route stack. ASYNC_DATABASE_URL defaults to
+    # DATABASE_URL with an async driver (aiosqlite / asyncpg).
+    ASYNC_DATABASE: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+    
+    # Optional read replica for pure reads (the async URL is derived the same
+    # way unless REPLICA_ASYNC_DATABASE_URL is set). After a user's write
+    # commits, that user's reads stay on the primary for
+    # REPLICA_READ_YOUR_WRITES_SECONDS; set it above the replica's worst lag,
+    # or to 0 to always read from the replica.
+    REPLICA_DATABASE_URL: Optional[str] = None
+    REPLICA_ASYNC_DATABASE_URL: Optional[str] = None
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = 5.0
+    REPLICA_PIN_MAX_USERS: int = 100000
+    
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Rotating refresh tokens returned by login and /auth/refresh
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    
+    # Verified token cache; entries never outlive the token's exp
+    TOKEN_CACHE_TTL_SECONDS: int = 1800
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    
+    # Authenticated principal cache (keyed by user id)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    
+    # Password hashing: bcrypt cost factor and the bounded worker pool that
+    # runs it (requests beyond workers + queue are rejected with 503)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 16
+    
+    # Admission control: concurrent requests per route group and how many
+    # more may wait (at most ADMISSION_QUEUE_TIMEOUT_SECONDS) before being
+    # shed with 503. Keep the concurrency sum below the threadpool size (40).
+    ADMISSION_CONTROL: bool = True
+    ADMISSION_AUTH_CONCURRENCY: int = 4
+    ADMISSION_AUTH_QUEUE: int = 32
+    ADMISSION_REFRESH_CONCURRENCY: int = 4
+    ADMISSION_REFRESH_QUEUE: int = 64
+    ADMISSION_PROFILE_CONCURRENCY: int = 8
+    ADMISSION_PROFILE_QUEUE: int = 64
+    ADMISSION_ROADMAP_CONCURRENCY: int = 20
+    ADMISSION_ROADMAP_QUEUE: int = 128
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    
+    # Template catalog: how often to re-check roadmap_templates for changes
+    # made outside this process
+    TEMPLATE_CATALOG_TTL_SECONDS: int = 300
+    
+    # Progress stream (GET /api/roadmap/events): pub/sub backend ("memory",
+    # per process, or "package.module:ClassName"), events buffered per slow
+    # client before it is told to resync, the keepalive comment interval and
+    # how long a stream lasts before the client is made to reconnect
+    PROGRESS_BROKER: str = "memory"
+    PROGRESS_STREAM_MAX_PENDING: int = 100
+    PROGRESS_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    PROGRESS_STREAM_MAX_SECONDS: float = 300.0
+    
+    # Per-request SQL instrumentation: raise instead of warning when a route
+    # exceeds its declared query budget (meant for tests)
+    QUERY_BUDGET_STRICT: bool = False
     
     # Environment
     ENVIRONMENT: str = "development"
@@ -19,8 +96,21 @@ class Settings(BaseSettings):
         case_sensitive = True
 
 
-settings = Settings()
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Read the settings from the environment and .env, once per process."""
+    return Settings()
+
+
+class _LazySettings:
+    """Stand-in for Settings that reads the environment on first attribute access.
 
+    Importing this module (and everything that imports `settings`) therefore
+    neither reads .env nor fails when DATABASE_URL is unset.
+    """
 
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
 
 
+settings = _LazySettings()
@@ -0,0 +1,109 @@
+"""
+Bounded worker pool for password hashing.
+
+bcrypt is deliberately expensive, so hashing and verification run on a
+small dedicated thread pool (bcrypt releases the GIL while hashing) instead
+of on request threads. Work beyond the pool size waits in a bounded queue;
+once that is full, new work is rejected immediately so a login burst fails
+fast instead of starving every other endpoint.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_and_update_password
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the password hashing pool and its queue are full."""
+
+
+class BoundedHashingPool:
+    """Thread pool with a hard limit on running plus queued tasks."""
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Schedule fn(*args), or raise PasswordHashingBusy if the queue is full."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHashingBusy()
+
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def run(self, fn: Callable, *args):
+        """Run fn(*args) on the pool and wait for the result."""
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable, *args):
+        """Run fn(*args) on the pool without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.max_workers),
+            "rejected": self.rejected,
+        }
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+
+_pool: Optional[BoundedHashingPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool() -> BoundedHashingPool:
+    """Get the process-wide hashing pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BoundedHashingPool(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+                )
+    return _pool
+
+
+def hash_password(password: str) -> str:
+    """Hash a password on the bounded pool."""
+    return get_hashing_pool().run(get_password_hash, password)
+
+
+def verify_password_with_upgrade(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password on the bounded pool; also return a rehash if its cost is outdated."""
+    return get_hashing_pool().run(verify_and_update_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bounded pool from async code."""
+    return await get_hashing_pool().run_async(get_password_hash, password)
+
+
+async def verify_password_with_upgrade_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password on the bounded pool from async code."""
+    return await get_hashing_pool().run_async(verify_and_update_password, plain_password, hashed_password)
@@ -0,0 +1,88 @@
+"""
+Per-request SQL instrumentation.
+
+Engine event hooks count statements and time spent in the database for the
+request being served (tracked through a context variable), which the HTTP
+middleware reports as a Server-Timing header and a structured log line.
+
+Routes can declare a statement budget with the query_budget() dependency.
+Going over it logs a warning, or raises QueryBudgetExceeded when
+QUERY_BUDGET_STRICT is enabled so tests fail on N+1 regressions.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode when a request runs more statements than its budget."""
+
+
+@dataclass
+class QueryStats:
+    """Statements executed and database time for one request."""
+    count: int = 0
+    db_ms: float = 0.0
+    budget: Optional[int] = None
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(budget: Optional[int] = None) -> Iterator[QueryStats]:
+    """Count statements executed in this context (and threads started from it)."""
+    stats = QueryStats(budget=budget)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def query_budget(max_statements: int):
+    """Route dependency declaring the most SQL statements the endpoint may run."""
+    def set_budget():
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.budget = max_statements
+    return set_budget
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None or not conn.info.get("query_start"):
+        return
+
+    stats.db_ms += (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+    stats.count += 1
+    if settings.QUERY_BUDGET_STRICT and stats.over_budget:
+        raise QueryBudgetExceeded(
+            f"{stats.count} SQL statements executed, budget is {stats.budget}: {statement[:200]}"
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the statement counting hooks to an engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,124 @@
+"""
+Connection pool configuration and live pool statistics.
+
+Engines built with pool_options() use an instrumented subclass of their
+dialect's queue pool that records how long each checkout took and whether
+it had to wait for a connection, so the pool can be sized from data.
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+
+# Recent checkout latencies kept for percentiles
+LATENCY_SAMPLES = 1024
+
+
+class PoolMetrics:
+    """Counters for one engine's connection pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.total_checkout_ms = 0.0
+        self.max_checkout_ms = 0.0
+        self._recent_ms = deque(maxlen=LATENCY_SAMPLES)
+
+    def record_checkout(self, elapsed_ms: float, waited: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.waits += waited
+            self.total_checkout_ms += elapsed_ms
+            self.max_checkout_ms = max(self.max_checkout_ms, elapsed_ms)
+            self._recent_ms.append(elapsed_ms)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            recent = sorted(self._recent_ms)
+            checkouts = self.checkouts
+            stats = {
+                "checkouts": checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "avg_checkout_ms": round(self.total_checkout_ms / checkouts, 3) if checkouts else 0.0,
+                "max_checkout_ms": round(self.max_checkout_ms, 3),
+            }
+        for pct in (50, 95, 99):
+            index = min(len(recent) - 1, int(len(recent) * pct / 100))
+            stats[f"p{pct}_checkout_ms"] = round(recent[index], 3) if recent else 0.0
+        return stats
+
+
+# Metrics per engine name ("primary", "async", ...)
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def _instrumented_pool_class(pool_class, metrics: PoolMetrics):
+    class InstrumentedPool(pool_class):
+        def _do_get(self):
+            # Waiting means no idle connection and no overflow capacity left
+            waited = self.checkedin() == 0 and (
+                settings.DB_MAX_OVERFLOW >= 0 and self.overflow() >= settings.DB_MAX_OVERFLOW
+            )
+            start = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except exc.TimeoutError:
+                metrics.record_timeout()
+                raise
+            metrics.record_checkout((time.perf_counter() - start) * 1000, waited)
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+def pool_options(url: str, name: str) -> dict:
+    """Engine keyword arguments applying the DB_POOL_* settings to url's pool."""
+    parsed = make_url(url)
+    pool_class = parsed.get_dialect().get_pool_class(parsed)
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+
+    # Single-connection pools (e.g. in-memory SQLite) take no sizing options
+    if not issubclass(pool_class, QueuePool):
+        return options
+
+    metrics = pool_metrics.setdefault(name, PoolMetrics(name))
+    options.update(
+        poolclass=_instrumented_pool_class(pool_class, metrics),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+
+def pool_status(name: str, engine: Engine) -> dict:
+    """Current pool occupancy plus checkout metrics for an engine."""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(0, pool.overflow()),
+            max_overflow=settings.DB_MAX_OVERFLOW,
+        )
+    if name in pool_metrics:
+        status.update(pool_metrics[name].stats())
+    return status
@@ -0,0 +1,185 @@
+"""
+Publish/subscribe hub for server-pushed events.
+
+Publishers call get_broker().publish(topic, event) from any thread; the
+progress stream publishes from the session's after_commit hook. Subscribers
+are async: `async with get_broker().subscribe(topic) as subscription`, then
+`await subscription.get()`. Events must be JSON-serializable dicts with an
+"event" name and a "data" payload.
+
+The default "memory" broker only reaches subscribers in the same process, so
+with several uvicorn workers a client only sees changes made by requests
+served by its own worker. PROGRESS_BROKER selects another backend: a name
+registered in BROKERS or a "package.module:ClassName" path to a Broker
+subclass taking the settings object, e.g. one backed by Redis pub/sub or
+PostgreSQL LISTEN/NOTIFY. publish() runs inside commits, so it must not block
+on the network; queue the message and send it from a background thread.
+"""
+import asyncio
+import importlib
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Hashable, Optional, Set
+
+from app.core.config import settings
+
+# Delivered in place of the pending events when a subscriber falls too far behind
+RESYNC_EVENT = {"event": "resync", "data": {"reason": "too many pending events"}}
+
+
+class Subscription:
+    """Events for one subscriber, buffered on its event loop."""
+
+    def __init__(self, topic: Hashable, max_pending: int):
+        self.topic = topic
+        self.max_pending = max_pending
+        self.loop = asyncio.get_running_loop()
+        self.closed = False
+        self._pending: deque = deque()
+        self._wakeup = asyncio.Event()
+
+    def deliver(self, event: dict) -> None:
+        """Buffer an event; must run on the subscription's loop."""
+        if self.closed:
+            return
+        if len(self._pending) >= self.max_pending:
+            # The client missed deltas; tell it to reload instead of growing without bound
+            self._pending.clear()
+            event = RESYNC_EVENT
+        self._pending.append(event)
+        self._wakeup.set()
+
+    def close(self) -> None:
+        """End the subscription once its pending events are consumed; must run on its loop."""
+        self.closed = True
+        self._wakeup.set()
+
+    async def get(self) -> Optional[dict]:
+        """The next event, or None once the subscription is closed.
+
+        Safe to cancel (e.g. by asyncio.wait_for): no event is lost.
+        """
+        while not self._pending:
+            if self.closed:
+                return None
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        return self._pending.popleft()
+
+
+class Broker(ABC):
+    """Interface of the pub/sub backends."""
+
+    @abstractmethod
+    def publish(self, topic: Hashable, event: dict) -> None:
+        """Send an event to every subscriber of the topic; callable from any thread."""
+
+    @abstractmethod
+    def subscribe(self, topic: Hashable):
+        """Async context manager yielding a Subscription to the topic."""
+
+    def close(self) -> None:
+        """End every subscription (on shutdown)."""
+
+    def stats(self) -> dict:
+        return {}
+
+
+class InProcessBroker(Broker):
+    """Broker delivering to subscribers in this process only."""
+
+    def __init__(self, config=settings):
+        self.max_pending = config.PROGRESS_STREAM_MAX_PENDING
+        self._subscribers: Dict[Hashable, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+
+    def publish(self, topic: Hashable, event: dict) -> None:
+        with self._lock:
+            self.published += 1
+            subscriptions = list(self._subscribers.get(topic, ()))
+            self.delivered += len(subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The subscriber's loop has been closed
+                pass
+
+    @asynccontextmanager
+    async def subscribe(self, topic: Hashable) -> AsyncIterator[Subscription]:
+        subscription = Subscription(topic, self.max_pending)
+        with self._lock:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                subscriptions = self._subscribers.get(topic)
+                if subscriptions is not None:
+                    subscriptions.discard(subscription)
+                    if not subscriptions:
+                        del self._subscribers[topic]
+
+    def close(self) -> None:
+        with self._lock:
+            subscriptions = [s for topic_subscriptions in self._subscribers.values() for s in topic_subscriptions]
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.close)
+            except RuntimeError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "topics": len(self._subscribers),
+                "subscribers": sum(len(subscriptions) for subscriptions in self._subscribers.values()),
+                "published": self.published,
+                "delivered": self.delivered,
+            }
+
+
+# PROGRESS_BROKER names
+BROKERS = {
+    "memory": InProcessBroker,
+}
+
+_broker: Optional[Broker] = None
+_broker_lock = threading.Lock()
+
+
+def _broker_class(name: str):
+    if name in BROKERS:
+        return BROKERS[name]
+    if ":" not in name:
+        raise ValueError(f"Unknown PROGRESS_BROKER '{name}'; use one of {sorted(BROKERS)} or 'module:ClassName'")
+    module_name, class_name = name.split(":", 1)
+    broker_class = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(broker_class, type) and issubclass(broker_class, Broker)):
+        raise TypeError(f"PROGRESS_BROKER '{name}' is not a Broker subclass")
+    return broker_class
+
+
+def get_broker() -> Broker:
+    """Get the configured broker, creating it on first use.
+
+    Raises if PROGRESS_BROKER cannot be imported or does not implement
+    Broker; startup builds it, so a broken backend stops the server there.
+    """
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = _broker_class(settings.PROGRESS_BROKER)(settings)
+    return _broker
+
+
+def close_broker() -> None:
+    """End every open subscription, if the broker was ever used."""
+    if _broker is not None:
+        _broker.close()
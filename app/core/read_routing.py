@@ -0,0 +1,82 @@
+"""
+Routing of pure reads between the primary database and a read replica.
+
+Read-only routes take their session from get_read_db / get_async_read_db,
+which ask use_replica() for the current user. Everything else, including
+authentication lookups, uses the primary.
+
+Read-your-writes: get_current_user tags the request's primary session with
+the user's id. When that session commits, the user is pinned to the primary
+for REPLICA_READ_YOUR_WRITES_SECONDS, so a read right after a write cannot
+see the replica's older state. Pins are process-local, like the principal
+cache. With several worker processes, a follow-up read served by another
+process may still see the replica's older state.
+"""
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.database import get_replica_engine
+
+# Users whose recent writes the replica may not have yet
+recent_writers = TTLCache(
+    maxsize=lambda: settings.REPLICA_PIN_MAX_USERS,
+    ttl_seconds=lambda: settings.REPLICA_READ_YOUR_WRITES_SECONDS
+)
+
+
+class ReadRoutingStats:
+    """Counters of where read-only requests were served."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.replica_reads = 0
+        self.pinned_reads = 0
+
+    def record(self, replica: bool) -> None:
+        with self._lock:
+            if replica:
+                self.replica_reads += 1
+            else:
+                self.pinned_reads += 1
+
+    def stats(self) -> dict:
+        return {
+            "replica_configured": get_replica_engine() is not None,
+            "replica_reads": self.replica_reads,
+            "pinned_reads": self.pinned_reads,
+            "pinned_users": recent_writers.stats()["size"],
+            "read_your_writes_seconds": recent_writers.ttl_seconds,
+        }
+
+
+read_routing = ReadRoutingStats()
+
+
+def pin_to_primary(user_id: int) -> None:
+    """Serve the user's reads from the primary until the replica has caught up."""
+    recent_writers.set(user_id, True)
+
+
+def use_replica(user_id: int) -> bool:
+    """Whether a read-only request for this user may go to the replica."""
+    if get_replica_engine() is None:
+        return False
+    replica = recent_writers.get(user_id) is None
+    read_routing.record(replica)
+    return replica
+
+
+def tag_principal(db, user_id: int) -> None:
+    """Mark a primary session as writing on behalf of a user (Session or AsyncSession)."""
+    db.info["principal_id"] = user_id
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_after_commit(session):
+    user_id = session.info.get("principal_id")
+    if user_id is not None:
+        pin_to_primary(user_id)
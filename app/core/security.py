@@ -1,20 +1,46 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from app.core.cache import TTLCache
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=None)
+def get_pwd_context() -> CryptContext:
+    """The password hashing context, built on first use from BCRYPT_ROUNDS.
+
+    Hashes made with a different cost than BCRYPT_ROUNDS are flagged for
+    re-hashing, so changing the setting upgrades users on their next login.
+    """
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+
+# Verified token payloads keyed by SHA-256 digest of the token. Clients
+# reuse a token for its whole lifetime, so most requests skip the
+# signature check.
+token_cache = TTLCache(
+    maxsize=lambda: settings.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=lambda: settings.TOKEN_CACHE_TTL_SECONDS
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; also return a new hash if the stored one uses an outdated cost."""
+    return get_pwd_context().verify_and_update(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -31,13 +57,19 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def decode_access_token(token: str) -> Optional[dict]:
-    """Decode and verify a JWT token."""
+    """Decode and verify a JWT token, reusing earlier verifications of the same token."""
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
-
-
-
-
+    
+    # Cache verified payloads only until the token itself expires
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(key, dict(payload), ttl_seconds=exp - time.time())
+    return payload
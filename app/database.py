@@ -1,22 +1,211 @@
+"""
+Engines, session factories and session dependencies.
+
+Engines are built on first use rather than at import, so importing the
+application (a worker, a script, a test) does not read the settings or touch
+the database. Use the get_*() accessors in application code. The module
+attributes `engine`, `SessionLocal`, `async_engine`, `AsyncSessionLocal`,
+`replica_engine`, `ReplicaSessionLocal`, `async_replica_engine` and
+`AsyncReplicaSessionLocal` still work for scripts; each one builds its
+engine when first read.
+"""
+import threading
+from typing import Callable, Dict, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
-
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from app.core.instrumentation import instrument_engine
+from app.core.pool_metrics import pool_options
 
 Base = declarative_base()
 
+# INSERT constructs supporting ON CONFLICT ... DO UPDATE, by dialect name
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def upsert_insert(db, table):
+    """Dialect-specific INSERT for `table` that supports on_conflict_do_update()."""
+    return _UPSERT_INSERTS[db.get_bind().dialect.name](table)
+
+
+# Async drivers used when ASYNC_DATABASE_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def _with_async_driver(sync_url: str, setting: str) -> str:
+    url = make_url(sync_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}'; set {setting}")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def get_async_database_url() -> str:
+    """Resolve the async database URL, deriving it from DATABASE_URL if needed."""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return _with_async_driver(settings.DATABASE_URL, "ASYNC_DATABASE_URL")
+
+
+def get_async_replica_url() -> str:
+    """Resolve the async replica URL, deriving it from REPLICA_DATABASE_URL if needed."""
+    if settings.REPLICA_ASYNC_DATABASE_URL:
+        return settings.REPLICA_ASYNC_DATABASE_URL
+    return _with_async_driver(settings.REPLICA_DATABASE_URL, "REPLICA_ASYNC_DATABASE_URL")
+
+
+# Engines and session factories built so far, by module attribute name
+_built: Dict[str, object] = {}
+_build_lock = threading.RLock()
+
+
+def _lazy(name: str, build: Callable[[], object]):
+    if name not in _built:
+        with _build_lock:
+            if name not in _built:
+                _built[name] = build()
+    return _built[name]
+
+
+def _build_engine() -> Engine:
+    engine = create_engine(settings.DATABASE_URL, **pool_options(settings.DATABASE_URL, "primary"))
+    instrument_engine(engine)
+    return engine
+
+
+def _build_async_engine() -> Optional[AsyncEngine]:
+    # Only built when the async stack is enabled, so the async drivers stay
+    # optional for sync deployments
+    if not settings.ASYNC_DATABASE:
+        return None
+    url = get_async_database_url()
+    engine = create_async_engine(url, **pool_options(url, "async"))
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+def _build_replica_engine() -> Optional[Engine]:
+    if not settings.REPLICA_DATABASE_URL:
+        return None
+    engine = create_engine(settings.REPLICA_DATABASE_URL, **pool_options(settings.REPLICA_DATABASE_URL, "replica"))
+    instrument_engine(engine)
+    return engine
+
+
+def _build_async_replica_engine() -> Optional[AsyncEngine]:
+    if not (settings.ASYNC_DATABASE and settings.REPLICA_DATABASE_URL):
+        return None
+    url = get_async_replica_url()
+    engine = create_async_engine(url, **pool_options(url, "async_replica"))
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+def get_engine() -> Engine:
+    """The primary engine."""
+    return _lazy("engine", _build_engine)
+
+
+def get_session_factory() -> sessionmaker:
+    """Session factory bound to the primary engine."""
+    return _lazy("SessionLocal", lambda: sessionmaker(autocommit=False, autoflush=False, bind=get_engine()))
+
+
+def get_async_engine() -> Optional[AsyncEngine]:
+    """The async primary engine, or None unless ASYNC_DATABASE is set."""
+    return _lazy("async_engine", _build_async_engine)
+
+
+def get_async_session_factory() -> Optional[async_sessionmaker]:
+    return _lazy("AsyncSessionLocal", lambda: (
+        async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+        if get_async_engine() is not None else None
+    ))
+
+
+def get_replica_engine() -> Optional[Engine]:
+    """The read replica engine, or None unless REPLICA_DATABASE_URL is set.
+
+    Used by get_read_db / get_async_read_db (app/core/read_routing.py
+    decides per request).
+    """
+    return _lazy("replica_engine", _build_replica_engine)
+
+
+def get_replica_session_factory() -> Optional[sessionmaker]:
+    return _lazy("ReplicaSessionLocal", lambda: (
+        sessionmaker(autocommit=False, autoflush=False, bind=get_replica_engine())
+        if get_replica_engine() is not None else None
+    ))
+
+
+def get_async_replica_engine() -> Optional[AsyncEngine]:
+    return _lazy("async_replica_engine", _build_async_replica_engine)
+
+
+def get_async_replica_session_factory() -> Optional[async_sessionmaker]:
+    return _lazy("AsyncReplicaSessionLocal", lambda: (
+        async_sessionmaker(bind=get_async_replica_engine(), autoflush=False, expire_on_commit=False)
+        if get_async_replica_engine() is not None else None
+    ))
+
+
+_LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "SessionLocal": get_session_factory,
+    "async_engine": get_async_engine,
+    "AsyncSessionLocal": get_async_session_factory,
+    "replica_engine": get_replica_engine,
+    "ReplicaSessionLocal": get_replica_session_factory,
+    "async_replica_engine": get_async_replica_engine,
+    "AsyncReplicaSessionLocal": get_async_replica_session_factory,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def built_engines() -> Dict[str, object]:
+    """Engines built so far in this process, by name (None entries omitted)."""
+    return {
+        name: engine for name, engine in _built.items()
+        if name.endswith("engine") and engine is not None
+    }
+
+
+async def dispose_engines() -> None:
+    """Close the pooled connections of every engine built so far."""
+    for engine in built_engines().values():
+        if isinstance(engine, AsyncEngine):
+            await engine.dispose()
+        else:
+            engine.dispose()
+
 
 def get_db():
     """Dependency for getting database session."""
-    db = SessionLocal()
+    db = get_session_factory()()
     try:
         yield db
     finally:
         db.close()
 
 
-
-
+async def get_async_db():
+    """Dependency for getting an async database session."""
+    async with get_async_session_factory()() as db:
+        yield db
@@ -1,34 +1,69 @@
-from fastapi import FastAPI
+import json
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import APIRouter, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import auth, profile, roadmap
-from app.database import engine, Base
+from fastapi.responses import JSONResponse
+from app.api.routes import admin, auth, profile, roadmap
+from app.core.admission import AdmissionControlMiddleware
 from app.core.config import settings
+from app.core.hashing import PasswordHashingBusy
+from app.core.instrumentation import track_queries
+from app.startup import shut_down, startup_report, warm_up
 
-# Create database tables (in production, use Alembic migrations)
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(
-    title="Career Navigator API",
-    description="Backend API for engineering students to plan their learning journey",
-    version="1.0.0"
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Importing this module touches no database; tables, pools and caches
+    # are prepared here, before the server accepts requests
+    await warm_up()
+    yield
+    await shut_down()
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, specify actual origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-# Include routers
-app.include_router(auth.router, prefix="/api")
-app.include_router(profile.router, prefix="/api")
-app.include_router(roadmap.router, prefix="/api")
+request_logger = logging.getLogger("app.requests")
 
 
-@app.get("/")
+async def sql_instrumentation(request: Request, call_next):
+    """Report per-request SQL statement count and DB time."""
+    start = time.perf_counter()
+    with track_queries() as stats:
+        response = await call_next(request)
+    total_ms = (time.perf_counter() - start) * 1000
+    
+    response.headers["Server-Timing"] = (
+        f'db;dur={stats.db_ms:.2f};desc="{stats.count} queries", app;dur={total_ms:.2f}'
+    )
+    log = request_logger.warning if stats.over_budget else request_logger.info
+    log(json.dumps({
+        "method": request.method,
+        "path": request.url.path,
+        "status": response.status_code,
+        "duration_ms": round(total_ms, 2),
+        "db_queries": stats.count,
+        "db_ms": round(stats.db_ms, 2),
+        "query_budget": stats.budget,
+    }))
+    return response
+
+
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    """Reject quickly when the password hashing pool is saturated."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Authentication service is busy. Please retry shortly."},
+        headers={"Retry-After": "1"},
+    )
+
+
+# Service endpoints outside /api
+router = APIRouter()
+
+
+@router.get("/")
 def root():
     """Root endpoint."""
     return {
@@ -38,11 +73,69 @@ def root():
     }
 
 
-@app.get("/health")
+@router.get("/health")
 def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
 
+@router.get("/ready")
+def readiness_check():
+    """Readiness check: 503 until the startup warmup has finished."""
+    if not startup_report["ready"]:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=startup_report)
+    return startup_report
+
+
+def create_app() -> FastAPI:
+    """Build the application from the settings (ASYNC_DATABASE picks the route stack)."""
+    app = FastAPI(
+        title="Career Navigator API",
+        description="Backend API for engineering students to plan their learning journey",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+    app.middleware("http")(sql_instrumentation)
+    # Middleware added last runs first: CORS, then admission control (so shed
+    # responses still carry CORS headers), then the SQL instrumentation above
+    app.add_middleware(AdmissionControlMiddleware)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # In production, specify actual origins
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_exception_handler(PasswordHashingBusy, password_hashing_busy_handler)
+
+    # async def routes on an AsyncSession when ASYNC_DATABASE is set
+    if settings.ASYNC_DATABASE:
+        from app.api.routes import async_auth, async_profile, async_roadmap
+
+        app.include_router(async_auth.router, prefix="/api")
+        app.include_router(async_profile.router, prefix="/api")
+        app.include_router(async_roadmap.router, prefix="/api")
+    else:
+        app.include_router(auth.router, prefix="/api")
+        app.include_router(profile.router, prefix="/api")
+        app.include_router(roadmap.router, prefix="/api")
+    app.include_router(admin.router, prefix="/api")
+    app.include_router(router)
+    return app
+
+
+_app: Optional[FastAPI] = None
+_app_lock = threading.Lock()
 
 
+def __getattr__(name: str):
+    # `app.main:app` is built on first access (by uvicorn or a test client),
+    # so importing this module reads no settings
+    global _app
+    if name != "app":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if _app is None:
+        with _app_lock:
+            if _app is None:
+                _app = create_app()
+    return _app
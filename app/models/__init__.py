@@ -2,6 +2,8 @@ from app.models.user import User
 from app.models.student_profile import StudentProfile
 from app.models.roadmap_templates import RoadmapTemplate
 from app.models.roadmap_steps import RoadmapStep, UserRoadmap, UserRoadmapStep
+from app.models.roadmap_cohorts import RoadmapCohort
+from app.models.refresh_token import RefreshToken
 
 __all__ = [
     "User",
@@ -10,6 +12,8 @@ __all__ = [
     "RoadmapStep",
     "UserRoadmap",
     "UserRoadmapStep",
+    "RoadmapCohort",
+    "RefreshToken",
 ]
 
 
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from app.database import Base
+
+
+class RefreshToken(Base):
+    """A refresh token issued at login or by a refresh; only its SHA-256 digest is stored.
+    
+    Tokens rotated from one login share a family_id, so reuse of a rotated
+    token revokes the whole family with one indexed UPDATE.
+    """
+    __tablename__ = "refresh_tokens"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = Column(String(64), nullable=False, unique=True, index=True)  # hex SHA-256
+    family_id = Column(String(32), nullable=False, index=True)
+    created_at = Column(DateTime, nullable=False)  # UTC
+    expires_at = Column(DateTime, nullable=False)  # UTC
+    revoked_at = Column(DateTime, nullable=True)  # UTC; set when rotated, reused or logged out
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, ForeignKey, Enum, DateTime, Index
+from app.models.student_profile import Branch, CareerGoal
+from app.database import Base
+
+
+class RoadmapCohort(Base):
+    """Progress aggregates of the roadmaps sharing a template and generation-time profile.
+    
+    Derived from the user_roadmaps progress counters by cohort_analytics,
+    in the transactions that change them.
+    """
+    __tablename__ = "roadmap_cohorts"
+    __table_args__ = (
+        Index(
+            "ix_roadmap_cohorts_cohort",
+            "template_id", "branch", "current_year", "career_goal",
+            unique=True
+        ),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    template_id = Column(Integer, ForeignKey("roadmap_templates.id"), nullable=False)
+    branch = Column(Enum(Branch), nullable=False)
+    current_year = Column(Integer, nullable=False)
+    career_goal = Column(Enum(CareerGoal), nullable=False)
+    
+    roadmaps = Column(Integer, default=0, nullable=False)
+    completed_roadmaps = Column(Integer, default=0, nullable=False)  # Every step completed
+    total_steps = Column(Integer, default=0, nullable=False)
+    completed_steps = Column(Integer, default=0, nullable=False)
+    in_progress_steps = Column(Integer, default=0, nullable=False)
+    not_started_steps = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, nullable=False)  # UTC; when the aggregates last changed
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Text, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Text, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 import enum
 from app.database import Base
+from app.models.student_profile import Branch, CareerGoal
 
 
 class StepStatus(str, enum.Enum):
@@ -12,6 +13,10 @@ class StepStatus(str, enum.Enum):
 
 class RoadmapStep(Base):
     __tablename__ = "roadmap_steps"
+    __table_args__ = (
+        # Template steps are always read in order; an order is used once per template
+        Index("ix_roadmap_steps_template_id_order", "template_id", "order", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     template_id = Column(Integer, ForeignKey("roadmap_templates.id"), nullable=False)
@@ -20,6 +25,9 @@ class RoadmapStep(Base):
     order = Column(Integer, nullable=False)  # Order within the template
     estimated_duration = Column(String, nullable=True)  # e.g., "2 weeks", "1 month"
     resources = Column(Text, nullable=True)  # JSON string or text with links
+    # Dropped from its template by an import while user roadmaps still reference it:
+    # kept for those roadmaps, but no longer given to new ones
+    is_retired = Column(Boolean, default=False, nullable=False)
     
     # Relationships
     template = relationship("RoadmapTemplate", back_populates="steps")
@@ -28,27 +36,58 @@ class RoadmapStep(Base):
 
 class UserRoadmap(Base):
     __tablename__ = "user_roadmaps"
+    __table_args__ = (
+        # One roadmap per user; every roadmap read starts from the user id
+        Index("ix_user_roadmaps_user_id", "user_id", unique=True),
+        # Cohort analytics regroup the roadmaps of one cohort at a time
+        Index(
+            "ix_user_roadmaps_cohort",
+            "template_id", "cohort_branch", "cohort_year", "cohort_career_goal"
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     template_id = Column(Integer, ForeignKey("roadmap_templates.id"), nullable=False)
-    created_at = Column(String, nullable=False)  # ISO format string
+    created_at = Column(DateTime, nullable=False)  # UTC
+    
+    # Profile snapshot taken when the roadmap was generated; the roadmap's
+    # analytics cohort (together with template_id) and never changed afterwards
+    cohort_branch = Column(Enum(Branch), nullable=True)
+    cohort_year = Column(Integer, nullable=True)
+    cohort_career_goal = Column(Enum(CareerGoal), nullable=True)
+    
+    # Denormalized progress, kept in sync by roadmap_service write paths
+    total_steps = Column(Integer, default=0, nullable=False)
+    completed_steps = Column(Integer, default=0, nullable=False)
+    in_progress_steps = Column(Integer, default=0, nullable=False)
+    not_started_steps = Column(Integer, default=0, nullable=False)
+    current_step_id = Column(Integer, ForeignKey("roadmap_steps.id"), nullable=True)  # First in_progress, else first not_started
+    version = Column(Integer, default=1, nullable=False)  # Bumped on every progress change; backs the ETag
     
     # Relationships
     user = relationship("User", back_populates="roadmaps")
     template = relationship("RoadmapTemplate")
+    current_step = relationship("RoadmapStep")
     steps = relationship("UserRoadmapStep", back_populates="roadmap", cascade="all, delete-orphan")
 
 
 class UserRoadmapStep(Base):
     __tablename__ = "user_roadmap_steps"
+    __table_args__ = (
+        # Progress counters and status updates filter a roadmap's steps by status
+        Index("ix_user_roadmap_steps_roadmap_id_status", "roadmap_id", "status"),
+        Index("ix_user_roadmap_steps_roadmap_id_step_id", "roadmap_id", "step_id", unique=True),
+        # Template imports check whether a step is referenced before deleting it
+        Index("ix_user_roadmap_steps_step_id", "step_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     roadmap_id = Column(Integer, ForeignKey("user_roadmaps.id"), nullable=False)
     step_id = Column(Integer, ForeignKey("roadmap_steps.id"), nullable=False)
     status = Column(Enum(StepStatus), default=StepStatus.NOT_STARTED, nullable=False)
     notes = Column(Text, nullable=True)
-    completed_at = Column(String, nullable=True)  # ISO format string
+    completed_at = Column(DateTime, nullable=True)  # UTC
     
     # Relationships
     roadmap = relationship("UserRoadmap", back_populates="steps")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Text, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Text, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.models.student_profile import Branch, CareerGoal
 from app.database import Base
@@ -6,15 +6,23 @@ from app.database import Base
 
 class RoadmapTemplate(Base):
     __tablename__ = "roadmap_templates"
+    __table_args__ = (
+        # Template matching looks up active templates by goal and branch
+        Index("ix_roadmap_templates_career_goal_branch_is_active", "career_goal", "branch", "is_active"),
+        # Imports upsert templates by (name, version)
+        Index("ix_roadmap_templates_name_version", "name", "version", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
+    version = Column(Integer, default=1, nullable=False)  # Curriculum version; a new version is a new template
     description = Column(Text, nullable=True)
     branch = Column(Enum(Branch), nullable=True)  # None means applies to all branches
     career_goal = Column(Enum(CareerGoal), nullable=False)
     start_year = Column(Integer, nullable=True)  # None means applies to all years
     end_year = Column(Integer, nullable=True)  # None means applies to all years
     is_active = Column(Boolean, default=True, nullable=False)
+    updated_at = Column(DateTime, nullable=True)  # UTC; set by imports, part of the catalog fingerprint
     
     # Relationships
     steps = relationship("RoadmapStep", back_populates="template", cascade="all, delete-orphan", order_by="RoadmapStep.order")
@@ -36,6 +36,7 @@ class StudentProfile(Base):
     current_semester = Column(Integer, nullable=False)  # 1 or 2
     career_goal = Column(Enum(CareerGoal), nullable=False)
     current_skills = Column(String, nullable=True)  # JSON string or comma-separated
+    version = Column(Integer, default=1, nullable=False)  # Bumped on every update; backs the ETag
     
     # Relationships
     user = relationship("User", back_populates="profile")
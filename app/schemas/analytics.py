@@ -0,0 +1,25 @@
+from datetime import datetime
+from pydantic import BaseModel
+from app.models.student_profile import Branch, CareerGoal
+
+
+class CohortStatsResponse(BaseModel):
+    """Progress of the roadmaps generated from one template for one branch, year and career goal."""
+    template_id: int
+    template_name: str
+    branch: Branch
+    current_year: int
+    career_goal: CareerGoal
+    roadmaps: int
+    completed_roadmaps: int  # Every step completed
+    total_steps: int
+    completed_steps: int
+    in_progress_steps: int
+    not_started_steps: int
+    completion_percentage: float  # completed_steps / total_steps * 100
+    updated_at: datetime  # When the aggregates were last recomputed
+
+
+class CohortRebuildResponse(BaseModel):
+    cohorts: int
+    elapsed_seconds: float
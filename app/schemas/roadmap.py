@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from datetime import datetime
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from app.models.roadmap_steps import StepStatus
 
@@ -24,7 +25,7 @@ class UserRoadmapStepResponse(BaseModel):
     step_id: int
     status: StepStatus
     notes: Optional[str] = None
-    completed_at: Optional[str] = None
+    completed_at: Optional[datetime] = None
     step: RoadmapStepResponse
     
     class Config:
@@ -44,7 +45,7 @@ class CurrentStepResponse(BaseModel):
 class RoadmapResponse(BaseModel):
     id: int
     template_id: int
-    created_at: str
+    created_at: datetime
     steps: List[UserRoadmapStepResponse]
     # Computed fields
     total_steps: int
@@ -58,10 +59,49 @@ class RoadmapResponse(BaseModel):
         from_attributes = True
 
 
+class RoadmapSummaryResponse(BaseModel):
+    """Progress counters without the step list."""
+    id: int
+    template_id: int
+    created_at: datetime
+    total_steps: int
+    completed_steps: int
+    in_progress_steps: int
+    not_started_steps: int
+    completion_percentage: float
+    current_step: Optional[CurrentStepResponse] = None
+
+
+# Largest page of steps served by GET /api/roadmap/steps
+MAX_STEP_PAGE_SIZE = 200
+# Largest number of steps on either side of the current step in GET /api/roadmap/window
+MAX_STEP_WINDOW_SIZE = 100
+
+
+class RoadmapStepPageResponse(RoadmapSummaryResponse):
+    """A slice of a roadmap's steps, ordered by step order, with its progress counters."""
+    steps: List[UserRoadmapStepResponse]
+    next_cursor: Optional[int] = None  # Pass as `after` to fetch the following steps
+    prev_cursor: Optional[int] = None  # Pass as `before` to fetch the preceding steps
+
+
 class StepStatusUpdate(BaseModel):
     status: StepStatus
     notes: Optional[str] = None
 
 
+# Most updates accepted in one batch request (also bounds its statement budget)
+MAX_BATCH_STEP_UPDATES = 100
+
+
+class StepStatusBatchItem(StepStatusUpdate):
+    step_id: int
+
+
+class StepStatusBatchUpdate(BaseModel):
+    """Ordered status updates applied in a single transaction."""
+    updates: List[StepStatusBatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_STEP_UPDATES)
+
+
 
 
@@ -0,0 +1,89 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+from app.models.student_profile import Branch, CareerGoal
+
+
+class TemplateStepImport(BaseModel):
+    title: str = Field(..., min_length=1)
+    description: Optional[str] = None
+    order: int = Field(..., ge=1)
+    estimated_duration: Optional[str] = None
+    resources: Optional[str] = None
+
+
+class TemplateImport(BaseModel):
+    """One template definition in an import file; (name, version) identifies it."""
+    name: str = Field(..., min_length=1)
+    version: int = Field(1, ge=1)
+    description: Optional[str] = None
+    branch: Optional[Branch] = None  # None means applies to all branches
+    career_goal: CareerGoal
+    start_year: Optional[int] = Field(None, ge=1, le=4)
+    end_year: Optional[int] = Field(None, ge=1, le=4)
+    is_active: bool = True
+    steps: List[TemplateStepImport] = Field(..., min_length=1)
+
+    @model_validator(mode="after")
+    def check_consistency(self):
+        if self.start_year is not None and self.end_year is not None and self.start_year > self.end_year:
+            raise ValueError("start_year must not be after end_year")
+        orders = [step.order for step in self.steps]
+        if len(set(orders)) != len(orders):
+            raise ValueError("step orders must be unique within a template")
+        return self
+
+
+class TemplateImportError(BaseModel):
+    line: int  # Line of the record in the import file
+    message: str
+
+
+class TemplateImportReport(BaseModel):
+    templates_created: int = 0
+    templates_updated: int = 0
+    steps_written: int = 0
+    steps_removed: int = 0
+    steps_retained: int = 0  # Dropped from the import but still referenced by user roadmaps; retired
+    records_failed: int = 0
+    errors: List[TemplateImportError] = []  # The first failures; records_failed counts all of them
+    elapsed_seconds: float = 0.0
+    steps_per_second: float = 0.0
+
+
+class TemplateStepChange(BaseModel):
+    step_id: int
+    order: int
+    title: str
+
+
+class TemplateStepMove(BaseModel):
+    step_id: int  # The step in the target template
+    title: str
+    from_order: int
+    to_order: int
+
+
+class TemplateDiffResponse(BaseModel):
+    source_template_id: int
+    target_template_id: int
+    steps_matched: int  # Steps with the same title in both versions; their progress is kept
+    added: List[TemplateStepChange]
+    removed: List[TemplateStepChange]
+    reordered: List[TemplateStepMove]  # Matched steps that moved relative to the others
+    roadmaps_affected: int  # User roadmaps following the source template
+
+
+class TemplateResyncReport(BaseModel):
+    source_template_id: int
+    target_template_id: int
+    steps_matched: int = 0
+    steps_added: int = 0
+    steps_removed: int = 0
+    steps_reordered: int = 0
+    roadmaps_resynced: int = 0
+    batches: int = 0
+    rows_remapped: int = 0  # user_roadmap_steps rows moved to the matching target step
+    rows_deleted: int = 0
+    rows_inserted: int = 0
+    elapsed_seconds: float = 0.0
+    rows_per_second: float = 0.0  # Remapped, deleted and inserted rows
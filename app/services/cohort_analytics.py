@@ -0,0 +1,190 @@
+"""
+Cohort completion analytics.
+
+A cohort is the set of roadmaps generated from one template for students
+with the same branch, year and career goal. The profile is snapshotted onto
+user_roadmaps when the roadmap is generated. Each cohort's aggregates live in
+one roadmap_cohorts row and are derived from the roadmaps' denormalized
+progress counters, never from user_roadmap_steps.
+
+The aggregates are kept current incrementally. Every write path in
+roadmap_service that refreshes a roadmap's counters first runs
+cohort_delta_upsert(): one INSERT ... SELECT ... ON CONFLICT statement that
+adds the difference between the recounted and the stored counters to the
+roadmap's cohort, in the same transaction. A write costs one statement over
+the roadmaps it changed, however large their cohorts are, and reading the
+analytics is a scan of the small roadmap_cohorts table. Writes to one cohort
+queue on its row until they commit.
+
+rebuild_cohorts() recomputes every cohort from scratch, as a batch job for
+repairing the aggregates (for example after editing user_roadmaps by hand).
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, case, delete, func, literal, select
+from sqlalchemy.orm import Session
+
+from app.database import upsert_insert
+from app.models import RoadmapCohort, RoadmapTemplate, UserRoadmap
+from app.models.student_profile import Branch, CareerGoal
+
+COHORT_COLUMNS = ("template_id", "branch", "current_year", "career_goal")
+# Progress counters kept both per roadmap (user_roadmaps) and per cohort
+PROGRESS_COLUMNS = ("total_steps", "completed_steps", "in_progress_steps", "not_started_steps")
+AGGREGATE_COLUMNS = ("roadmaps", "completed_roadmaps", *PROGRESS_COLUMNS, "updated_at")
+_ROADMAP_COHORT = (
+    UserRoadmap.template_id, UserRoadmap.cohort_branch, UserRoadmap.cohort_year, UserRoadmap.cohort_career_goal
+)
+
+
+def _is_completed(counters: Dict[str, object]):
+    """1 if a roadmap with the given counters has every step completed, else 0."""
+    return case(
+        (and_(counters["total_steps"] > 0, counters["completed_steps"] == counters["total_steps"]), 1),
+        else_=0
+    )
+
+
+def _aggregates_query():
+    """Per-cohort aggregates of the roadmap progress counters."""
+    stored = {column: getattr(UserRoadmap, column) for column in PROGRESS_COLUMNS}
+    return select(
+        *_ROADMAP_COHORT,
+        func.count(UserRoadmap.id),
+        func.sum(_is_completed(stored)),
+        *[func.sum(stored[column]) for column in PROGRESS_COLUMNS],
+        literal(datetime.utcnow(), RoadmapCohort.updated_at.type),
+    ).where(
+        # Roadmaps generated before cohorts were tracked may lack a snapshot
+        UserRoadmap.cohort_branch.isnot(None)
+    ).group_by(*_ROADMAP_COHORT)
+
+
+def cohort_delta_upsert(
+    db,
+    condition,
+    new: Optional[Dict[str, object]] = None,
+    old: Optional[Dict[str, object]] = None,
+    roadmaps: int = 0,
+    template_id: Optional[int] = None
+):
+    """Build the upsert adding the progress changes of the matching roadmaps to their cohorts.
+
+    `new` and `old` map each of PROGRESS_COLUMNS to a per-roadmap expression
+    (None stands for zeros); each cohort gains the sum of new - old over its
+    matching roadmaps, and `roadmaps` (1 when they join it, -1 when they
+    leave) per matching roadmap. Cohorts are keyed by the roadmaps' template
+    unless `template_id` is given. `db` may be a Session or an AsyncSession.
+    """
+    def per_roadmap(counters, column):
+        return 0 if counters is None else counters[column]
+
+    def completed(counters):
+        return 0 if counters is None else _is_completed(counters)
+
+    # A given template is left out of the GROUP BY, so that SQLite does not
+    # scan the cohort index for the grouping instead of looking up the roadmaps
+    group_by = _ROADMAP_COHORT if template_id is None else _ROADMAP_COHORT[1:]
+    deltas = select(
+        UserRoadmap.template_id if template_id is None else literal(template_id),
+        *_ROADMAP_COHORT[1:],
+        func.count(UserRoadmap.id) * roadmaps,
+        func.sum(completed(new) - completed(old)),
+        *[func.sum(per_roadmap(new, column) - per_roadmap(old, column)) for column in PROGRESS_COLUMNS],
+        literal(datetime.utcnow(), RoadmapCohort.updated_at.type),
+    ).where(
+        condition,
+        UserRoadmap.cohort_branch.isnot(None)
+    ).group_by(*group_by)
+
+    cohorts = RoadmapCohort.__table__
+    insert = upsert_insert(db, cohorts)
+    return insert.from_select([*COHORT_COLUMNS, *AGGREGATE_COLUMNS], deltas).on_conflict_do_update(
+        index_elements=list(COHORT_COLUMNS),
+        set_={
+            **{column: cohorts.c[column] + insert.excluded[column] for column in AGGREGATE_COLUMNS[:-1]},
+            "updated_at": insert.excluded.updated_at,
+        },
+    )
+
+
+def drop_empty_cohorts(db: Session, template_id: Optional[int] = None) -> None:
+    """Delete cohorts (optionally of one template) that no longer have roadmaps (caller commits)."""
+    # Selecting the id (not *) lets the probe stay inside the covering cohort index
+    statement = delete(RoadmapCohort).where(
+        ~select(UserRoadmap.id).where(
+            UserRoadmap.template_id == RoadmapCohort.template_id,
+            UserRoadmap.cohort_branch == RoadmapCohort.branch,
+            UserRoadmap.cohort_year == RoadmapCohort.current_year,
+            UserRoadmap.cohort_career_goal == RoadmapCohort.career_goal,
+        ).exists()
+    )
+    if template_id is not None:
+        statement = statement.where(RoadmapCohort.template_id == template_id)
+    db.execute(statement)
+
+
+def rebuild_cohorts(db: Session) -> int:
+    """Recompute every cohort and drop cohorts without roadmaps; returns the cohort count.
+
+    Progress committed while the rebuild runs may be overwritten, so run it
+    while students are not updating their roadmaps.
+    """
+    insert = upsert_insert(db, RoadmapCohort.__table__)
+    db.execute(
+        insert.from_select([*COHORT_COLUMNS, *AGGREGATE_COLUMNS], _aggregates_query()).on_conflict_do_update(
+            index_elements=list(COHORT_COLUMNS),
+            set_={column: insert.excluded[column] for column in AGGREGATE_COLUMNS},
+        )
+    )
+    drop_empty_cohorts(db)
+    db.commit()
+    return db.execute(select(func.count(RoadmapCohort.id))).scalar()
+
+
+def get_cohort_stats(
+    db: Session,
+    template_id: Optional[int] = None,
+    branch: Optional[Branch] = None,
+    current_year: Optional[int] = None,
+    career_goal: Optional[CareerGoal] = None
+) -> List[dict]:
+    """Read the cohort aggregates, optionally filtered; one query on roadmap_cohorts."""
+    query = select(
+        RoadmapCohort.template_id,
+        RoadmapTemplate.name.label("template_name"),
+        RoadmapCohort.branch,
+        RoadmapCohort.current_year,
+        RoadmapCohort.career_goal,
+        RoadmapCohort.roadmaps,
+        RoadmapCohort.completed_roadmaps,
+        RoadmapCohort.total_steps,
+        RoadmapCohort.completed_steps,
+        RoadmapCohort.in_progress_steps,
+        RoadmapCohort.not_started_steps,
+        RoadmapCohort.updated_at,
+    ).join(
+        RoadmapTemplate, RoadmapTemplate.id == RoadmapCohort.template_id
+    ).order_by(
+        RoadmapCohort.template_id, RoadmapCohort.branch, RoadmapCohort.current_year, RoadmapCohort.career_goal
+    )
+    for column, value in (
+        (RoadmapCohort.template_id, template_id),
+        (RoadmapCohort.branch, branch),
+        (RoadmapCohort.current_year, current_year),
+        (RoadmapCohort.career_goal, career_goal),
+    ):
+        if value is not None:
+            query = query.where(column == value)
+
+    # Plain rows rather than ORM objects; the table has one row per cohort
+    return [
+        {
+            **row._asdict(),
+            "completion_percentage": (
+                round(row.completed_steps / row.total_steps * 100, 2) if row.total_steps else 0.0
+            ),
+        }
+        for row in db.execute(query)
+    ]
@@ -0,0 +1,82 @@
+"""
+Cache of authenticated user principals keyed by user id.
+
+get_current_user resolves the principal from here, falling back to a
+primary-key lookup on a miss. Entries are dropped when a session commits
+changes to the user (deactivation, role change or any other update);
+code that changes users with Core statements must call
+invalidate_principal() itself.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User, UserRole
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Immutable snapshot of the fields request handlers need from a User."""
+    id: int
+    email: str
+    full_name: Optional[str]
+    role: UserRole
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            role=user.role,
+            is_active=user.is_active
+        )
+
+
+principal_cache = TTLCache(
+    maxsize=lambda: settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=lambda: settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def get_cached_principal(user_id: int) -> Optional[Principal]:
+    return principal_cache.get(user_id)
+
+
+def cache_principal(user: User) -> Principal:
+    principal = Principal.from_user(user)
+    principal_cache.set(principal.id, principal)
+    return principal
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Drop a user's cached principal after it was changed."""
+    principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_user_writes(session, flush_context):
+    """Remember users changed in this transaction."""
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            session.info.setdefault("changed_user_ids", set()).add(obj.id)
+            # Drop it now too, so this process stops serving the old state
+            invalidate_principal(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    # Invalidate again after commit in case a concurrent request re-cached
+    # the pre-commit row in between
+    for user_id in session.info.pop("changed_user_ids", ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("changed_user_ids", None)
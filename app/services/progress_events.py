@@ -0,0 +1,81 @@
+"""
+Roadmap progress deltas pushed to the user's connected clients.
+
+roadmap_service records every progress change on the session
+(track_progress_change); once the transaction commits, one event per changed
+roadmap is published to the user's topic on the pub/sub broker, and GET
+/api/roadmap/events streams it to the user's clients. Rolled-back changes
+are never published.
+
+Events:
+- "progress": the steps whose status changed (including auto-advanced and
+  reset steps) and the roadmap's new progress counters and version
+- "roadmap": a roadmap was generated, or moved to another template version
+  by template_resync; the client should reload it
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.core.pubsub import get_broker
+
+
+def progress_topic(user_id: int) -> str:
+    return f"progress:{user_id}"
+
+
+def _step_delta(row: Row) -> dict:
+    return {
+        "step_id": row.step_id,
+        "status": row.status.value,
+        "notes": row.notes,
+        "completed_at": row.completed_at.isoformat() if row.completed_at else None,
+    }
+
+
+def _progress_data(row: Row, steps: Iterable[Row]) -> dict:
+    total = row.total_steps
+    return {
+        "roadmap_id": row.id,
+        "version": row.version,
+        "steps": [_step_delta(step) for step in steps],
+        "total_steps": total,
+        "completed_steps": row.completed_steps,
+        "in_progress_steps": row.in_progress_steps,
+        "not_started_steps": row.not_started_steps,
+        "completion_percentage": round(row.completed_steps / total * 100, 2) if total else 0.0,
+        "current_step_id": row.current_step_id,
+    }
+
+
+def track_progress_change(db, row: Optional[Row], changed_steps: Iterable[Row] = (), reload: bool = False) -> None:
+    """Queue the event for a roadmap whose counters changed in this transaction.
+
+    `row` is the RETURNING row of roadmap_service's progress counter UPDATE
+    and `changed_steps` the RETURNING rows of its step updates, in order;
+    `db` may be a Session or an AsyncSession.
+    """
+    if row is None:
+        return
+    # A step changed several times in one batch is reported once, as it ended up
+    steps = {step.step_id: step for step in changed_steps}
+    db.info.setdefault("progress_events", []).append((
+        row.user_id,
+        {"event": "roadmap" if reload else "progress", "data": _progress_data(row, steps.values())},
+    ))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session):
+    events = session.info.pop("progress_events", None)
+    if events:
+        broker = get_broker()
+        for user_id, progress_event in events:
+            broker.publish(progress_topic(user_id), progress_event)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("progress_events", None)
@@ -0,0 +1,165 @@
+"""
+Rotating refresh tokens.
+
+Login returns an opaque refresh token alongside the access token. Only its
+SHA-256 digest is stored (the token is random, so a fast hash is enough),
+which makes POST /api/auth/refresh one indexed lookup plus a JWT sign, with
+no bcrypt. Every refresh revokes the presented token and issues a new one in
+the same family (the chain of tokens descended from one login). A revoked
+token presented again has been copied, or replayed after a rotation, so the
+whole family is revoked and both holders must log in again.
+"""
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+
+class RefreshTokenRejected(Exception):
+    """Raised when a refresh token is unknown, expired, reused or belongs to an inactive user."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def _digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _new_token(user_id: int, family_id: Optional[str] = None):
+    """A new token and the INSERT storing its digest; a new family unless one is given."""
+    token = secrets.token_urlsafe(32)
+    now = datetime.utcnow()
+    statement = insert(RefreshToken).values(
+        user_id=user_id,
+        token_hash=_digest(token),
+        family_id=family_id or uuid.uuid4().hex,
+        created_at=now,
+        expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+    return token, statement
+
+
+def _lookup(token: str):
+    # The token's row and the claims of the access token to issue, in one
+    # lookup by the unique token_hash index
+    return select(
+        RefreshToken.id,
+        RefreshToken.family_id,
+        RefreshToken.expires_at,
+        RefreshToken.revoked_at,
+        User.id.label("user_id"),
+        User.email,
+        User.is_active,
+    ).join(User, User.id == RefreshToken.user_id).where(RefreshToken.token_hash == _digest(token))
+
+
+def _revoke(token_id: int):
+    # Matches nothing if a concurrent refresh already rotated the token
+    return update(RefreshToken).where(
+        RefreshToken.id == token_id,
+        RefreshToken.revoked_at.is_(None)
+    ).values(revoked_at=datetime.utcnow())
+
+
+def _revoke_family(family_id):
+    return update(RefreshToken).where(
+        RefreshToken.family_id == family_id,
+        RefreshToken.revoked_at.is_(None)
+    ).values(revoked_at=datetime.utcnow())
+
+
+def _family_of(token: str):
+    return select(RefreshToken.family_id).where(RefreshToken.token_hash == _digest(token)).scalar_subquery()
+
+
+def _check(row: Optional[Row]) -> None:
+    """Raise RefreshTokenRejected for unknown or expired tokens and inactive users (not for reuse)."""
+    if row is None:
+        raise RefreshTokenRejected("unknown")
+    if row.expires_at <= datetime.utcnow():
+        raise RefreshTokenRejected("expired")
+    if not row.is_active:
+        raise RefreshTokenRejected("inactive")
+
+
+def issue_refresh_token(db: Session, user_id: int) -> str:
+    """Store a refresh token starting a new family; the caller commits."""
+    token, statement = _new_token(user_id)
+    db.execute(statement)
+    return token
+
+
+def rotate_refresh_token(db: Session, token: str) -> Tuple[Row, str]:
+    """Revoke a refresh token and issue its successor.
+
+    Returns the user's (user_id, email) row and the new token. Runs three
+    statements in one transaction: the lookup, the conditional revoke and
+    the insert. On reuse the token's family is revoked instead.
+    """
+    row = db.execute(_lookup(token)).one_or_none()
+    _check(row)
+    if row.revoked_at is not None or db.execute(_revoke(row.id)).rowcount != 1:
+        db.execute(_revoke_family(row.family_id))
+        db.commit()
+        raise RefreshTokenRejected("reused")
+
+    new_token, statement = _new_token(row.user_id, row.family_id)
+    db.execute(statement)
+    db.commit()
+    return row, new_token
+
+
+def revoke_refresh_token(db: Session, token: str) -> None:
+    """Revoke the token's whole family (logout); unknown tokens are ignored."""
+    db.execute(_revoke_family(_family_of(token)))
+    db.commit()
+
+
+def purge_expired_refresh_tokens(db: Session) -> int:
+    """Delete expired tokens, revoked or not; returns how many were deleted."""
+    result = db.execute(delete(RefreshToken).where(RefreshToken.expires_at <= datetime.utcnow()))
+    db.commit()
+    return result.rowcount
+
+
+# For the async auth routes. Purging stays sync: only the purge script runs it.
+
+
+async def issue_refresh_token_async(db: AsyncSession, user_id: int) -> str:
+    """Store a refresh token starting a new family; the caller commits."""
+    token, statement = _new_token(user_id)
+    await db.execute(statement)
+    return token
+
+
+async def rotate_refresh_token_async(db: AsyncSession, token: str) -> Tuple[Row, str]:
+    """Revoke a refresh token and issue its successor."""
+    row = (await db.execute(_lookup(token))).one_or_none()
+    _check(row)
+    if row.revoked_at is not None or (await db.execute(_revoke(row.id))).rowcount != 1:
+        await db.execute(_revoke_family(row.family_id))
+        await db.commit()
+        raise RefreshTokenRejected("reused")
+
+    new_token, statement = _new_token(row.user_id, row.family_id)
+    await db.execute(statement)
+    await db.commit()
+    return row, new_token
+
+
+async def revoke_refresh_token_async(db: AsyncSession, token: str) -> None:
+    """Revoke the token's whole family (logout); unknown tokens are ignored."""
+    await db.execute(_revoke_family(_family_of(token)))
+    await db.commit()
@@ -1,9 +1,16 @@
-from sqlalchemy.orm import Session, joinedload
-from typing import Optional, List
+from sqlalchemy import and_, case, delete, exists, func, insert, literal, or_, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, joinedload
+from typing import Dict, Optional, List, Sequence, Tuple
 from datetime import datetime
-from app.models import RoadmapTemplate, UserRoadmap, UserRoadmapStep, RoadmapStep
+from app.models import UserRoadmap, UserRoadmapStep, RoadmapStep
 from app.models.student_profile import StudentProfile
 from app.models.roadmap_steps import StepStatus
+from app.services.cohort_analytics import PROGRESS_COLUMNS, cohort_delta_upsert
+from app.services.progress_events import track_progress_change
+from app.services.template_catalog import CatalogTemplate, template_catalog
 
 
 def find_matching_template(
@@ -11,30 +18,128 @@ def find_matching_template(
     branch,
     career_goal,
     current_year: int
-) -> Optional[RoadmapTemplate]:
+) -> Optional[CatalogTemplate]:
     """Find the best matching roadmap template for a student profile."""
-    # First, try to find exact match (branch + career_goal + year range)
-    template = db.query(RoadmapTemplate).filter(
-        RoadmapTemplate.branch == branch,
-        RoadmapTemplate.career_goal == career_goal,
-        RoadmapTemplate.is_active == True,
-        (RoadmapTemplate.start_year.is_(None) | (RoadmapTemplate.start_year <= current_year)),
-        (RoadmapTemplate.end_year.is_(None) | (RoadmapTemplate.end_year >= current_year))
-    ).first()
-    
-    if template:
-        return template
-    
-    # Fallback: match by career_goal only (branch-agnostic)
-    template = db.query(RoadmapTemplate).filter(
-        RoadmapTemplate.branch.is_(None),
-        RoadmapTemplate.career_goal == career_goal,
-        RoadmapTemplate.is_active == True,
-        (RoadmapTemplate.start_year.is_(None) | (RoadmapTemplate.start_year <= current_year)),
-        (RoadmapTemplate.end_year.is_(None) | (RoadmapTemplate.end_year >= current_year))
-    ).first()
+    # Exact (branch + career_goal + year range) and branch-agnostic fallback
+    # matches are resolved ahead of time by the in-memory catalog
+    return template_catalog.match(
+        db,
+        branch=branch,
+        career_goal=career_goal,
+        current_year=current_year
+    )
+
+
+def _first_step_with_status(status: StepStatus):
+    """Correlated subquery for the lowest-ordered step of a roadmap in a status."""
+    return select(UserRoadmapStep.step_id).join(RoadmapStep).where(
+        UserRoadmapStep.roadmap_id == UserRoadmap.id,
+        UserRoadmapStep.status == status
+    ).order_by(RoadmapStep.order).limit(1).scalar_subquery()
+
+
+def _count_steps(status: Optional[StepStatus] = None):
+    """Correlated subquery counting a roadmap's steps, optionally by status."""
+    query = select(func.count(UserRoadmapStep.id)).where(
+        UserRoadmapStep.roadmap_id == UserRoadmap.id
+    )
+    if status is not None:
+        query = query.where(UserRoadmapStep.status == status)
+    return query.scalar_subquery()
+
+
+def _recounted_progress():
+    """Correlated subqueries recounting a roadmap's steps, by progress counter column."""
+    return {
+        "total_steps": _count_steps(),
+        "completed_steps": _count_steps(StepStatus.COMPLETED),
+        "in_progress_steps": _count_steps(StepStatus.IN_PROGRESS),
+        "not_started_steps": _count_steps(StepStatus.NOT_STARTED),
+    }
+
+
+def _stored_progress():
+    """A roadmap's progress counter columns, by name."""
+    return {column: getattr(UserRoadmap, column) for column in PROGRESS_COLUMNS}
+
+
+def _progress_counters_update(roadmap_id: int):
+    """Build the UPDATE that recomputes a roadmap's denormalized progress counters."""
+    return _progress_counters_bulk_update(UserRoadmap.id == roadmap_id)
+
+
+def _progress_counters_bulk_update(condition, **values):
+    """Build the UPDATE recomputing the counters of every matching roadmap, setting any extra values."""
+    return update(UserRoadmap).where(
+        condition
+    ).values(
+        **values,
+        **_recounted_progress(),
+        current_step_id=func.coalesce(
+            _first_step_with_status(StepStatus.IN_PROGRESS),
+            _first_step_with_status(StepStatus.NOT_STARTED)
+        ),
+        # Any progress change invalidates the roadmap's ETag
+        version=UserRoadmap.version + 1
+    ).returning(
+        # The new progress, for track_progress_change
+        UserRoadmap.id,
+        UserRoadmap.user_id,
+        UserRoadmap.version,
+        UserRoadmap.total_steps,
+        UserRoadmap.completed_steps,
+        UserRoadmap.in_progress_steps,
+        UserRoadmap.not_started_steps,
+        UserRoadmap.current_step_id
+    ).execution_options(synchronize_session=False)
+
+
+def _cohort_progress_update(db, roadmap_id: int, new_roadmap: bool = False):
+    """Build the upsert moving a roadmap's cohort aggregates by its recounted progress.
     
-    return template
+    Must run before the counters UPDATE, while the roadmap still holds its
+    old counters. A new roadmap also joins its cohort.
+    """
+    return cohort_delta_upsert(
+        db,
+        UserRoadmap.id == roadmap_id,
+        new=_recounted_progress(),
+        old=_stored_progress(),
+        roadmaps=1 if new_roadmap else 0
+    )
+
+
+def refresh_progress_counters(
+    db: Session,
+    roadmap_id: int,
+    changed_steps: Sequence[Row] = (),
+    reload: bool = False,
+    new_roadmap: bool = False
+) -> None:
+    """Recompute a roadmap's denormalized progress counters and its cohort's aggregates in two statements."""
+    db.execute(_cohort_progress_update(db, roadmap_id, new_roadmap))
+    track_progress_change(db, db.execute(_progress_counters_update(roadmap_id)).one_or_none(), changed_steps, reload)
+
+
+def _completion_percentage(completed_steps: int, total_steps: int) -> float:
+    """Calculate completion percentage: completed_steps / total_steps * 100."""
+    percentage = (completed_steps / total_steps * 100) if total_steps > 0 else 0.0
+    return round(percentage, 2)
+
+
+def _materialize_steps(roadmap_id: int, template_id: int):
+    """Build the INSERT ... SELECT copying a template's steps into a user roadmap."""
+    return insert(UserRoadmapStep).from_select(
+        ["roadmap_id", "step_id", "status"],
+        select(
+            literal(roadmap_id),
+            RoadmapStep.id,
+            literal(StepStatus.NOT_STARTED, UserRoadmapStep.status.type)
+        ).where(
+            RoadmapStep.template_id == template_id,
+            RoadmapStep.is_retired == False
+        ).order_by(RoadmapStep.order)
+    )
 
 
 def generate_roadmap_for_user(
@@ -66,165 +171,773 @@ def generate_roadmap_for_user(
     roadmap = UserRoadmap(
         user_id=user_id,
         template_id=template.id,
-        created_at=datetime.utcnow().isoformat()
+        created_at=datetime.utcnow(),
+        # The analytics cohort stays the profile the roadmap was generated for
+        cohort_branch=profile.branch,
+        cohort_year=profile.current_year,
+        cohort_career_goal=profile.career_goal
     )
     db.add(roadmap)
-    db.flush()
-    
-    # Create user roadmap steps from template steps
-    template_steps = db.query(RoadmapStep).filter(
-        RoadmapStep.template_id == template.id
-    ).order_by(RoadmapStep.order).all()
-    
-    for step in template_steps:
-        user_step = UserRoadmapStep(
-            roadmap_id=roadmap.id,
-            step_id=step.id,
-            status=StepStatus.NOT_STARTED
-        )
-        db.add(user_step)
+    try:
+        db.flush()
+    except IntegrityError:
+        # A concurrent request created the user's roadmap first
+        db.rollback()
+        return db.query(UserRoadmap).filter(UserRoadmap.user_id == user_id).first()
+    
+    # Materialize every template step with a single INSERT ... SELECT so the
+    # statement count stays constant regardless of the template size
+    db.execute(_materialize_steps(roadmap.id, template.id))
+    refresh_progress_counters(db, roadmap.id, reload=True, new_roadmap=True)
     
     db.commit()
-    db.refresh(roadmap)
     return roadmap
 
 
+def _roadmap_steps_query(roadmap_id: int):
+    """Build the query loading a roadmap's steps, with step details, in order."""
+    return select(UserRoadmapStep).options(
+        joinedload(UserRoadmapStep.step)
+    ).join(RoadmapStep).where(
+        UserRoadmapStep.roadmap_id == roadmap_id
+    ).order_by(RoadmapStep.order)
+
+
+def _progress_response(roadmap: UserRoadmap, steps: List[UserRoadmapStep]) -> dict:
+    """Shape a roadmap and its loaded steps into the RoadmapResponse payload."""
+    # Progress comes from the counters maintained on the roadmap row
+    current_step = None
+    if roadmap.current_step_id is not None:
+        current = next((step for step in steps if step.step_id == roadmap.current_step_id), None)
+        if current:
+            current_step = {
+                "step_id": current.step_id,
+                "title": current.step.title,
+                "order": current.step.order
+            }
+    
+    return {
+        "id": roadmap.id,
+        "template_id": roadmap.template_id,
+        "created_at": roadmap.created_at,
+        "steps": steps,
+        "total_steps": roadmap.total_steps,
+        "completed_steps": roadmap.completed_steps,
+        "in_progress_steps": roadmap.in_progress_steps,
+        "not_started_steps": roadmap.not_started_steps,
+        "completion_percentage": _completion_percentage(roadmap.completed_steps, roadmap.total_steps),
+        "current_step": current_step
+    }
+
+
+def _roadmap_step_rows_query(roadmap_id: int):
+    """Build the column-only variant of the steps query, for the fast serialization path."""
+    return select(
+        UserRoadmapStep.id,
+        UserRoadmapStep.step_id,
+        UserRoadmapStep.status,
+        UserRoadmapStep.notes,
+        UserRoadmapStep.completed_at,
+        RoadmapStep.title,
+        RoadmapStep.description,
+        RoadmapStep.order,
+        RoadmapStep.estimated_duration,
+        RoadmapStep.resources,
+        RoadmapStep.template_id
+    ).join(
+        RoadmapStep, RoadmapStep.id == UserRoadmapStep.step_id
+    ).where(
+        UserRoadmapStep.roadmap_id == roadmap_id
+    ).order_by(RoadmapStep.order)
+
+
+def _step_document(row: Row) -> dict:
+    """Shape a step row like UserRoadmapStepResponse, field order included."""
+    return {
+        "id": row.id,
+        "step_id": row.step_id,
+        "status": row.status.value,
+        "notes": row.notes,
+        "completed_at": row.completed_at.isoformat() if row.completed_at else None,
+        "step": {
+            "title": row.title,
+            "description": row.description,
+            "order": row.order,
+            "estimated_duration": row.estimated_duration,
+            "resources": row.resources,
+            "id": row.step_id,
+            "template_id": row.template_id
+        }
+    }
+
+
+def _roadmap_document(roadmap: UserRoadmap, rows: List[Row]) -> dict:
+    """Shape a roadmap and its step rows into plain JSON-ready data.
+    
+    Mirrors what RoadmapResponse produces from _progress_response, including
+    field order, so it can be encoded without validation.
+    """
+    steps = []
+    current_step = None
+    for row in rows:
+        steps.append(_step_document(row))
+        if current_step is None and row.step_id == roadmap.current_step_id:
+            current_step = {
+                "step_id": row.step_id,
+                "title": row.title,
+                "order": row.order
+            }
+    
+    return {
+        "id": roadmap.id,
+        "template_id": roadmap.template_id,
+        "created_at": roadmap.created_at.isoformat(),
+        "steps": steps,
+        "total_steps": roadmap.total_steps,
+        "completed_steps": roadmap.completed_steps,
+        "in_progress_steps": roadmap.in_progress_steps,
+        "not_started_steps": roadmap.not_started_steps,
+        "completion_percentage": float(
+            _completion_percentage(roadmap.completed_steps, roadmap.total_steps)
+        ),
+        "current_step": current_step
+    }
+
+
+def get_user_roadmap(
+    db: Session,
+    user_id: int
+) -> Optional[UserRoadmap]:
+    """Get the user's roadmap row (progress counters and version) without its steps."""
+    return db.query(UserRoadmap).filter(
+        UserRoadmap.user_id == user_id
+    ).first()
+
+
+def get_roadmap_progress(
+    db: Session,
+    roadmap: UserRoadmap
+) -> dict:
+    """Load a roadmap's steps and combine them with its progress counters."""
+    # Load steps with their related step data
+    steps = db.execute(_roadmap_steps_query(roadmap.id)).scalars().all()
+    
+    return _progress_response(roadmap, steps)
+
+
+def get_roadmap_document(
+    db: Session,
+    roadmap: UserRoadmap
+) -> dict:
+    """Build the RoadmapResponse payload from plain rows, skipping ORM hydration."""
+    rows = db.execute(_roadmap_step_rows_query(roadmap.id)).all()
+    
+    return _roadmap_document(roadmap, rows)
+
+
 def get_roadmap_with_progress(
     db: Session,
     user_id: int
 ) -> Optional[dict]:
     """Get user's roadmap with progress and completion percentage."""
-    roadmap = db.query(UserRoadmap).filter(
-        UserRoadmap.user_id == user_id
-    ).first()
+    roadmap = get_user_roadmap(db, user_id)
     
     if not roadmap:
         return None
     
-    # Load steps with their related step data
-    steps = db.query(UserRoadmapStep).options(
-        joinedload(UserRoadmapStep.step)
-    ).join(RoadmapStep).filter(
-        UserRoadmapStep.roadmap_id == roadmap.id
-    ).order_by(RoadmapStep.order).all()
-    
-    # Compute statistics
-    total_steps = len(steps)
-    completed_steps = sum(1 for step in steps if step.status == StepStatus.COMPLETED)
-    in_progress_steps = sum(1 for step in steps if step.status == StepStatus.IN_PROGRESS)
-    not_started_steps = sum(1 for step in steps if step.status == StepStatus.NOT_STARTED)
-    
-    # Calculate completion percentage: completed_steps / total_steps * 100
-    completion_percentage = (completed_steps / total_steps * 100) if total_steps > 0 else 0.0
-    
-    # Find current step: first in_progress, else first not_started
+    return get_roadmap_progress(db, roadmap)
+
+
+def _summary_query(user_id: int):
+    """Build the single-row query behind the roadmap summary."""
+    return select(
+        UserRoadmap.id,
+        UserRoadmap.template_id,
+        UserRoadmap.created_at,
+        UserRoadmap.total_steps,
+        UserRoadmap.completed_steps,
+        UserRoadmap.in_progress_steps,
+        UserRoadmap.not_started_steps,
+        UserRoadmap.current_step_id,
+        UserRoadmap.version,
+        RoadmapStep.title,
+        RoadmapStep.order
+    ).outerjoin(
+        RoadmapStep, RoadmapStep.id == UserRoadmap.current_step_id
+    ).where(UserRoadmap.user_id == user_id).limit(1)
+
+
+def _summary_response(row: Row) -> dict:
+    """Shape a summary row into the RoadmapSummaryResponse payload."""
     current_step = None
-    in_progress_step = next((step for step in steps if step.status == StepStatus.IN_PROGRESS), None)
-    if in_progress_step:
+    if row.current_step_id is not None:
         current_step = {
-            "step_id": in_progress_step.step_id,
-            "title": in_progress_step.step.title,
-            "order": in_progress_step.step.order
+            "step_id": row.current_step_id,
+            "title": row.title,
+            "order": row.order
         }
+    
+    return {
+        "id": row.id,
+        "template_id": row.template_id,
+        "created_at": row.created_at,
+        "total_steps": row.total_steps,
+        "completed_steps": row.completed_steps,
+        "in_progress_steps": row.in_progress_steps,
+        "not_started_steps": row.not_started_steps,
+        "completion_percentage": _completion_percentage(row.completed_steps, row.total_steps),
+        "current_step": current_step,
+        "version": row.version
+    }
+
+
+def get_roadmap_summary(
+    db: Session,
+    user_id: int
+) -> Optional[dict]:
+    """Get user's roadmap progress from the roadmap row alone, without its steps."""
+    row = db.execute(_summary_query(user_id)).first()
+    
+    if not row:
+        return None
+    
+    return _summary_response(row)
+
+
+def _step_page_query(roadmap_id: int, after: Optional[int], before: Optional[int], limit: int):
+    """Build the keyset query for one page of steps, ordered by RoadmapStep.order.
+    
+    Fetches one row past the limit so the caller can tell whether more steps
+    follow (or precede, when paging backwards from `before`).
+    """
+    query = _roadmap_step_rows_query(roadmap_id)
+    if before is not None:
+        return query.where(RoadmapStep.order < before).order_by(None).order_by(
+            RoadmapStep.order.desc()
+        ).limit(limit + 1)
+    if after is not None:
+        query = query.where(RoadmapStep.order > after)
+    return query.limit(limit + 1)
+
+
+def _step_page_response(
+    summary: dict,
+    rows: List[Row],
+    limit: int,
+    after: Optional[int],
+    before: Optional[int]
+) -> dict:
+    """Trim the look-ahead row and attach the steps and cursors to the summary."""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if before is not None:
+        rows = rows[::-1]
+    
+    next_cursor = prev_cursor = None
+    if rows:
+        # Paging backwards: more before if the look-ahead row exists, and the
+        # step at `before` itself comes after this page
+        if before is not None:
+            prev_cursor = rows[0].order if has_more else None
+            next_cursor = rows[-1].order
+        else:
+            prev_cursor = rows[0].order if after is not None else None
+            next_cursor = rows[-1].order if has_more else None
+    
+    return {
+        **summary,
+        "steps": [_step_document(row) for row in rows],
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor
+    }
+
+
+def get_roadmap_step_page(
+    db: Session,
+    summary: dict,
+    limit: int,
+    after: Optional[int] = None,
+    before: Optional[int] = None
+) -> dict:
+    """Get one page of a roadmap's steps after (or before) a step order.
+    
+    `summary` is the roadmap summary from get_roadmap_summary; the page is
+    returned on top of it so the progress counters come along.
+    """
+    rows = db.execute(_step_page_query(summary["id"], after, before, limit)).all()
+    
+    return _step_page_response(summary, rows, limit, after, before)
+
+
+def _step_window_queries(summary: dict, steps_before: int, steps_after: int):
+    """Build the queries for the steps around the current step, each with a look-ahead row."""
+    query = _roadmap_step_rows_query(summary["id"])
+    if summary["current_step"] is None:
+        # Everything completed (or nothing to do): anchor the window at the end
+        return query.order_by(None).order_by(RoadmapStep.order.desc()).limit(steps_before + 2), None
+    
+    current_order = summary["current_step"]["order"]
+    preceding = query.where(RoadmapStep.order < current_order).order_by(None).order_by(
+        RoadmapStep.order.desc()
+    ).limit(steps_before + 1)
+    following = query.where(RoadmapStep.order >= current_order).limit(steps_after + 2)
+    return preceding, following
+
+
+def _step_window_response(
+    summary: dict,
+    preceding: List[Row],
+    following: Optional[List[Row]],
+    steps_before: int,
+    steps_after: int
+) -> dict:
+    if following is None:
+        # Anchored at the last step: it plus steps_before earlier ones
+        rows = preceding[:steps_before + 1][::-1]
+        has_previous = len(preceding) > steps_before + 1
+        has_next = False
     else:
-        not_started_step = next((step for step in steps if step.status == StepStatus.NOT_STARTED), None)
-        if not_started_step:
-            current_step = {
-                "step_id": not_started_step.step_id,
-                "title": not_started_step.step.title,
-                "order": not_started_step.step.order
-            }
+        rows = preceding[:steps_before][::-1] + following[:steps_after + 1]
+        has_previous = len(preceding) > steps_before
+        has_next = len(following) > steps_after + 1
     
     return {
-        "id": roadmap.id,
-        "template_id": roadmap.template_id,
-        "created_at": roadmap.created_at,
-        "steps": steps,
-        "total_steps": total_steps,
-        "completed_steps": completed_steps,
-        "in_progress_steps": in_progress_steps,
-        "not_started_steps": not_started_steps,
-        "completion_percentage": round(completion_percentage, 2),
-        "current_step": current_step
+        **summary,
+        "steps": [_step_document(row) for row in rows],
+        "next_cursor": rows[-1].order if rows and has_next else None,
+        "prev_cursor": rows[0].order if rows and has_previous else None
     }
 
 
-def update_step_status(
+def get_roadmap_step_window(
     db: Session,
+    summary: dict,
+    steps_before: int,
+    steps_after: int
+) -> dict:
+    """Get the current step with up to steps_before steps before it and steps_after after it.
+    
+    The cursors continue from either edge of the window with get_roadmap_step_page.
+    """
+    preceding_query, following_query = _step_window_queries(summary, steps_before, steps_after)
+    preceding = db.execute(preceding_query).all()
+    following = db.execute(following_query).all() if following_query is not None else None
+    
+    return _step_window_response(summary, preceding, following, steps_before, steps_after)
+
+
+def _step_status_update(
     user_id: int,
     step_id: int,
     status: StepStatus,
     notes: Optional[str] = None
-) -> Optional[UserRoadmapStep]:
-    """Update the status of a roadmap step for a user."""
-    # Verify the step belongs to the user's roadmap
-    user_step = db.query(UserRoadmapStep).options(
-        joinedload(UserRoadmapStep.step)
-    ).join(UserRoadmap).filter(
-        UserRoadmap.user_id == user_id,
-        UserRoadmapStep.step_id == step_id
-    ).first()
+):
+    """Build one UPDATE ... RETURNING applying a status change and its side effects.
     
-    if not user_step:
-        return None
+    Touches the target step, any other in-progress steps (only one step may be
+    in progress at a time) and, when completing, the next step by order, which
+    is auto-advanced to in_progress unless it is already completed.
+    """
+    target_step = aliased(RoadmapStep)
+    other = aliased(UserRoadmapStep)
+    is_target = UserRoadmapStep.step_id == step_id
     
-    # Get the roadmap to access all steps
-    roadmap = user_step.roadmap
-    
-    # If marking as in_progress, ensure only one step is in_progress at a time
-    if status == StepStatus.IN_PROGRESS:
-        # Set all other in_progress steps to not_started (unless they're completed)
-        other_in_progress_steps = db.query(UserRoadmapStep).join(UserRoadmap).filter(
-            UserRoadmap.user_id == user_id,
-            UserRoadmapStep.roadmap_id == roadmap.id,
-            UserRoadmapStep.step_id != step_id,
-            UserRoadmapStep.status == StepStatus.IN_PROGRESS
-        ).all()
-        
-        for other_step in other_in_progress_steps:
-            other_step.status = StepStatus.NOT_STARTED
+    # Restrict to the user's roadmap, and only if it contains the target step
+    conditions = [
+        UserRoadmapStep.roadmap_id.in_(
+            select(UserRoadmap.id).where(UserRoadmap.user_id == user_id)
+        ),
+        exists().where(
+            other.roadmap_id == UserRoadmapStep.roadmap_id,
+            other.step_id == step_id
+        ),
+    ]
+    affected = [is_target]
+    new_status = [(is_target, status)]
     
-    # If marking as completed, handle auto-advancement
     if status == StepStatus.COMPLETED:
-        # 1. Set completed_at timestamp if not already set
-        if not user_step.completed_at:
-            user_step.completed_at = datetime.utcnow().isoformat()
-        
-        # 2. Ensure only one step is in_progress: clear all other in_progress steps
-        other_in_progress_steps = db.query(UserRoadmapStep).join(UserRoadmap).filter(
-            UserRoadmap.user_id == user_id,
-            UserRoadmapStep.roadmap_id == roadmap.id,
-            UserRoadmapStep.step_id != step_id,
-            UserRoadmapStep.status == StepStatus.IN_PROGRESS
-        ).all()
-        
-        for other_step in other_in_progress_steps:
-            other_step.status = StepStatus.NOT_STARTED
-        
-        # 3. Automatically move the next step (order + 1) to "in_progress"
-        current_step_order = user_step.step.order
-        next_step = db.query(UserRoadmapStep).options(
-            joinedload(UserRoadmapStep.step)
-        ).join(RoadmapStep).join(UserRoadmap).filter(
-            UserRoadmap.user_id == user_id,
-            UserRoadmapStep.roadmap_id == roadmap.id,
-            RoadmapStep.order == current_step_order + 1,
+        # Next step (order + 1) in the target step's template
+        next_step_ids = select(RoadmapStep.id).where(
+            RoadmapStep.template_id == select(target_step.template_id).where(
+                target_step.id == step_id
+            ).scalar_subquery(),
+            RoadmapStep.order == select(target_step.order).where(
+                target_step.id == step_id
+            ).scalar_subquery() + 1
+        )
+        is_next = and_(
+            UserRoadmapStep.step_id.in_(next_step_ids),
             UserRoadmapStep.status != StepStatus.COMPLETED  # Don't change already completed steps
-        ).first()
-        
-        if next_step:
-            next_step.status = StepStatus.IN_PROGRESS
-    
-    elif status != StepStatus.COMPLETED:
+        )
+        affected.append(is_next)
+        new_status.append((is_next, StepStatus.IN_PROGRESS))
+        # Keep completed_at if it was already set
+        completed_at = case(
+            (is_target, func.coalesce(UserRoadmapStep.completed_at, datetime.utcnow())),
+            else_=UserRoadmapStep.completed_at
+        )
+    else:
         # If changing from completed to something else, clear completed_at
-        user_step.completed_at = None
+        completed_at = case((is_target, None), else_=UserRoadmapStep.completed_at)
+    
+    if status in (StepStatus.IN_PROGRESS, StepStatus.COMPLETED):
+        # Ensure only one step is in_progress: clear all other in_progress steps
+        is_other_in_progress = UserRoadmapStep.status == StepStatus.IN_PROGRESS
+        affected.append(is_other_in_progress)
+        new_status.append((is_other_in_progress, StepStatus.NOT_STARTED))
     
-    # Update the step status
-    user_step.status = status
+    values = {
+        "status": case(
+            *[(condition, literal(value, UserRoadmapStep.status.type)) for condition, value in new_status],
+            else_=UserRoadmapStep.status
+        ),
+        "completed_at": completed_at,
+    }
     if notes is not None:
-        user_step.notes = notes
+        values["notes"] = case((is_target, notes), else_=UserRoadmapStep.notes)
+    
+    return update(UserRoadmapStep).where(
+        *conditions, or_(*affected)
+    ).values(**values).returning(
+        UserRoadmapStep.id,
+        UserRoadmapStep.roadmap_id,
+        UserRoadmapStep.step_id,
+        UserRoadmapStep.status,
+        UserRoadmapStep.notes,
+        UserRoadmapStep.completed_at
+    ).execution_options(synchronize_session=False)
+
+
+def update_step_status(
+    db: Session,
+    user_id: int,
+    step_id: int,
+    status: StepStatus,
+    notes: Optional[str] = None
+) -> Optional[Row]:
+    """Update the status of a roadmap step for a user.
+    
+    Runs exactly three statements in one transaction: the set-based step
+    UPDATE and the two of the roadmap's progress counter refresh.
+    """
+    changed_steps = db.execute(_step_status_update(user_id, step_id, status, notes)).all()
+    
+    # No rows means the step does not belong to the user's roadmap
+    user_step = next((row for row in changed_steps if row.step_id == step_id), None)
+    if not user_step:
+        return None
+    
+    # Keep the roadmap's progress counters in the same transaction
+    refresh_progress_counters(db, user_step.roadmap_id, changed_steps)
     
     db.commit()
-    db.refresh(user_step)
     return user_step
 
+
+def update_step_statuses(
+    db: Session,
+    user_id: int,
+    updates: List[Tuple[int, StepStatus, Optional[str]]]
+) -> Optional[dict]:
+    """Apply an ordered batch of (step_id, status, notes) updates in one transaction.
+    
+    Each update runs the same statement as update_step_status, in order, so
+    later updates see the effects of earlier ones. Progress counters are
+    refreshed and the transaction committed once. If any step does not belong
+    to the user's roadmap nothing is applied and None is returned; otherwise
+    the resulting roadmap summary is returned.
+    """
+    roadmap_id = None
+    all_changed_steps = []
+    for step_id, status, notes in updates:
+        changed_steps = db.execute(_step_status_update(user_id, step_id, status, notes)).all()
+        
+        user_step = next((row for row in changed_steps if row.step_id == step_id), None)
+        if not user_step:
+            db.rollback()
+            return None
+        roadmap_id = user_step.roadmap_id
+        all_changed_steps.extend(changed_steps)
+    
+    refresh_progress_counters(db, roadmap_id, all_changed_steps)
+    
+    db.commit()
+    return get_roadmap_summary(db, user_id)
+
+
+def resync_roadmaps_to_template(
+    db: Session,
+    roadmap_ids: List[int],
+    source_template_id: int,
+    target_template_id: int,
+    step_mapping: Dict[int, int]
+) -> Tuple[int, int, int]:
+    """Move roadmaps onto another template version with set-based statements.
+    
+    The roadmaps must all follow the source template. `step_mapping` maps
+    its steps to the matching steps of the target template. Mapped rows are
+    repointed in place, so their status, notes and completed_at are kept;
+    rows of unmapped steps are deleted, and target steps no row points to yet
+    are inserted as not_started. Two upserts move the roadmaps' progress from
+    their source cohorts to the target's, and a final UPDATE moves the
+    roadmaps and recomputes their counters. Runs six statements however many
+    roadmaps are given; the caller commits. Returns (rows remapped, rows
+    deleted, rows inserted).
+    """
+    in_batch = UserRoadmapStep.roadmap_id.in_(roadmap_ids)
+    remapped = 0
+    if step_mapping:
+        remapped = db.execute(
+            update(UserRoadmapStep).where(
+                in_batch,
+                UserRoadmapStep.step_id.in_(list(step_mapping))
+            ).values(
+                step_id=case(step_mapping, value=UserRoadmapStep.step_id)
+            ).execution_options(synchronize_session=False)
+        ).rowcount
+    
+    target_steps = select(RoadmapStep.id).where(
+        RoadmapStep.template_id == target_template_id,
+        RoadmapStep.is_retired == False
+    )
+    deleted = db.execute(
+        delete(UserRoadmapStep).where(
+            in_batch,
+            UserRoadmapStep.step_id.not_in(target_steps)
+        ).execution_options(synchronize_session=False)
+    ).rowcount
+    
+    existing = aliased(UserRoadmapStep)
+    inserted = db.execute(
+        insert(UserRoadmapStep).from_select(
+            ["roadmap_id", "step_id", "status"],
+            select(
+                UserRoadmap.id,
+                RoadmapStep.id,
+                literal(StepStatus.NOT_STARTED, UserRoadmapStep.status.type)
+            ).join(
+                RoadmapStep, and_(RoadmapStep.template_id == target_template_id, RoadmapStep.is_retired == False)
+            ).where(
+                UserRoadmap.id.in_(roadmap_ids),
+                ~exists().where(
+                    existing.roadmap_id == UserRoadmap.id,
+                    existing.step_id == RoadmapStep.id
+                )
+            )
+        )
+    ).rowcount
+    
+    # The roadmaps leave their cohorts of the source template for the same
+    # cohorts of the target, before their counters are overwritten
+    in_roadmaps = UserRoadmap.id.in_(roadmap_ids)
+    db.execute(cohort_delta_upsert(
+        db, in_roadmaps, old=_stored_progress(), roadmaps=-1, template_id=source_template_id
+    ))
+    db.execute(cohort_delta_upsert(
+        db, in_roadmaps, new=_recounted_progress(), roadmaps=1, template_id=target_template_id
+    ))
+    
+    rows = db.execute(_progress_counters_bulk_update(in_roadmaps, template_id=target_template_id)).all()
+    for row in rows:
+        track_progress_change(db, row, reload=True)
+    
+    return remapped, deleted, inserted
+
+
+# Async variants, used when ASYNC_DATABASE is enabled. They share the
+# statement builders above and only differ in how statements are awaited.
+
+
+async def refresh_progress_counters_async(
+    db: AsyncSession,
+    roadmap_id: int,
+    changed_steps: Sequence[Row] = (),
+    reload: bool = False,
+    new_roadmap: bool = False
+) -> None:
+    """Recompute a roadmap's denormalized progress counters and its cohort's aggregates in two statements."""
+    await db.execute(_cohort_progress_update(db, roadmap_id, new_roadmap))
+    track_progress_change(
+        db, (await db.execute(_progress_counters_update(roadmap_id))).one_or_none(), changed_steps, reload
+    )
+
+
+async def generate_roadmap_for_user_async(
+    db: AsyncSession,
+    user_id: int,
+    profile: StudentProfile
+) -> Optional[UserRoadmap]:
+    """Generate a personalized roadmap for a user based on their profile."""
+    existing_roadmap = (await db.execute(
+        select(UserRoadmap).where(UserRoadmap.user_id == user_id).limit(1)
+    )).scalars().first()
+    
+    if existing_roadmap:
+        return existing_roadmap
+    
+    # The catalog only queries on reload; run it on the session's sync facade
+    template = await db.run_sync(
+        lambda sync_db: find_matching_template(
+            db=sync_db,
+            branch=profile.branch,
+            career_goal=profile.career_goal,
+            current_year=profile.current_year
+        )
+    )
+    
+    if not template:
+        return None
+    
+    roadmap = UserRoadmap(
+        user_id=user_id,
+        template_id=template.id,
+        created_at=datetime.utcnow(),
+        cohort_branch=profile.branch,
+        cohort_year=profile.current_year,
+        cohort_career_goal=profile.career_goal
+    )
+    db.add(roadmap)
+    try:
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        return (await db.execute(
+            select(UserRoadmap).where(UserRoadmap.user_id == user_id).limit(1)
+        )).scalars().first()
+    
+    await db.execute(_materialize_steps(roadmap.id, template.id))
+    await refresh_progress_counters_async(db, roadmap.id, reload=True, new_roadmap=True)
+    
+    await db.commit()
+    return roadmap
+
+
+async def get_user_roadmap_async(
+    db: AsyncSession,
+    user_id: int
+) -> Optional[UserRoadmap]:
+    """Get the user's roadmap row (progress counters and version) without its steps."""
+    # Counters may have been rewritten by a set-based UPDATE in this session,
+    # and async sessions do not expire objects on commit
+    return (await db.execute(
+        select(UserRoadmap).where(
+            UserRoadmap.user_id == user_id
+        ).limit(1).execution_options(populate_existing=True)
+    )).scalars().first()
+
+
+async def get_roadmap_progress_async(
+    db: AsyncSession,
+    roadmap: UserRoadmap
+) -> dict:
+    """Load a roadmap's steps and combine them with its progress counters."""
+    steps = (await db.execute(_roadmap_steps_query(roadmap.id))).scalars().all()
+    
+    return _progress_response(roadmap, steps)
+
+
+async def get_roadmap_document_async(
+    db: AsyncSession,
+    roadmap: UserRoadmap
+) -> dict:
+    """Build the RoadmapResponse payload from plain rows, skipping ORM hydration."""
+    rows = (await db.execute(_roadmap_step_rows_query(roadmap.id))).all()
+    
+    return _roadmap_document(roadmap, rows)
+
+
+async def get_roadmap_with_progress_async(
+    db: AsyncSession,
+    user_id: int
+) -> Optional[dict]:
+    """Get user's roadmap with progress and completion percentage."""
+    roadmap = await get_user_roadmap_async(db, user_id)
+    
+    if not roadmap:
+        return None
+    
+    return await get_roadmap_progress_async(db, roadmap)
+
+
+async def get_roadmap_summary_async(
+    db: AsyncSession,
+    user_id: int
+) -> Optional[dict]:
+    """Get user's roadmap progress from the roadmap row alone, without its steps."""
+    row = (await db.execute(_summary_query(user_id))).first()
+    
+    if not row:
+        return None
+    
+    return _summary_response(row)
+
+
+async def get_roadmap_step_page_async(
+    db: AsyncSession,
+    summary: dict,
+    limit: int,
+    after: Optional[int] = None,
+    before: Optional[int] = None
+) -> dict:
+    """Get one page of a roadmap's steps after (or before) a step order."""
+    rows = (await db.execute(_step_page_query(summary["id"], after, before, limit))).all()
+    
+    return _step_page_response(summary, rows, limit, after, before)
+
+
+async def get_roadmap_step_window_async(
+    db: AsyncSession,
+    summary: dict,
+    steps_before: int,
+    steps_after: int
+) -> dict:
+    """Get the current step with up to steps_before steps before it and steps_after after it."""
+    preceding_query, following_query = _step_window_queries(summary, steps_before, steps_after)
+    preceding = (await db.execute(preceding_query)).all()
+    following = (await db.execute(following_query)).all() if following_query is not None else None
+    
+    return _step_window_response(summary, preceding, following, steps_before, steps_after)
+
+
+async def update_step_status_async(
+    db: AsyncSession,
+    user_id: int,
+    step_id: int,
+    status: StepStatus,
+    notes: Optional[str] = None
+) -> Optional[Row]:
+    """Update the status of a roadmap step for a user."""
+    changed_steps = (await db.execute(_step_status_update(user_id, step_id, status, notes))).all()
+    
+    user_step = next((row for row in changed_steps if row.step_id == step_id), None)
+    if not user_step:
+        return None
+    
+    await refresh_progress_counters_async(db, user_step.roadmap_id, changed_steps)
+    
+    await db.commit()
+    return user_step
+
+
+async def update_step_statuses_async(
+    db: AsyncSession,
+    user_id: int,
+    updates: List[Tuple[int, StepStatus, Optional[str]]]
+) -> Optional[dict]:
+    """Apply an ordered batch of (step_id, status, notes) updates in one transaction."""
+    roadmap_id = None
+    all_changed_steps = []
+    for step_id, status, notes in updates:
+        changed_steps = (await db.execute(_step_status_update(user_id, step_id, status, notes))).all()
+        
+        user_step = next((row for row in changed_steps if row.step_id == step_id), None)
+        if not user_step:
+            await db.rollback()
+            return None
+        roadmap_id = user_step.roadmap_id
+        all_changed_steps.extend(changed_steps)
+    
+    await refresh_progress_counters_async(db, roadmap_id, all_changed_steps)
+    
+    await db.commit()
+    return await get_roadmap_summary_async(db, user_id)
@@ -0,0 +1,253 @@
+"""
+Process-local catalog of active roadmap templates.
+
+Templates are tiny and almost never change, so they are loaded once (with
+their ordered steps) and matched in memory. New roadmaps are only matched to
+the newest active version of each template name; older active versions stay
+available through get() for the roadmaps that still follow them. The catalog reloads when a
+session commits a template/step write, or when the TTL expires and the
+cheap fingerprint query reports that the table contents changed.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, select, case
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.roadmap_templates import RoadmapTemplate
+from app.models.roadmap_steps import RoadmapStep
+from app.models.student_profile import Branch, CareerGoal
+
+# Academic years the index is resolved for ahead of time
+MIN_YEAR = 1
+MAX_YEAR = 4
+
+
+@dataclass(frozen=True)
+class CatalogStep:
+    id: int
+    template_id: int
+    title: str
+    description: Optional[str]
+    order: int
+    estimated_duration: Optional[str]
+    resources: Optional[str]
+
+
+@dataclass(frozen=True)
+class CatalogTemplate:
+    id: int
+    name: str
+    version: int
+    description: Optional[str]
+    branch: Optional[Branch]
+    career_goal: CareerGoal
+    start_year: Optional[int]
+    end_year: Optional[int]
+    steps: Tuple[CatalogStep, ...]
+
+    def covers_year(self, year: int) -> bool:
+        """Check whether the template applies to the given academic year."""
+        return (
+            (self.start_year is None or self.start_year <= year)
+            and (self.end_year is None or self.end_year >= year)
+        )
+
+
+class TemplateCatalog:
+    """In-memory index of active templates keyed by (career_goal, branch, year)."""
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._templates: Dict[int, CatalogTemplate] = {}
+        self._by_goal: Dict[CareerGoal, List[CatalogTemplate]] = {}
+        self._index: Dict[Tuple[CareerGoal, Optional[Branch], int], Optional[CatalogTemplate]] = {}
+        self._fingerprint: Optional[tuple] = None
+        self._checked_at = 0.0
+        # Bumped on every invalidation; the catalog is fresh while the
+        # generation it was loaded at is still current
+        self._generation = 1
+        self._loaded_generation = 0
+        self.reloads = 0
+
+    @property
+    def ttl_seconds(self) -> int:
+        if self._ttl_seconds is not None:
+            return self._ttl_seconds
+        return settings.TEMPLATE_CATALOG_TTL_SECONDS
+
+    def invalidate(self) -> None:
+        """Force a reload on the next lookup."""
+        self._generation += 1
+
+    def match(
+        self,
+        db: Session,
+        branch: Optional[Branch],
+        career_goal: CareerGoal,
+        current_year: int
+    ) -> Optional[CatalogTemplate]:
+        """Find the best matching template without querying roadmap_templates."""
+        self._ensure_fresh(db)
+        key = (career_goal, branch, current_year)
+        if key in self._index:
+            return self._index[key]
+        # Years outside the pre-resolved range are rare; resolve them directly
+        return self._resolve(self._by_goal.get(career_goal, []), branch, current_year)
+
+    def get(self, db: Session, template_id: int) -> Optional[CatalogTemplate]:
+        """Get an active template by id."""
+        self._ensure_fresh(db)
+        return self._templates.get(template_id)
+
+    def warm(self, db: Session) -> int:
+        """Load the catalog now (at startup) instead of on the first lookup; returns the template count."""
+        self._ensure_fresh(db)
+        return len(self._templates)
+
+    def _is_fresh(self, now: float) -> bool:
+        return (
+            self._loaded_generation == self._generation
+            and now - self._checked_at < self.ttl_seconds
+        )
+
+    def _ensure_fresh(self, db: Session) -> None:
+        if self._is_fresh(time.monotonic()):
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            if self._is_fresh(now):
+                return
+
+            generation = self._generation
+            fingerprint = self._read_fingerprint(db)
+            if self._loaded_generation != generation or fingerprint != self._fingerprint:
+                self._load(db)
+                self._fingerprint = fingerprint
+            self._loaded_generation = generation
+            self._checked_at = now
+
+    @staticmethod
+    def _read_fingerprint(db: Session) -> tuple:
+        """Cheap version check used to detect writes made outside this process."""
+        templates = db.execute(
+            select(
+                func.count(RoadmapTemplate.id),
+                func.max(RoadmapTemplate.id),
+                func.sum(case((RoadmapTemplate.is_active == True, 1), else_=0)),
+                # Imports update templates and steps in place
+                func.max(RoadmapTemplate.updated_at),
+            )
+        ).one()
+        steps = db.execute(
+            select(func.count(RoadmapStep.id), func.max(RoadmapStep.id))
+        ).one()
+        return tuple(templates) + tuple(steps)
+
+    def _load(self, db: Session) -> None:
+        template_rows = db.execute(
+            select(
+                RoadmapTemplate.id,
+                RoadmapTemplate.name,
+                RoadmapTemplate.version,
+                RoadmapTemplate.description,
+                RoadmapTemplate.branch,
+                RoadmapTemplate.career_goal,
+                RoadmapTemplate.start_year,
+                RoadmapTemplate.end_year,
+            ).where(RoadmapTemplate.is_active == True).order_by(RoadmapTemplate.id)
+        ).all()
+
+        step_rows = db.execute(
+            select(
+                RoadmapStep.id,
+                RoadmapStep.template_id,
+                RoadmapStep.title,
+                RoadmapStep.description,
+                RoadmapStep.order,
+                RoadmapStep.estimated_duration,
+                RoadmapStep.resources,
+            ).join(RoadmapTemplate).where(
+                RoadmapTemplate.is_active == True,
+                RoadmapStep.is_retired == False
+            ).order_by(RoadmapStep.template_id, RoadmapStep.order)
+        ).all()
+
+        steps_by_template: Dict[int, List[CatalogStep]] = {}
+        for row in step_rows:
+            steps_by_template.setdefault(row.template_id, []).append(CatalogStep(*row))
+
+        templates: Dict[int, CatalogTemplate] = {}
+        # Newest active version per name, in the id order of the name's first version
+        newest: Dict[str, CatalogTemplate] = {}
+        for row in template_rows:
+            template = CatalogTemplate(*row, steps=tuple(steps_by_template.get(row.id, ())))
+            templates[template.id] = template
+            if template.name not in newest or template.version > newest[template.name].version:
+                newest[template.name] = template
+
+        # A newer version supersedes the older ones for new roadmaps; existing
+        # roadmaps keep theirs until template_resync moves them
+        by_goal: Dict[CareerGoal, List[CatalogTemplate]] = {}
+        for template in newest.values():
+            by_goal.setdefault(template.career_goal, []).append(template)
+
+        # Resolve every (goal, branch, year) combination, including the
+        # branch-agnostic fallback, so lookups are a single dict access
+        index = {}
+        for career_goal, candidates in by_goal.items():
+            for branch in [*Branch, None]:
+                for year in range(MIN_YEAR, MAX_YEAR + 1):
+                    index[(career_goal, branch, year)] = self._resolve(candidates, branch, year)
+
+        self._templates = templates
+        self._by_goal = by_goal
+        self._index = index
+        self.reloads += 1
+
+    @staticmethod
+    def _resolve(
+        candidates: List[CatalogTemplate],
+        branch: Optional[Branch],
+        year: int
+    ) -> Optional[CatalogTemplate]:
+        # First, exact match (branch + career_goal + year range)
+        if branch is not None:
+            for template in candidates:
+                if template.branch == branch and template.covers_year(year):
+                    return template
+
+        # Fallback: match by career_goal only (branch-agnostic)
+        for template in candidates:
+            if template.branch is None and template.covers_year(year):
+                return template
+
+        return None
+
+
+template_catalog = TemplateCatalog()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_template_writes(session, flush_context):
+    """Remember that this transaction touched templates or their steps."""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (RoadmapTemplate, RoadmapStep)):
+            session.info["template_catalog_dirty"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop("template_catalog_dirty", False):
+        template_catalog.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("template_catalog_dirty", None)
@@ -0,0 +1,333 @@
+"""
+Streaming import of roadmap template definitions.
+
+Two formats are accepted:
+
+- NDJSON: one template per line, with its steps nested under "steps".
+- CSV: one step per row. The template columns (name, version, description,
+  branch, career_goal, start_year, end_year, is_active) are repeated on every
+  row, and consecutive rows with the same (name, version) form one template.
+  The step columns are step_order, step_title, step_description,
+  step_estimated_duration and step_resources. Empty cells are treated as null.
+
+Records are validated one at a time. An invalid record is skipped and
+reported with its line number, and the rest of the file is still imported.
+Valid templates are written in batches: an executemany upsert for the
+templates, one for their steps (SQLAlchemy pages both into multi-row
+INSERTs), then one commit per batch. Only the current batch is held in
+memory, so memory use does not grow with the file size.
+
+Templates are upserted on (name, version) and steps on (template_id, order),
+so importing the same file again rewrites the same rows. A step that is
+dropped from an existing template is deleted, unless user roadmaps already
+reference it. In that case it is kept for those roadmaps but retired
+(RoadmapStep.is_retired), so new roadmaps and the catalog no longer get it,
+and it is counted as retained. Listing the step's order again revives it.
+Steps whose content is unchanged are not rewritten; when a step of an
+existing template is rewritten, the version (ETag) of the roadmaps following
+the template is bumped in the same transaction, so clients refetch the new
+text. To change the steps of a template that students are following,
+publish a new version and move their roadmaps onto it with template_resync.
+"""
+import csv
+import json
+import time
+from datetime import datetime
+from typing import IO, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import delete, exists, or_, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.database import upsert_insert
+from app.models import RoadmapStep, RoadmapTemplate, UserRoadmap, UserRoadmapStep
+from app.schemas.template import TemplateImport, TemplateImportError, TemplateImportReport
+from app.services.template_catalog import template_catalog
+
+FORMATS = ("ndjson", "csv")
+# Templates written per transaction
+DEFAULT_BATCH_SIZE = 100
+# Also end a batch after this many steps, so a few huge templates stay bounded
+MAX_BATCH_STEPS = 5000
+# Ids per DELETE or retiring UPDATE; keeps SQLite under its bound-parameter limit
+DELETE_CHUNK_SIZE = 500
+# Failures listed in the report; records_failed counts all of them
+MAX_REPORTED_ERRORS = 100
+
+TEMPLATE_COLUMNS = (
+    "name", "version", "description", "branch", "career_goal", "start_year", "end_year", "is_active"
+)
+# CSV step column -> TemplateStepImport field
+STEP_COLUMNS = {
+    "step_order": "order",
+    "step_title": "title",
+    "step_description": "description",
+    "step_estimated_duration": "estimated_duration",
+    "step_resources": "resources",
+}
+REQUIRED_CSV_COLUMNS = ("name", "career_goal", "step_order", "step_title")
+# Step columns an import rewrites
+STEP_UPSERT_COLUMNS = ("title", "description", "estimated_duration", "resources", "is_retired")
+
+# File extension / content type -> format
+_FORMAT_HINTS = {
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json-lines": "ndjson",
+    "text/csv": "csv",
+}
+
+
+class TemplateFileError(ValueError):
+    """The import file cannot be read at all (unknown format, bad CSV header)."""
+
+
+class _Record(NamedTuple):
+    line: int
+    data: Optional[dict]
+    error: Optional[str] = None
+
+
+def detect_format(hint: Optional[str]) -> Optional[str]:
+    """Infer the import format from a file name or content type."""
+    if not hint:
+        return None
+    hint = hint.split(";")[0].strip().lower()
+    if hint in _FORMAT_HINTS:
+        return _FORMAT_HINTS[hint]
+    for suffix, file_format in _FORMAT_HINTS.items():
+        if suffix.startswith(".") and hint.endswith(suffix):
+            return file_format
+    return None
+
+
+def _ndjson_records(stream: IO[str]) -> Iterator[_Record]:
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield _Record(line_number, None, f"invalid JSON: {exc.msg}")
+            continue
+        if not isinstance(data, dict):
+            yield _Record(line_number, None, "expected a JSON object")
+            continue
+        yield _Record(line_number, data)
+
+
+def _present(row: dict, columns) -> dict:
+    """Non-empty cells of a CSV row, keyed by column."""
+    return {column: row[column] for column in columns if row.get(column) not in (None, "")}
+
+
+def _csv_records(stream: IO[str]) -> Iterator[_Record]:
+    reader = csv.DictReader(stream)
+    missing = [column for column in REQUIRED_CSV_COLUMNS if column not in (reader.fieldnames or ())]
+    if missing:
+        raise TemplateFileError(f"CSV header is missing columns: {', '.join(missing)}")
+
+    key = None
+    template = None
+    first_line = 0
+    for row in reader:
+        row_key = (row.get("name"), row.get("version") or "1")
+        if row_key != key:
+            if template is not None:
+                yield _Record(first_line, template)
+            key = row_key
+            template = {**_present(row, TEMPLATE_COLUMNS), "steps": []}
+            first_line = reader.line_num
+        template["steps"].append({
+            field: value for column, field in STEP_COLUMNS.items()
+            for value in [row.get(column)] if value not in (None, "")
+        })
+    if template is not None:
+        yield _Record(first_line, template)
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def _write_batch(db: Session, batch: Dict[Tuple[str, int], TemplateImport], report: TemplateImportReport) -> None:
+    """Upsert one batch of templates and their steps, then commit."""
+    keys = list(batch)
+    now = datetime.utcnow()
+
+    existing = set(
+        db.execute(
+            select(RoadmapTemplate.name, RoadmapTemplate.version).where(
+                tuple_(RoadmapTemplate.name, RoadmapTemplate.version).in_(keys)
+            )
+        ).all()
+    )
+
+    template_insert = upsert_insert(db, RoadmapTemplate.__table__)
+    template_upsert = template_insert.on_conflict_do_update(
+        index_elements=["name", "version"],
+        set_={
+            column: template_insert.excluded[column]
+            for column in (
+                "description", "branch", "career_goal", "start_year", "end_year", "is_active", "updated_at"
+            )
+        },
+    ).returning(RoadmapTemplate.id, RoadmapTemplate.name, RoadmapTemplate.version)
+    template_rows = [
+        {
+            "name": template.name,
+            "version": template.version,
+            "description": template.description,
+            "branch": template.branch,
+            "career_goal": template.career_goal,
+            "start_year": template.start_year,
+            "end_year": template.end_year,
+            "is_active": template.is_active,
+            "updated_at": now,
+        }
+        for template in batch.values()
+    ]
+    # executemany with a cached statement; SQLAlchemy sends it as multi-row
+    # INSERT ... VALUES pages ("insertmanyvalues") sized to the driver limits
+    template_ids = {(row.name, row.version): row.id for row in db.execute(template_upsert, template_rows)}
+
+    steps = RoadmapStep.__table__
+    step_insert = upsert_insert(db, steps)
+    step_upsert = step_insert.on_conflict_do_update(
+        index_elements=["template_id", "order"],
+        set_={column: step_insert.excluded[column] for column in STEP_UPSERT_COLUMNS},
+        # Unchanged steps are skipped, so only new and rewritten steps are returned
+        where=or_(*[steps.c[column].is_distinct_from(step_insert.excluded[column]) for column in STEP_UPSERT_COLUMNS]),
+    ).returning(RoadmapStep.id, RoadmapStep.template_id)
+    step_rows = [
+        {
+            "template_id": template_ids[key],
+            "title": step.title,
+            "description": step.description,
+            "order": step.order,
+            "estimated_duration": step.estimated_duration,
+            "resources": step.resources,
+            "is_retired": False,
+        }
+        for key, template in batch.items()
+        for step in template.steps
+    ]
+    written = db.execute(step_upsert, step_rows).all()
+    updated_ids = [template_ids[key] for key in keys if key in existing]
+    # Steps of new templates cannot be on any roadmap yet
+    rewritten_template_ids = sorted({row.template_id for row in written} & set(updated_ids))
+
+    # Steps of updated templates that the import no longer lists
+    imported = {(row["template_id"], row["order"]) for row in step_rows}
+    stale_ids = []
+    retired_ids = []
+    if updated_ids:
+        current = db.execute(
+            select(
+                RoadmapStep.id,
+                RoadmapStep.template_id,
+                RoadmapStep.order,
+                exists().where(UserRoadmapStep.step_id == RoadmapStep.id).label("referenced"),
+            ).where(RoadmapStep.template_id.in_(updated_ids))
+        ).all()
+        for row in current:
+            if (row.template_id, row.order) in imported:
+                continue
+            if row.referenced:
+                retired_ids.append(row.id)
+            else:
+                stale_ids.append(row.id)
+    for start in range(0, len(stale_ids), DELETE_CHUNK_SIZE):
+        db.execute(delete(RoadmapStep).where(RoadmapStep.id.in_(stale_ids[start:start + DELETE_CHUNK_SIZE])))
+    for start in range(0, len(retired_ids), DELETE_CHUNK_SIZE):
+        db.execute(
+            update(RoadmapStep).where(
+                RoadmapStep.id.in_(retired_ids[start:start + DELETE_CHUNK_SIZE])
+            ).values(is_retired=True)
+        )
+    if rewritten_template_ids:
+        # Roadmaps showing a rewritten step must not keep answering 304; a
+        # roadmap only holds steps of the template it follows
+        db.execute(
+            update(UserRoadmap).where(
+                UserRoadmap.template_id.in_(rewritten_template_ids)
+            ).values(version=UserRoadmap.version + 1).execution_options(synchronize_session=False)
+        )
+
+    db.commit()
+
+    report.templates_created += len(keys) - len(existing)
+    report.templates_updated += len(existing)
+    report.steps_written += len(step_rows)
+    report.steps_removed += len(stale_ids)
+    report.steps_retained += len(retired_ids)
+
+
+def import_templates(
+    db: Session,
+    stream: IO[str],
+    file_format: str,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> TemplateImportReport:
+    """
+    Import template definitions from a text stream.
+
+    Raises TemplateFileError if the format is unknown or a CSV header lacks
+    required columns. Database errors roll back the current batch and
+    propagate; earlier batches stay committed, and rerunning the import
+    is safe.
+    """
+    if file_format not in FORMATS:
+        raise TemplateFileError(f"Unknown import format {file_format!r}; expected one of {', '.join(FORMATS)}")
+
+    report = TemplateImportReport()
+    records = _ndjson_records(stream) if file_format == "ndjson" else _csv_records(stream)
+    started = time.perf_counter()
+    # Keyed by (name, version): a repeated key within a batch keeps the last
+    # definition, as it would across batches
+    batch: Dict[Tuple[str, int], TemplateImport] = {}
+    batch_steps = 0
+
+    def fail(line: int, message: str) -> None:
+        report.records_failed += 1
+        if len(report.errors) < MAX_REPORTED_ERRORS:
+            report.errors.append(TemplateImportError(line=line, message=message))
+
+    try:
+        for record in records:
+            if record.error is not None:
+                fail(record.line, record.error)
+                continue
+            try:
+                template = TemplateImport.model_validate(record.data)
+            except ValidationError as exc:
+                fail(record.line, _format_validation_error(exc))
+                continue
+
+            batch[(template.name, template.version)] = template
+            batch_steps += len(template.steps)
+            if len(batch) >= batch_size or batch_steps >= MAX_BATCH_STEPS:
+                _write_batch(db, batch, report)
+                batch = {}
+                batch_steps = 0
+
+        if batch:
+            _write_batch(db, batch, report)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        # Core statements bypass the session events the catalog listens to
+        template_catalog.invalidate()
+        report.elapsed_seconds = round(time.perf_counter() - started, 3)
+        if report.elapsed_seconds:
+            report.steps_per_second = round(report.steps_written / report.elapsed_seconds, 1)
+
+    return report
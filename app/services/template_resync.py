@@ -0,0 +1,242 @@
+"""
+Resync of user roadmaps onto a new version of their template.
+
+Templates are versioned by (name, version), and a roadmap keeps the steps of
+the version it was generated from. To change the steps students follow,
+publish a new version (see template_import), then resync the roadmaps of the
+old version onto it.
+
+diff_templates() matches the steps of the two versions by title (trimmed,
+case-insensitive; repeated titles pair up in order) and lists the added,
+removed and reordered steps. resync_roadmaps() then moves the roadmaps of the
+source version in batches of roadmap ids, with a fixed number of set-based
+statements and one commit per batch (roadmap_service.resync_roadmaps_to_template).
+Matched steps keep their status, notes and completed_at; removed steps are
+dropped and added steps start as not_started. Reordering needs no writes,
+since a roadmap's steps are read in the template's order.
+
+Each batch commits on its own, so an interrupted resync leaves every roadmap
+on one version or the other, and running it again finishes the rest. Clients
+are told to reload through the progress stream, and cohort analytics follow
+the roadmaps to the target template.
+"""
+import bisect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import RoadmapStep, RoadmapTemplate, UserRoadmap
+from app.schemas.template import TemplateResyncReport
+from app.services.cohort_analytics import drop_empty_cohorts
+from app.services.roadmap_service import resync_roadmaps_to_template
+
+logger = logging.getLogger(__name__)
+
+# Roadmaps moved per transaction; keeps SQLite under its bound-parameter limit
+DEFAULT_BATCH_SIZE = 500
+
+
+class TemplateResyncError(ValueError):
+    """The roadmaps cannot be resynced between the given templates."""
+
+
+@dataclass(frozen=True)
+class TemplateDiff:
+    source_template_id: int
+    target_template_id: int
+    step_mapping: Dict[int, int]  # Source step id -> matching target step id
+    added: List[dict]  # Target steps without a match: step_id, order, title
+    removed: List[dict]  # Source steps without a match: step_id, order, title
+    reordered: List[dict]  # Matched steps that moved: step_id (target), title, from_order, to_order
+
+
+def _title_key(title: str) -> str:
+    return " ".join(title.split()).casefold()
+
+
+def _step_dict(step) -> dict:
+    return {"step_id": step.id, "order": step.order, "title": step.title}
+
+
+def _moved_positions(orders: List[int]) -> List[int]:
+    """Positions outside a longest increasing run of `orders`: the fewest steps whose moves explain the new order."""
+    tails: List[int] = []  # tails[k]: position ending the best increasing run of length k + 1
+    tail_orders: List[int] = []
+    previous = [-1] * len(orders)
+    for position, order in enumerate(orders):
+        k = bisect.bisect_left(tail_orders, order)
+        if k:
+            previous[position] = tails[k - 1]
+        if k == len(tails):
+            tails.append(position)
+            tail_orders.append(order)
+        else:
+            tails[k] = position
+            tail_orders[k] = order
+
+    kept = set()
+    position = tails[-1] if tails else -1
+    while position != -1:
+        kept.add(position)
+        position = previous[position]
+    return [position for position in range(len(orders)) if position not in kept]
+
+
+def _template_steps(db: Session, template_id: int, include_retired: bool):
+    query = select(RoadmapStep.id, RoadmapStep.order, RoadmapStep.title).where(
+        RoadmapStep.template_id == template_id
+    ).order_by(RoadmapStep.order)
+    if not include_retired:
+        query = query.where(RoadmapStep.is_retired == False)
+    return db.execute(query).all()
+
+
+def _latest_version_id(db: Session, template: RoadmapTemplate) -> Optional[int]:
+    return db.scalar(
+        select(RoadmapTemplate.id).where(
+            RoadmapTemplate.name == template.name,
+            RoadmapTemplate.version > template.version
+        ).order_by(RoadmapTemplate.version.desc()).limit(1)
+    )
+
+
+def diff_templates(
+    db: Session,
+    source_template_id: int,
+    target_template_id: Optional[int] = None
+) -> Optional[TemplateDiff]:
+    """
+    Diff the steps of two templates.
+
+    The target defaults to the newest later version of the source template.
+    Returns None if either template does not exist; raises
+    TemplateResyncError if there is no later version or both are the same.
+    """
+    source = db.get(RoadmapTemplate, source_template_id)
+    if source is None:
+        return None
+    if target_template_id is None:
+        target_template_id = _latest_version_id(db, source)
+        if target_template_id is None:
+            raise TemplateResyncError(f"Template {source_template_id} has no later version to resync to")
+    elif db.get(RoadmapTemplate, target_template_id) is None:
+        return None
+    if target_template_id == source_template_id:
+        raise TemplateResyncError("The source and target templates are the same")
+
+    # Roadmaps may still hold retired source steps; retired target steps are
+    # never given to a roadmap
+    unmatched: Dict[str, List] = {}
+    for step in _template_steps(db, source_template_id, include_retired=True):
+        unmatched.setdefault(_title_key(step.title), []).append(step)
+
+    pairs = []
+    added = []
+    for step in _template_steps(db, target_template_id, include_retired=False):
+        candidates = unmatched.get(_title_key(step.title))
+        if candidates:
+            pairs.append((candidates.pop(0), step))
+        else:
+            added.append(_step_dict(step))
+    removed = sorted(
+        (_step_dict(step) for steps in unmatched.values() for step in steps),
+        key=lambda step: step["order"]
+    )
+
+    pairs.sort(key=lambda pair: pair[0].order)
+    reordered = [
+        {
+            "step_id": pairs[position][1].id,
+            "title": pairs[position][1].title,
+            "from_order": pairs[position][0].order,
+            "to_order": pairs[position][1].order,
+        }
+        for position in _moved_positions([target.order for _, target in pairs])
+    ]
+
+    return TemplateDiff(
+        source_template_id=source_template_id,
+        target_template_id=target_template_id,
+        step_mapping={source.id: target.id for source, target in pairs},
+        added=added,
+        removed=removed,
+        reordered=reordered,
+    )
+
+
+def count_roadmaps(db: Session, template_id: int) -> int:
+    """Count the user roadmaps following a template."""
+    return db.scalar(select(func.count(UserRoadmap.id)).where(UserRoadmap.template_id == template_id))
+
+
+def resync_roadmaps(
+    db: Session,
+    diff: TemplateDiff,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_batch: Optional[Callable[[TemplateResyncReport], None]] = None
+) -> TemplateResyncReport:
+    """
+    Move every roadmap of the diff's source template onto its target.
+
+    Commits once per batch and calls `on_batch` with the running report
+    after each commit. Database errors roll back the current batch and
+    propagate; earlier batches stay committed, and rerunning is safe.
+    """
+    report = TemplateResyncReport(
+        source_template_id=diff.source_template_id,
+        target_template_id=diff.target_template_id,
+        steps_matched=len(diff.step_mapping),
+        steps_added=len(diff.added),
+        steps_removed=len(diff.removed),
+        steps_reordered=len(diff.reordered),
+    )
+    started = time.perf_counter()
+    # Resynced roadmaps leave the source template, so the first rows of the
+    # template's index range are always the next batch (no sort needed), and
+    # roadmaps generated meanwhile are picked up too
+    next_batch = select(UserRoadmap.id).where(
+        UserRoadmap.template_id == diff.source_template_id
+    ).limit(batch_size)
+
+    try:
+        while roadmap_ids := db.scalars(next_batch).all():
+            remapped, deleted, inserted = resync_roadmaps_to_template(
+                db, roadmap_ids, diff.source_template_id, diff.target_template_id, diff.step_mapping
+            )
+            db.commit()
+
+            report.batches += 1
+            report.roadmaps_resynced += len(roadmap_ids)
+            report.rows_remapped += remapped
+            report.rows_deleted += deleted
+            report.rows_inserted += inserted
+            _update_rate(report, started)
+            logger.info(
+                "Template resync %s -> %s: batch %d, %d roadmaps, %.1f rows/s",
+                diff.source_template_id, diff.target_template_id,
+                report.batches, report.roadmaps_resynced, report.rows_per_second
+            )
+            if on_batch is not None:
+                on_batch(report)
+
+        # Source cohorts whose last roadmap has moved are left with all-zero rows
+        drop_empty_cohorts(db, diff.source_template_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        _update_rate(report, started)
+
+    return report
+
+
+def _update_rate(report: TemplateResyncReport, started: float) -> None:
+    report.elapsed_seconds = round(time.perf_counter() - started, 3)
+    if report.elapsed_seconds:
+        rows = report.rows_remapped + report.rows_deleted + report.rows_inserted
+        report.rows_per_second = round(rows / report.elapsed_seconds, 1)
@@ -0,0 +1,120 @@
+"""
+Startup work run from the FastAPI lifespan hook, before the app serves requests.
+
+Importing the application does not touch the database; warm_up() is where it
+happens. It creates missing tables (DB_CREATE_TABLES), opens
+DB_POOL_WARMUP_CONNECTIONS connections on every configured engine so the
+first requests do not pay for connecting, loads the template catalog, starts
+the password hashing pool, builds the progress broker and loads the bcrypt
+backend. Uvicorn accepts connections only after the lifespan startup has
+finished; GET /ready reports the warmup and answers 503 until then.
+"""
+import contextlib
+import logging
+import time
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import Pool, QueuePool
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.config import settings
+from app.core.hashing import get_hashing_pool
+from app.core.pubsub import close_broker, get_broker
+from app.core.security import get_pwd_context
+from app.database import (
+    Base,
+    dispose_engines,
+    get_async_engine,
+    get_async_replica_engine,
+    get_engine,
+    get_replica_engine,
+    get_session_factory,
+)
+from app.services.template_catalog import template_catalog
+
+logger = logging.getLogger(__name__)
+
+# Outcome of the last warm_up(), served by GET /ready
+startup_report: dict = {"ready": False}
+
+
+def _warmup_connections(pool: Pool) -> int:
+    configured = settings.DB_POOL_WARMUP_CONNECTIONS
+    if configured is not None and configured <= 0:
+        return 0
+    # Single-connection pools (e.g. in-memory SQLite) hold one connection
+    if not isinstance(pool, QueuePool):
+        return 1
+    # Connections beyond pool_size are closed as soon as they are returned
+    return min(settings.DB_POOL_SIZE, configured if configured is not None else settings.DB_POOL_SIZE)
+
+
+def create_tables() -> None:
+    """Create missing tables (in production, use Alembic migrations)."""
+    Base.metadata.create_all(bind=get_engine())
+
+
+def warm_pool(engine: Engine) -> int:
+    """Open the warmup connections at once, then return them to the pool."""
+    count = _warmup_connections(engine.pool)
+    with contextlib.ExitStack() as stack:
+        for _ in range(count):
+            stack.enter_context(engine.connect()).exec_driver_sql("SELECT 1")
+    return count
+
+
+async def warm_async_pool(engine: AsyncEngine) -> int:
+    count = _warmup_connections(engine.sync_engine.pool)
+    async with contextlib.AsyncExitStack() as stack:
+        for _ in range(count):
+            connection = await stack.enter_async_context(engine.connect())
+            await connection.exec_driver_sql("SELECT 1")
+    return count
+
+
+def warm_caches() -> dict:
+    """Fill the in-process caches that the first requests would otherwise build."""
+    db = get_session_factory()()
+    try:
+        templates = template_catalog.warm(db)
+    finally:
+        db.close()
+    get_hashing_pool()
+    # A misconfigured PROGRESS_BROKER fails here rather than in a commit hook
+    get_broker()
+    # passlib selects and loads the bcrypt backend on first use
+    get_pwd_context().handler("bcrypt").get_backend()
+    return {"templates": templates}
+
+
+async def warm_up() -> dict:
+    """Prepare the database and caches; the app is ready when this returns."""
+    started = time.perf_counter()
+    if settings.DB_CREATE_TABLES:
+        create_tables()
+
+    pools = {"primary": warm_pool(get_engine())}
+    replica = get_replica_engine()
+    if replica is not None:
+        pools["replica"] = warm_pool(replica)
+    for name, engine in (("async", get_async_engine()), ("async_replica", get_async_replica_engine())):
+        if engine is not None:
+            pools[name] = await warm_async_pool(engine)
+
+    report = {
+        "ready": True,
+        "pool_connections": pools,
+        **warm_caches(),
+        "warmup_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    startup_report.update(report)
+    logger.info("Startup warmup finished: %s", report)
+    return report
+
+
+async def shut_down() -> None:
+    startup_report["ready"] = False
+    # Ends open progress streams; their clients reconnect to another worker
+    close_broker()
+    await dispose_engines()
@@ -0,0 +1,74 @@
+"""
+Side-by-side throughput comparison of the sync and async route stacks.
+
+Seeds a throwaway SQLite database with users, profiles and roadmaps, then
+runs the app under uvicorn twice (ASYNC_DATABASE off and on) and drives
+the same authenticated read/write mix against each.
+
+Usage:
+    python -m benchmarks.bench_async_vs_sync [--users 50] [--concurrency 32] [--duration 10]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from benchmarks.common import latency_summary, run_server, seed_users, use_temp_database
+
+use_temp_database("async_vs_sync")
+
+import httpx
+
+
+async def drive(base_url: str, clients, concurrency: int, duration: float):
+    """Issue GET /api/roadmap and PUT step updates (4:1) until duration elapses."""
+    timings = []
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def worker(index: int, http: httpx.AsyncClient):
+        nonlocal errors
+        rng = random.Random(index)
+        while time.monotonic() < deadline:
+            user = clients[rng.randrange(len(clients))]
+            headers = {"Authorization": f"Bearer {user.token}"}
+            start = time.perf_counter()
+            if rng.random() < 0.8:
+                response = await http.get("/api/roadmap", headers=headers)
+            else:
+                response = await http.put(
+                    f"/api/roadmap/steps/{rng.choice(user.step_ids)}",
+                    headers=headers,
+                    json={"status": rng.choice(["in_progress", "completed", "not_started"])}
+                )
+            timings.append((time.perf_counter() - start) * 1000)
+            errors += response.status_code >= 400
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i, http) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return latency_summary(timings, elapsed, errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per mode")
+    args = parser.parse_args()
+
+    clients = seed_users(args.users)
+    print(f"{'mode':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for mode, flag in (("sync", "false"), ("async", "true")):
+        with run_server({"ASYNC_DATABASE": flag}) as base_url:
+            result = asyncio.run(drive(base_url, clients, args.concurrency, args.duration))
+        print(
+            f"{mode:>6} {result['throughput_rps']:>8} {result['p50_ms']:>8} "
+            f"{result['p95_ms']:>8} {result['p99_ms']:>8} {result['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
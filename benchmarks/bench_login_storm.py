@@ -0,0 +1,111 @@
+"""
+Roadmap read latency during a login storm, with and without admission control.
+
+Seeds a throwaway SQLite database, then runs the app under uvicorn twice
+(ADMISSION_CONTROL off and on). Each run floods POST /api/auth/login from
+many concurrent clients while a few readers issue GET /api/roadmap. Reports
+the read latency and errors (including requests that time out), and how
+many logins succeeded, were shed with 503 or failed. The load generator
+runs on the same machine, so on small machines a very large --storm measures
+the client rather than the server.
+
+Usage:
+    python -m benchmarks.bench_login_storm [--storm 50] [--readers 8] [--duration 10]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import BENCHMARK_PASSWORD, latency_summary, run_server, seed_users, use_temp_database
+
+use_temp_database("login_storm")
+
+import httpx
+
+# Requests slower than this count as errors
+REQUEST_TIMEOUT_SECONDS = 10
+MODES = (
+    ("off", {"ADMISSION_CONTROL": "false"}),
+    ("on", {"ADMISSION_CONTROL": "true"}),
+)
+
+
+async def drive(base_url: str, users, storm: int, readers: int, duration: float) -> dict:
+    read_timings, login_timings = [], []
+    read_errors = 0
+    logins = {"ok": 0, "shed": 0, "failed": 0}
+    deadline = time.monotonic() + duration
+
+    async def login_worker(index: int, http: httpx.AsyncClient):
+        user = users[index % len(users)]
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await http.post(
+                    "/api/auth/login", json={"email": user.email, "password": BENCHMARK_PASSWORD}
+                )
+            except httpx.TransportError:
+                logins["failed"] += 1
+                continue
+            finally:
+                login_timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code == 200:
+                logins["ok"] += 1
+            elif response.status_code == 503:
+                logins["shed"] += 1
+                await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+            else:
+                logins["failed"] += 1
+
+    async def read_worker(index: int, http: httpx.AsyncClient):
+        nonlocal read_errors
+        user = users[index % len(users)]
+        headers = {"Authorization": f"Bearer {user.token}"}
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await http.get("/api/roadmap", headers=headers)
+                read_errors += response.status_code >= 400
+            except httpx.TransportError:
+                read_errors += 1
+            read_timings.append((time.perf_counter() - start) * 1000)
+
+    limits = httpx.Limits(max_connections=storm + readers)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=REQUEST_TIMEOUT_SECONDS) as http:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(login_worker(i, http) for i in range(storm)),
+            *(read_worker(i, http) for i in range(readers)),
+        )
+        elapsed = time.perf_counter() - started
+    return {
+        "reads": latency_summary(read_timings, elapsed, read_errors),
+        "logins": {**logins, **latency_summary(login_timings, elapsed)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--storm", type=int, default=50, help="concurrent login clients")
+    parser.add_argument("--readers", type=int, default=8, help="concurrent GET /api/roadmap clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per mode")
+    args = parser.parse_args()
+
+    users = seed_users(args.users, prefix="storm")
+    print(
+        f"{'admission':>9} {'read/s':>8} {'read p50':>9} {'read p99':>9} {'read err':>9} "
+        f"{'logins ok':>10} {'shed':>7} {'failed':>7} {'login p99':>10}"
+    )
+    for mode, env in MODES:
+        with run_server(env) as base_url:
+            result = asyncio.run(drive(base_url, users, args.storm, args.readers, args.duration))
+        reads, logins = result["reads"], result["logins"]
+        print(
+            f"{mode:>9} {reads['throughput_rps']:>8} {reads['p50_ms']:>9} {reads['p99_ms']:>9} "
+            f"{reads['errors']:>9} {logins['ok']:>10} {logins['shed']:>7} {logins['failed']:>7} {logins['p99_ms']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
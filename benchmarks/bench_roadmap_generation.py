@@ -0,0 +1,148 @@
+"""
+Benchmark roadmap generation latency as template size grows.
+
+Compares the set-based generate_roadmap_for_user against the previous
+per-step ORM materialization on a throwaway SQLite database.
+
+Usage:
+    python -m benchmarks.bench_roadmap_generation [--users 50] [--sizes 10,50,100,250,500]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+# Point the app at a throwaway database before anything imports settings
+_db_dir = tempfile.mkdtemp(prefix="career_navigator_bench_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'bench.db')}")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app.database import Base, SessionLocal, engine
+from app.models import RoadmapStep, RoadmapTemplate, User, UserRoadmap, UserRoadmapStep
+from app.models.roadmap_steps import StepStatus
+from app.models.student_profile import Branch, CareerGoal, StudentProfile
+from app.services.roadmap_service import find_matching_template, generate_roadmap_for_user
+
+
+class StatementCounter:
+    """Count SQL statements sent through the engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def legacy_generate(db, user_id, profile):
+    """Per-step ORM materialization, kept for comparison."""
+    template = find_matching_template(db, profile.branch, profile.career_goal, profile.current_year)
+    roadmap = UserRoadmap(
+        user_id=user_id,
+        template_id=template.id,
+        created_at=datetime.utcnow()
+    )
+    db.add(roadmap)
+    db.flush()
+
+    template_steps = db.query(RoadmapStep).filter(
+        RoadmapStep.template_id == template.id
+    ).order_by(RoadmapStep.order).all()
+    for step in template_steps:
+        db.add(UserRoadmapStep(roadmap_id=roadmap.id, step_id=step.id, status=StepStatus.NOT_STARTED))
+
+    db.commit()
+    db.refresh(roadmap)
+    return roadmap
+
+
+def create_template(db, career_goal, step_count):
+    template = RoadmapTemplate(
+        name=f"Benchmark {step_count} steps",
+        career_goal=career_goal,
+        branch=None,
+        start_year=1,
+        end_year=4,
+        is_active=True
+    )
+    db.add(template)
+    db.flush()
+    db.add_all([
+        RoadmapStep(template_id=template.id, title=f"Step {order}", order=order, estimated_duration="1 week")
+        for order in range(1, step_count + 1)
+    ])
+    db.commit()
+
+
+def create_users(db, count, career_goal, offset):
+    profiles = []
+    for i in range(count):
+        user = User(email=f"bench{offset + i}@example.com", hashed_password="x")
+        db.add(user)
+        db.flush()
+        profile = StudentProfile(
+            user_id=user.id,
+            branch=Branch.CSE,
+            current_year=2,
+            current_semester=1,
+            career_goal=career_goal
+        )
+        db.add(profile)
+        profiles.append(profile)
+    db.commit()
+    return profiles
+
+
+def run(generate, db, profiles, counter):
+    timings = []
+    statements = []
+    for profile in profiles:
+        before = counter.count
+        start = time.perf_counter()
+        generate(db, profile.user_id, profile)
+        timings.append((time.perf_counter() - start) * 1000)
+        statements.append(counter.count - before)
+    return timings, statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=50, help="roadmaps generated per size and strategy")
+    parser.add_argument("--sizes", default="10,50,100,250,500", help="comma-separated template step counts")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    goals = list(CareerGoal)
+    if len(sizes) > len(goals):
+        parser.error(f"at most {len(goals)} sizes are supported")
+
+    Base.metadata.create_all(bind=engine)
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+
+    db = SessionLocal()
+    offset = 0
+    print(f"{'steps':>6} {'strategy':>8} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9} {'stmts':>6}")
+    try:
+        for size, career_goal in zip(sizes, goals):
+            create_template(db, career_goal, size)
+            for name, generate in (("legacy", legacy_generate), ("bulk", generate_roadmap_for_user)):
+                profiles = create_users(db, args.users, career_goal, offset)
+                offset += args.users
+                timings, statements = run(generate, db, profiles, counter)
+                p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+                print(
+                    f"{size:>6} {name:>8} {statistics.median(timings):>9.2f} {p95:>9.2f} "
+                    f"{statistics.fmean(timings):>9.2f} {max(statements):>6}"
+                )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
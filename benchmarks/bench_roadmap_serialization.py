@@ -0,0 +1,171 @@
+"""
+Benchmark GET /api/roadmap serialization as roadmaps grow.
+
+Serves the same roadmap two ways from a throwaway SQLite database: the
+validated path (ORM objects checked against RoadmapResponse by FastAPI) and
+the fast path (plain rows encoded with FastJSONResponse). Verifies that both
+produce identical bytes before timing them.
+
+Usage:
+    python -m benchmarks.bench_roadmap_serialization [--requests 200] [--sizes 10,100,1000]
+"""
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.common import use_temp_database
+
+use_temp_database("serialization")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import serialization
+from app.api.serialization import FastJSONResponse
+from app.database import Base, SessionLocal, engine
+from app.models import RoadmapStep, RoadmapTemplate, User, UserRoadmap, UserRoadmapStep
+from app.models.roadmap_steps import StepStatus
+from app.models.student_profile import CareerGoal
+from app.schemas.roadmap import RoadmapResponse
+from app.services.roadmap_service import (
+    get_roadmap_document,
+    get_roadmap_progress,
+    refresh_progress_counters,
+)
+
+bench_app = FastAPI()
+
+
+@bench_app.get("/validated/{roadmap_id}", response_model=RoadmapResponse)
+def validated(roadmap_id: int):
+    db = SessionLocal()
+    try:
+        return get_roadmap_progress(db, db.get(UserRoadmap, roadmap_id))
+    finally:
+        db.close()
+
+
+@bench_app.get("/fast/{roadmap_id}")
+def fast(roadmap_id: int):
+    db = SessionLocal()
+    try:
+        return FastJSONResponse(get_roadmap_document(db, db.get(UserRoadmap, roadmap_id)))
+    finally:
+        db.close()
+
+
+def create_roadmap(db, career_goal, step_count, offset):
+    """Create a template with step_count steps and a partly completed roadmap for it."""
+    template = RoadmapTemplate(
+        name=f"Benchmark {step_count} steps",
+        career_goal=career_goal,
+        start_year=1,
+        end_year=4,
+        is_active=True
+    )
+    db.add(template)
+    db.flush()
+    steps = [
+        RoadmapStep(
+            template_id=template.id,
+            title=f"Step {order}: Build & ship — part {order}",
+            description=f"Work through topic {order}.\nInclude \"quoted\" notes and café-style unicode.",
+            order=order,
+            estimated_duration="1 week",
+            resources="https://docs.python.org/3/, https://fastapi.tiangolo.com/"
+        )
+        for order in range(1, step_count + 1)
+    ]
+    db.add_all(steps)
+
+    user = User(email=f"serialization{offset}@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    roadmap = UserRoadmap(user_id=user.id, template_id=template.id, created_at=datetime.utcnow())
+    db.add(roadmap)
+    db.flush()
+
+    completed = step_count // 3
+    for step in steps:
+        if step.order <= completed:
+            status, completed_at = StepStatus.COMPLETED, datetime.utcnow()
+        elif step.order == completed + 1:
+            status, completed_at = StepStatus.IN_PROGRESS, None
+        else:
+            status, completed_at = StepStatus.NOT_STARTED, None
+        db.add(UserRoadmapStep(
+            roadmap_id=roadmap.id,
+            step_id=step.id,
+            status=status,
+            notes="Done\twith tabs" if completed_at else None,
+            completed_at=completed_at
+        ))
+    db.flush()
+    refresh_progress_counters(db, roadmap.id)
+    db.commit()
+    return roadmap.id
+
+
+def measure(client, path, requests):
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.get(path)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200, help="requests per size and path")
+    parser.add_argument("--sizes", default="10,100,1000", help="comma-separated roadmap step counts")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    goals = list(CareerGoal)
+    if len(sizes) > len(goals):
+        parser.error(f"at most {len(goals)} sizes are supported")
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        roadmap_ids = [
+            create_roadmap(db, career_goal, size, offset)
+            for offset, (size, career_goal) in enumerate(zip(sizes, goals))
+        ]
+    finally:
+        db.close()
+
+    encoder = "orjson" if serialization.orjson is not None else "json"
+    print(f"encoder: {encoder}")
+    print(f"{'steps':>6} {'path':>10} {'p50 ms':>9} {'mean ms':>9} {'bytes':>9} {'speedup':>8}")
+
+    identical = True
+    with TestClient(bench_app) as client:
+        for size, roadmap_id in zip(sizes, roadmap_ids):
+            expected = client.get(f"/validated/{roadmap_id}").content
+            actual = client.get(f"/fast/{roadmap_id}").content
+            if actual != expected:
+                identical = False
+                print(f"{size:>6} output differs from the validated path", file=sys.stderr)
+
+            results = {}
+            for name in ("validated", "fast"):
+                results[name] = measure(client, f"/{name}/{roadmap_id}", args.requests)
+
+            baseline = statistics.median(results["validated"])
+            for name, timings in results.items():
+                p50 = statistics.median(timings)
+                print(
+                    f"{size:>6} {name:>10} {p50:>9.2f} {statistics.fmean(timings):>9.2f} "
+                    f"{len(expected):>9} {baseline / p50:>7.2f}x"
+                )
+
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
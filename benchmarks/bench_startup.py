@@ -0,0 +1,187 @@
+"""
+Import-time and cold-start benchmark.
+
+Import: imports app.main, then the scripts, in fresh interpreters whose
+environment has none of the settings (and no .env in the working directory),
+so any import that reads the settings fails. Reports the app.main import time
+and checks that the imports are side-effect free: the settings are not read
+and no engine is built.
+
+Cold start: starts app.main:app under uvicorn against a seeded throwaway
+SQLite database and measures the time until the server answers /health
+(after the lifespan warmup), then the first authenticated GET /api/roadmap
+and the steady-state latency after it. Runs once with the default warmup and
+once with DB_POOL_WARMUP_CONNECTIONS=0.
+
+Results are written as JSON so runs can be compared between commits. Exits
+with a non-zero status if importing the app or a script read the settings or
+touched the database.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 5]
+    python -m benchmarks.bench_startup --compare benchmarks/results/bench_startup-abc1234.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.common import RESULTS_DIR, ROOT_DIR, git_commit, run_server, seed_users, use_temp_database
+
+use_temp_database("startup")
+
+import httpx
+
+from app.core.config import Settings
+
+# Run in a fresh interpreter; prints the import time, whether the settings
+# were read and the engines built
+IMPORT_PROBE = """
+import json, time
+started = time.perf_counter()
+import app.main
+elapsed_ms = (time.perf_counter() - started) * 1000
+import scripts.generate_dataset, scripts.import_templates, scripts.purge_refresh_tokens
+import scripts.rebuild_cohorts, scripts.resync_roadmaps, scripts.seed_roadmaps
+import app.core.config, app.database
+print(json.dumps({
+    "import_ms": elapsed_ms,
+    "settings_read": app.core.config.get_settings.cache_info().currsize > 0,
+    "engines_built": sorted(app.database.built_engines()),
+}))
+"""
+# Requests measured after the first one
+STEADY_REQUESTS = 20
+VARIANTS = {
+    "warmup": {},
+    "no_pool_warmup": {"DB_POOL_WARMUP_CONNECTIONS": "0"},
+}
+
+
+def _stats(values):
+    return {
+        "mean_ms": round(statistics.fmean(values), 2),
+        "min_ms": round(min(values), 2),
+        "max_ms": round(max(values), 2),
+    }
+
+
+def measure_import(runs: int) -> dict:
+    import_ms, process_ms, side_effects = [], [], []
+    # No settings at all: an import that reads them raises instead of passing quietly
+    env = {name: value for name, value in os.environ.items() if name not in Settings.model_fields}
+    env["PYTHONPATH"] = ROOT_DIR
+    for run in range(runs):
+        started = time.perf_counter()
+        probe_run = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE],
+            cwd=tempfile.mkdtemp(prefix="career_navigator_import_"), env=env, capture_output=True, text=True
+        )
+        process_ms.append((time.perf_counter() - started) * 1000)
+        if probe_run.returncode != 0:
+            # The exception line, not the details printed after it
+            lines = probe_run.stderr.strip().splitlines() or ["no output"]
+            error = next((line for line in reversed(lines) if "Error:" in line), lines[-1])
+            side_effects.append(f"run {run}: import failed without settings: {error}")
+            continue
+        probe = json.loads(probe_run.stdout.strip().splitlines()[-1])
+        import_ms.append(probe["import_ms"])
+        if probe["settings_read"]:
+            side_effects.append(f"run {run}: the settings were read at import")
+        if probe["engines_built"]:
+            side_effects.append(f"run {run}: engines built at import: {', '.join(probe['engines_built'])}")
+    return {
+        "app_main": _stats(import_ms) if import_ms else None,
+        "interpreter": _stats(process_ms),
+        "side_effects": side_effects,
+    }
+
+
+def measure_cold_start(runs: int, token: str, env: dict) -> dict:
+    ready_ms, first_ms, steady_ms = [], [], []
+    headers = {"Authorization": f"Bearer {token}"}
+    for _ in range(runs):
+        started = time.perf_counter()
+        with run_server(env, poll_interval=0.005) as base_url:
+            ready_ms.append((time.perf_counter() - started) * 1000)
+            with httpx.Client(base_url=base_url, headers=headers) as client:
+                request_started = time.perf_counter()
+                client.get("/api/roadmap").raise_for_status()
+                first_ms.append((time.perf_counter() - request_started) * 1000)
+                timings = []
+                for _ in range(STEADY_REQUESTS):
+                    request_started = time.perf_counter()
+                    client.get("/api/roadmap").raise_for_status()
+                    timings.append((time.perf_counter() - request_started) * 1000)
+                steady_ms.append(statistics.median(timings))
+    return {
+        "ready": _stats(ready_ms),
+        "first_request": _stats(first_ms),
+        "steady_request": _stats(steady_ms),
+    }
+
+
+def print_results(results: dict, baseline: dict = None) -> None:
+    header = f"{'measurement':<36} {'mean ms':>9} {'min ms':>9} {'max ms':>9}"
+    if baseline:
+        header += f" {'mean vs base':>13}"
+    print(header)
+    for group, measurements in results.items():
+        for name, stats in measurements.items():
+            if not isinstance(stats, dict):
+                continue
+            line = f"{group + ' ' + name:<36} {stats['mean_ms']:>9} {stats['min_ms']:>9} {stats['max_ms']:>9}"
+            base = ((baseline or {}).get(group) or {}).get(name)
+            if base:
+                change = (stats["mean_ms"] - base["mean_ms"]) / base["mean_ms"] * 100 if base["mean_ms"] else 0.0
+                line += f" {change:>+12.1f}%"
+            print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters / server starts per measurement")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/bench_startup-<commit>-<time>.json)")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args()
+
+    results = {"import": measure_import(args.runs)}
+    (user,) = seed_users(1, prefix="startup")
+    for variant, env in VARIANTS.items():
+        results[variant] = measure_cold_start(args.runs, user.token, env)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    print_results(results, baseline)
+
+    side_effects = results["import"]["side_effects"]
+    for problem in side_effects:
+        print(f"FAIL {problem}")
+
+    commit = git_commit()
+    started_at = datetime.now(timezone.utc)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"bench_startup-{commit}-{started_at.strftime('%Y%m%d%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "benchmark": "bench_startup",
+            "commit": commit,
+            "started_at": started_at.isoformat(),
+            "config": {"runs": args.runs},
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+    return 1 if side_effects else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+Microbenchmark: cached vs uncached JWT decoding.
+
+Uncached numbers clear the verified-token cache before every decode, so
+each call pays the full python-jose signature verification.
+
+Usage:
+    python -m benchmarks.bench_token_decode [--iterations 20000] [--tokens 100]
+"""
+import argparse
+import time
+
+from benchmarks.common import use_temp_database
+
+use_temp_database("token_decode")
+
+from app.core.security import create_access_token, decode_access_token, token_cache
+
+
+def measure(tokens, iterations: int, cached: bool) -> float:
+    """Return decodes per second."""
+    token_cache.clear()
+    if cached:
+        for token in tokens:
+            decode_access_token(token)
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        if not cached:
+            token_cache.clear()
+        assert decode_access_token(tokens[i % len(tokens)]) is not None
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--tokens", type=int, default=100, help="distinct tokens in rotation")
+    args = parser.parse_args()
+
+    tokens = [
+        create_access_token({"sub": f"user{i}@example.com", "user_id": i})
+        for i in range(args.tokens)
+    ]
+    uncached = measure(tokens, args.iterations, cached=False)
+    cached = measure(tokens, args.iterations, cached=True)
+    print(f"uncached: {uncached:>12,.0f} decodes/s  ({1e6 / uncached:.1f} us/decode)")
+    print(f"cached:   {cached:>12,.0f} decodes/s  ({1e6 / cached:.1f} us/decode)")
+    print(f"speedup:  {cached / uncached:>12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
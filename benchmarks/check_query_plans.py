@@ -0,0 +1,216 @@
+"""
+EXPLAIN-based check that the hot roadmap queries use indexes.
+
+Builds a throwaway database with the Alembic migrations (so the check covers
+the migrated schema, not create_all), seeds users with roadmaps, then runs
+the roadmap service calls while capturing the query plan of every statement
+they execute. Exits with a non-zero status when a plan scans one of the hot
+tables instead of searching an index, so it can gate CI.
+
+SQLite is used by default. Point DATABASE_URL at an empty PostgreSQL
+database to check PostgreSQL plans instead; sequential scans are disabled
+there so small tables do not hide a missing index.
+
+Usage:
+    python -m benchmarks.check_query_plans [--users 50] [--verbose]
+"""
+import argparse
+import io
+import json
+import os
+import sys
+from contextlib import contextmanager
+
+from benchmarks.common import ROOT_DIR, seed_users, use_temp_database
+
+use_temp_database("plans")
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import event, text
+
+from app.database import SessionLocal, engine
+from app.models import RoadmapStep, RoadmapTemplate, StudentProfile, User, UserRoadmap, UserRoadmapStep
+from app.models.roadmap_steps import StepStatus
+from app.services.roadmap_service import (
+    generate_roadmap_for_user,
+    get_roadmap_document,
+    get_roadmap_progress,
+    get_roadmap_step_page,
+    get_roadmap_step_window,
+    get_roadmap_summary,
+    get_user_roadmap,
+    update_step_status,
+    update_step_statuses,
+)
+from app.services.refresh_tokens import issue_refresh_token, revoke_refresh_token, rotate_refresh_token
+from app.services.template_catalog import template_catalog
+from app.services.template_import import import_templates
+from app.services.template_resync import diff_templates, resync_roadmaps
+
+# Tables every request touches; a full scan of any of them is a failure
+HOT_TABLES = ("user_roadmaps", "user_roadmap_steps", "roadmap_steps", "refresh_tokens")
+
+
+@contextmanager
+def capture_plans(plans):
+    """Record (statement, plan lines) for every statement executed in the block."""
+    dialect = engine.dialect.name
+
+    def explain(conn, cursor, statement, parameters, context, executemany):
+        if executemany:
+            return
+        if dialect == "sqlite":
+            cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+            lines = [row[3] for row in cursor.fetchall()]
+        else:
+            cursor.execute("EXPLAIN " + statement, parameters)
+            lines = [row[0] for row in cursor.fetchall()]
+        plans.append((statement, lines))
+
+    event.listen(engine, "before_cursor_execute", explain)
+    try:
+        yield
+    finally:
+        event.remove(engine, "before_cursor_execute", explain)
+
+
+def full_scans(lines):
+    """Plan lines that read a hot table without an index search."""
+    scans = []
+    for line in lines:
+        words = line.replace("(", " ").split()
+        if engine.dialect.name == "sqlite":
+            # "SCAN user_roadmap_steps" or "SCAN user_roadmap_steps_1 USING COVERING INDEX ..."
+            is_scan = words[:1] == ["SCAN"]
+            table = words[1] if len(words) > 1 else ""
+        else:
+            # "Seq Scan on user_roadmap_steps  (cost=...)"
+            is_scan = words[:3] == ["Seq", "Scan", "on"]
+            table = words[3] if len(words) > 3 else ""
+        if is_scan and any(table == name or table.startswith(name + "_") for name in HOT_TABLES):
+            scans.append(line.strip())
+    return scans
+
+
+def template_import_file(db, template_id):
+    """NDJSON re-import of a template without its last step, which user roadmaps reference."""
+    template = db.get(RoadmapTemplate, template_id)
+    steps = db.query(RoadmapStep).filter(RoadmapStep.template_id == template_id).order_by(RoadmapStep.order).all()
+    record = {
+        "name": template.name,
+        "version": template.version,
+        "branch": template.branch.value if template.branch else None,
+        "career_goal": template.career_goal.value,
+        "steps": [{"title": step.title, "order": step.order} for step in steps[:-1]],
+    }
+    return io.StringIO(json.dumps(record) + "\n")
+
+
+def template_new_version(db, template_id):
+    """A next version of a template with its first step dropped, the rest reversed and one step added."""
+    template = db.get(RoadmapTemplate, template_id)
+    steps = db.query(RoadmapStep).filter(RoadmapStep.template_id == template_id).order_by(RoadmapStep.order).all()
+    new_version = RoadmapTemplate(
+        name=template.name,
+        version=template.version + 1,
+        branch=template.branch,
+        career_goal=template.career_goal,
+        is_active=False,
+    )
+    db.add(new_version)
+    db.flush()
+    titles = [step.title for step in reversed(steps[1:])] + ["New step"]
+    db.add_all(RoadmapStep(template_id=new_version.id, title=title, order=order) for order, title in enumerate(titles, 1))
+    return new_version.id
+
+
+def migrate():
+    config = Config(os.path.join(ROOT_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ROOT_DIR, "alembic"))
+    command.upgrade(config, "head")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=50, help="users (with roadmaps) to seed")
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not only failures")
+    args = parser.parse_args()
+
+    migrate()
+    users = seed_users(args.users, prefix="plans")
+    # A fresh user without a roadmap exercises generation
+    new_user = seed_users(1, prefix="plans-new", with_roadmaps=False)[0]
+
+    db = SessionLocal()
+    try:
+        if engine.dialect.name == "sqlite":
+            db.execute(text("ANALYZE"))
+        else:
+            db.execute(text("SET enable_seqscan = off"))
+        user_id = db.query(UserRoadmap.user_id).first()[0]
+        roadmap = get_user_roadmap(db, user_id)
+        step_ids = [
+            step_id for (step_id,) in db.query(UserRoadmapStep.step_id).filter(
+                UserRoadmapStep.roadmap_id == roadmap.id
+            )
+        ]
+        new_user_id = db.query(User.id).filter(User.email == new_user.email).scalar()
+        profile = db.query(StudentProfile).filter(StudentProfile.user_id == new_user_id).one()
+        new_version_id = template_new_version(db, roadmap.template_id)
+        db.commit()
+        # The catalog loads every active template on purpose; keep it out of the check
+        template_catalog.match(db, profile.branch, profile.career_goal, profile.current_year)
+        import_file = template_import_file(db, roadmap.template_id)
+        refresh_token = issue_refresh_token(db, user_id)
+        db.commit()
+        rotated = {}
+
+        checks = [
+            ("get_user_roadmap", lambda: get_user_roadmap(db, user_id)),
+            ("get_roadmap_progress", lambda: get_roadmap_progress(db, get_user_roadmap(db, user_id))),
+            ("get_roadmap_document", lambda: get_roadmap_document(db, get_user_roadmap(db, user_id))),
+            ("get_roadmap_summary", lambda: get_roadmap_summary(db, user_id)),
+            ("get_roadmap_step_page", lambda: get_roadmap_step_page(db, get_roadmap_summary(db, user_id), limit=5, after=2)),
+            ("get_roadmap_step_window", lambda: get_roadmap_step_window(db, get_roadmap_summary(db, user_id), 5, 20)),
+            ("update_step_status (start)", lambda: update_step_status(db, user_id, step_ids[0], StepStatus.IN_PROGRESS)),
+            ("update_step_status (complete)", lambda: update_step_status(db, user_id, step_ids[0], StepStatus.COMPLETED, "done")),
+            ("update_step_status (reopen)", lambda: update_step_status(db, user_id, step_ids[0], StepStatus.NOT_STARTED)),
+            ("update_step_statuses", lambda: update_step_statuses(db, user_id, [
+                (step_id, StepStatus.COMPLETED, None) for step_id in step_ids[:3]
+            ])),
+            ("generate_roadmap_for_user", lambda: generate_roadmap_for_user(db, new_user_id, profile)),
+            ("import_templates", lambda: import_templates(db, import_file, "ndjson")),
+            ("rotate_refresh_token", lambda: rotated.update(token=rotate_refresh_token(db, refresh_token)[1])),
+            ("revoke_refresh_token", lambda: revoke_refresh_token(db, rotated["token"])),
+            # Last: moves the seeded roadmaps off their template. Batches are a
+            # small part of user_roadmaps in production; on a table this small a
+            # larger batch is planned as a (correct) scan
+            ("resync_roadmaps", lambda: resync_roadmaps(
+                db, diff_templates(db, roadmap.template_id, new_version_id), batch_size=max(1, args.users // 10)
+            )),
+        ]
+
+        failures = 0
+        for name, call in checks:
+            plans = []
+            with capture_plans(plans):
+                call()
+            scans = [scan for _, lines in plans for scan in full_scans(lines)]
+            failures += bool(scans)
+            print(f"{'FAIL' if scans else 'ok  '} {name} ({len(plans)} statements)")
+            for statement, lines in plans:
+                bad = full_scans(lines)
+                if bad or args.verbose:
+                    print("       " + " ".join(statement.split())[:120])
+                    for line in lines:
+                        print(f"         {'!' if line.strip() in bad else ' '} {line.strip()}")
+    finally:
+        db.close()
+
+    print(f"{len(users)} seeded users, {engine.dialect.name}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Read-replica routing check with two SQLite files.
+
+The primary and the "replica" are separate SQLite files. The replica is a
+copy of the primary taken after seeding, so it never receives later writes
+and behaves like a replica that lags forever. The check writes to the
+primary and then reads through the app to verify that:
+
+- pure reads of a user who has not written are served by the replica;
+- a user's reads go to the primary for the read-your-writes window after
+  their own write, and back to the replica once it has passed (with
+  --window 0 they stay on the replica);
+- writes always go to the primary.
+
+Exits with a non-zero status when any routing expectation fails.
+
+Usage:
+    python -m benchmarks.check_replica_routing [--async] [--window 1.0]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description="Check read-replica routing with two SQLite files")
+parser.add_argument("--async", dest="use_async", action="store_true", help="check the async route stack")
+parser.add_argument("--window", type=float, default=1.0, help="REPLICA_READ_YOUR_WRITES_SECONDS to run with")
+args = parser.parse_args()
+
+_db_dir = tempfile.mkdtemp(prefix="career_navigator_replica_")
+PRIMARY_PATH = os.path.join(_db_dir, "primary.db")
+REPLICA_PATH = os.path.join(_db_dir, "replica.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{PRIMARY_PATH}"
+os.environ["REPLICA_DATABASE_URL"] = f"sqlite:///{REPLICA_PATH}"
+os.environ["REPLICA_READ_YOUR_WRITES_SECONDS"] = str(args.window)
+os.environ["ASYNC_DATABASE"] = "true" if args.use_async else "false"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+
+from app.database import engine, replica_engine
+from app.main import app
+from app.models import StudentProfile, User
+from benchmarks.common import seed_users
+
+SEEDED_SKILLS = None
+PRIMARY_SKILLS = "written to the primary only"
+API_SKILLS = "written through the API"
+
+
+def _replicate() -> None:
+    """Snapshot the primary into the replica file."""
+    engine.dispose()
+    replica_engine.dispose()
+    shutil.copyfile(PRIMARY_PATH, REPLICA_PATH)
+
+
+def _replica_skills(email: str):
+    with replica_engine.connect() as connection:
+        return connection.execute(
+            select(StudentProfile.current_skills).join(User, User.id == StudentProfile.user_id).where(
+                User.email == email
+            )
+        ).scalar()
+
+
+def main() -> int:
+    reader, writer = seed_users(2, prefix="replica")
+    _replicate()
+
+    # Diverge the primary behind the app's back: the replica keeps the old value
+    with engine.begin() as connection:
+        connection.execute(update(StudentProfile).values(current_skills=PRIMARY_SKILLS))
+
+    failures = 0
+
+    def expect(description: str, actual, expected) -> None:
+        nonlocal failures
+        ok = actual == expected
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {description}" + ("" if ok else f" (got {actual!r}, expected {expected!r})"))
+
+    with TestClient(app) as client:
+        def skills(user) -> str:
+            response = client.get("/api/profile", headers={"Authorization": f"Bearer {user.token}"})
+            response.raise_for_status()
+            return response.json()["current_skills"]
+
+        def summary(user) -> dict:
+            response = client.get("/api/roadmap/summary", headers={"Authorization": f"Bearer {user.token}"})
+            response.raise_for_status()
+            return response.json()
+
+        expect("profile read without a recent write is served by the replica", skills(reader), SEEDED_SKILLS)
+        expect("roadmap summary is served by the replica", summary(reader)["completed_steps"], 0)
+
+        headers = {"Authorization": f"Bearer {writer.token}"}
+        client.put("/api/profile", json={"current_skills": API_SKILLS}, headers=headers).raise_for_status()
+        client.put(
+            f"/api/roadmap/steps/{writer.step_ids[0]}", json={"status": "completed"}, headers=headers
+        ).raise_for_status()
+        expect("profile write reached the primary only", _replica_skills(writer.email), SEEDED_SKILLS)
+        if args.window > 0:
+            expect("read right after a write is served by the primary", skills(writer), API_SKILLS)
+            expect("roadmap summary after a step update is served by the primary", summary(writer)["completed_steps"], 1)
+        else:
+            expect("with no window, reads after a write stay on the replica", skills(writer), SEEDED_SKILLS)
+        expect("another user's reads stay on the replica", skills(reader), SEEDED_SKILLS)
+
+        if args.window > 0:
+            time.sleep(args.window + 0.2)
+            expect("reads return to the replica after the window", skills(writer), SEEDED_SKILLS)
+
+        print(f"     {'async' if args.use_async else 'sync'} routes, read-your-writes window {args.window}s")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Query-count regression check for update_step_status.
+
+Every status transition must stay within STATEMENT_BUDGET SQL statements
+(the set-based step UPDATE plus the cohort aggregate upsert and counter
+UPDATE of the progress refresh). Exits with
+a non-zero status when any transition goes over budget, so it can gate CI.
+
+Usage:
+    python -m benchmarks.check_step_update_budget
+"""
+import os
+import sys
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="career_navigator_budget_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'budget.db')}")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from sqlalchemy import event
+
+from app.database import Base, SessionLocal, engine
+from app.models import RoadmapStep, RoadmapTemplate, User
+from app.models.roadmap_steps import StepStatus
+from app.models.student_profile import Branch, CareerGoal, StudentProfile
+from app.services.roadmap_service import generate_roadmap_for_user, update_step_status
+
+STATEMENT_BUDGET = 3
+
+# (description, step order, new status, notes)
+TRANSITIONS = [
+    ("start first step", 1, StepStatus.IN_PROGRESS, None),
+    ("complete first step (auto-advance)", 1, StepStatus.COMPLETED, "done"),
+    ("complete already completed step", 1, StepStatus.COMPLETED, None),
+    ("start a later step", 5, StepStatus.IN_PROGRESS, None),
+    ("reopen completed step", 1, StepStatus.NOT_STARTED, "redo"),
+    ("complete last step", 10, StepStatus.COMPLETED, None),
+    ("unknown step", None, StepStatus.COMPLETED, None),
+]
+
+
+def main() -> int:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        template = RoadmapTemplate(
+            name="Budget check",
+            career_goal=CareerGoal.PYTHON_BACKEND_DEVELOPER,
+            start_year=1,
+            end_year=4
+        )
+        db.add(template)
+        db.flush()
+        steps = [RoadmapStep(template_id=template.id, title=f"Step {order}", order=order) for order in range(1, 11)]
+        db.add_all(steps)
+        user = User(email="budget@example.com", hashed_password="x")
+        db.add(user)
+        db.flush()
+        profile = StudentProfile(
+            user_id=user.id,
+            branch=Branch.CSE,
+            current_year=1,
+            current_semester=1,
+            career_goal=CareerGoal.PYTHON_BACKEND_DEVELOPER
+        )
+        db.add(profile)
+        db.commit()
+        user_id = user.id
+        step_ids = {step.order: step.id for step in steps}
+        generate_roadmap_for_user(db, user_id, profile)
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        failures = 0
+        for description, order, status, notes in TRANSITIONS:
+            statements.clear()
+            update_step_status(db, user_id, step_ids.get(order, -1), status, notes)
+            ok = len(statements) <= STATEMENT_BUDGET
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {len(statements)}/{STATEMENT_BUDGET} statements  {description}")
+            if not ok:
+                for statement in statements:
+                    print("       " + " ".join(statement.split())[:120])
+    finally:
+        db.close()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Check that template versions reach new and existing roadmaps.
+
+Imports version 1 of a template and generates a roadmap from it, imports
+version 2 with a step added and one removed, then checks that a new
+roadmap is generated from version 2 and that template_resync moves the
+first roadmap onto it. Finally re-imports version 2 without a step the
+roadmaps reference, and checks that the step is retired: kept in the
+existing roadmaps but not given to new ones. Last, re-imports it unchanged,
+with the retired step listed again and with a step renamed, and checks that
+only the changes bump the version (ETag) of the template's roadmaps. Exits
+with a non-zero status on any failure, so it can gate CI.
+
+Usage:
+    python -m benchmarks.check_template_versions
+"""
+import io
+import json
+import sys
+
+from benchmarks.common import use_temp_database
+
+use_temp_database("versions")
+
+from sqlalchemy import select
+
+from app.database import Base, SessionLocal, engine
+from app.models import RoadmapStep, User, UserRoadmap, UserRoadmapStep
+from app.models.student_profile import Branch, CareerGoal, StudentProfile
+from app.services.roadmap_service import generate_roadmap_for_user
+from app.services.template_import import import_templates
+from app.services.template_resync import diff_templates, resync_roadmaps
+
+TEMPLATE_NAME = "Version check"
+
+
+def template_file(version, titles):
+    record = {
+        "name": TEMPLATE_NAME,
+        "version": version,
+        "branch": Branch.CSE.value,
+        "career_goal": CareerGoal.PYTHON_BACKEND_DEVELOPER.value,
+        "steps": [{"title": title, "order": order} for order, title in enumerate(titles, 1)],
+    }
+    return io.StringIO(json.dumps(record) + "\n")
+
+
+def new_roadmap(db, email):
+    """Register a CSE backend student and generate their roadmap."""
+    user = User(email=email, hashed_password="x")
+    db.add(user)
+    db.flush()
+    profile = StudentProfile(
+        user_id=user.id,
+        branch=Branch.CSE,
+        current_year=1,
+        current_semester=1,
+        career_goal=CareerGoal.PYTHON_BACKEND_DEVELOPER
+    )
+    db.add(profile)
+    db.commit()
+    return generate_roadmap_for_user(db, user.id, profile)
+
+
+def roadmap_titles(db, roadmap_id):
+    return db.scalars(
+        select(RoadmapStep.title).join(UserRoadmapStep).where(
+            UserRoadmapStep.roadmap_id == roadmap_id
+        ).order_by(RoadmapStep.order)
+    ).all()
+
+
+def main() -> int:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    failures = 0
+
+    def check(description, actual, expected):
+        nonlocal failures
+        ok = actual == expected
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {description}" + ("" if ok else f": {actual!r} != {expected!r}"))
+
+    try:
+        import_templates(db, template_file(1, ["Basics", "Git", "SQL"]), "ndjson")
+        first = new_roadmap(db, "version-1@example.com")
+        v1_id = first.template_id
+        check("roadmap generated from version 1", roadmap_titles(db, first.id), ["Basics", "Git", "SQL"])
+
+        import_templates(db, template_file(2, ["Basics", "SQL", "Docker"]), "ndjson")
+        second = new_roadmap(db, "version-2@example.com")
+        check("new roadmap generated from version 2", roadmap_titles(db, second.id), ["Basics", "SQL", "Docker"])
+        v2_id = second.template_id
+
+        resync_roadmaps(db, diff_templates(db, v1_id))
+        db.expire_all()
+        check("resync moves version 1 roadmaps", db.get(UserRoadmap, first.id).template_id, v2_id)
+        check("resynced roadmap has version 2 steps", roadmap_titles(db, first.id), ["Basics", "SQL", "Docker"])
+
+        report = import_templates(db, template_file(2, ["Basics"]), "ndjson")
+        check("re-import retains referenced steps", (report.steps_removed, report.steps_retained), (0, 2))
+        third = new_roadmap(db, "version-2-retired@example.com")
+        check("new roadmap skips retired steps", roadmap_titles(db, third.id), ["Basics"])
+        check("existing roadmaps keep retired steps", roadmap_titles(db, second.id), ["Basics", "SQL", "Docker"])
+
+        def version(roadmap):
+            db.expire_all()
+            return db.get(UserRoadmap, roadmap.id).version
+
+        before = version(second)
+        import_templates(db, template_file(2, ["Basics"]), "ndjson")
+        check("unchanged re-import keeps roadmap versions", version(second), before)
+        import_templates(db, template_file(2, ["Basics", "SQL"]), "ndjson")
+        check("reviving a step bumps its roadmaps' versions", version(second), before + 1)
+        import_templates(db, template_file(2, ["Python basics", "SQL"]), "ndjson")
+        check("renaming a step bumps its roadmaps' versions", version(second), before + 2)
+        check("renamed step shows in existing roadmaps", roadmap_titles(db, second.id), ["Python basics", "SQL", "Docker"])
+    finally:
+        db.close()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""Shared helpers for benchmarks: throwaway databases, app servers and stats."""
+import contextlib
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+
+BENCHMARK_PASSWORD = "benchmark-password"
+
+
+@dataclass
+class BenchUser:
+    email: str
+    token: str
+    step_ids: List[int] = field(default_factory=list)
+
+
+def use_temp_database(name: str = "bench") -> str:
+    """Point the app at a throwaway SQLite file; call before importing app modules."""
+    db_dir = tempfile.mkdtemp(prefix="career_navigator_bench_")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(db_dir, f'{name}.db')}")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    return os.environ["DATABASE_URL"]
+
+
+def seed_users(count: int, prefix: str = "bench", with_roadmaps: bool = True) -> List[BenchUser]:
+    """Create users with profiles (and roadmaps) from the seed_roadmaps templates.
+    
+    All users share one pre-computed password hash so seeding does not pay
+    bcrypt per user. Templates are seeded on first use.
+    """
+    from app.core.security import create_access_token, get_password_hash
+    from app.database import Base, SessionLocal, engine
+    from app.models import RoadmapTemplate, UserRoadmapStep
+    from app.models.student_profile import Branch, CareerGoal, StudentProfile
+    from app.models.user import User
+    from app.services.roadmap_service import generate_roadmap_for_user
+    from scripts.seed_roadmaps import seed_roadmaps
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if db.query(RoadmapTemplate).count() == 0:
+            seed_roadmaps()
+
+        hashed_password = get_password_hash(BENCHMARK_PASSWORD)
+        users = []
+        for i in range(count):
+            user = User(email=f"{prefix}{i}@example.com", hashed_password=hashed_password)
+            db.add(user)
+            db.flush()
+            profile = StudentProfile(
+                user_id=user.id,
+                branch=Branch.CSE,
+                current_year=2,
+                current_semester=1,
+                career_goal=CareerGoal.PYTHON_BACKEND_DEVELOPER
+            )
+            db.add(profile)
+            db.commit()
+
+            bench_user = BenchUser(
+                email=user.email,
+                token=create_access_token({"sub": user.email, "user_id": user.id})
+            )
+            if with_roadmaps:
+                roadmap = generate_roadmap_for_user(db, user.id, profile)
+                bench_user.step_ids = [
+                    step_id for (step_id,) in db.query(UserRoadmapStep.step_id).filter(
+                        UserRoadmapStep.roadmap_id == roadmap.id
+                    )
+                ]
+            users.append(bench_user)
+        return users
+    finally:
+        db.close()
+
+
+def issue_refresh_tokens(users: List[BenchUser], count: int) -> List[str]:
+    """Issue `count` refresh tokens spread over the users; each can be refreshed once."""
+    from app.database import SessionLocal
+    from app.models.user import User
+    from app.services.refresh_tokens import issue_refresh_token
+
+    db = SessionLocal()
+    try:
+        user_ids = [
+            user_id for (user_id,) in db.query(User.id).filter(User.email.in_([user.email for user in users]))
+        ]
+        tokens = [issue_refresh_token(db, user_ids[i % len(user_ids)]) for i in range(count)]
+        db.commit()
+        return tokens
+    finally:
+        db.close()
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def run_server(
+    env: Optional[Dict[str, str]] = None,
+    workers: int = 1,
+    poll_interval: float = 0.1
+) -> Iterator[str]:
+    """Run app.main:app under uvicorn in a subprocess and yield its base URL."""
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=ROOT_DIR,
+        env={**os.environ, **(env or {})},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                if httpx.get(f"{base_url}/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("uvicorn did not become healthy")
+            time.sleep(poll_interval)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            # Stuck requests can keep uvicorn from shutting down gracefully
+            process.kill()
+            process.wait()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def latency_summary(timings_ms: List[float], elapsed_s: float, errors: int = 0) -> Dict[str, float]:
+    """Throughput and latency percentiles for one endpoint or run."""
+    return {
+        "requests": len(timings_ms),
+        "errors": errors,
+        "throughput_rps": round(len(timings_ms) / elapsed_s, 1) if elapsed_s else 0.0,
+        "mean_ms": round(statistics.fmean(timings_ms), 2) if timings_ms else 0.0,
+        "p50_ms": round(percentile(timings_ms, 50), 2),
+        "p95_ms": round(percentile(timings_ms, 95), 2),
+        "p99_ms": round(percentile(timings_ms, 99), 2),
+    }
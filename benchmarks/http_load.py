@@ -0,0 +1,188 @@
+"""
+HTTP load and latency benchmark for the main API endpoints.
+
+Runs app.main:app under uvicorn against a throwaway SQLite database seeded
+with users, profiles and roadmaps from the seed_roadmaps templates, then
+drives each endpoint in turn at a fixed concurrency. Reports throughput and
+p50/p95/p99 latency per endpoint and writes the results as JSON so runs can
+be compared between commits.
+
+Usage:
+    python -m benchmarks.http_load [--users 200] [--concurrency 16] [--requests 500]
+    python -m benchmarks.http_load --compare benchmarks/results/http_load-abc1234.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from benchmarks.common import (
+    BENCHMARK_PASSWORD,
+    RESULTS_DIR,
+    git_commit,
+    issue_refresh_tokens,
+    latency_summary,
+    run_server,
+    seed_users,
+    use_temp_database,
+)
+
+use_temp_database("http_load")
+
+import httpx
+
+ENDPOINTS = ["register", "login", "refresh", "get_roadmap", "generate", "update_step"]
+
+
+def build_requests(endpoint: str, users, generate_users, refresh_tokens, run_id: str):
+    """Return a callable producing (method, url, kwargs) for the next request."""
+    counter = itertools.count()
+    rng = random.Random(endpoint)
+
+    def auth(user):
+        return {"Authorization": f"Bearer {user.token}"}
+
+    if endpoint == "register":
+        return lambda: ("POST", "/api/auth/register", {"json": {
+            "email": f"register-{run_id}-{next(counter)}@example.com",
+            "password": BENCHMARK_PASSWORD,
+        }})
+    if endpoint == "login":
+        return lambda: ("POST", "/api/auth/login", {"json": {
+            "email": rng.choice(users).email,
+            "password": BENCHMARK_PASSWORD,
+        }})
+    if endpoint == "refresh":
+        # Refresh tokens are single-use, so every request spends a pre-issued one
+        return lambda: ("POST", "/api/auth/refresh", {"json": {"refresh_token": refresh_tokens[next(counter)]}})
+    if endpoint == "get_roadmap":
+        return lambda: ("GET", "/api/roadmap", {"headers": auth(rng.choice(users))})
+    if endpoint == "generate":
+        # Each user without a roadmap generates once; later calls return the existing one
+        return lambda: ("POST", "/api/roadmap/generate", {
+            "headers": auth(generate_users[next(counter) % len(generate_users)])
+        })
+    if endpoint == "update_step":
+        def update_step():
+            user = rng.choice(users)
+            return ("PUT", f"/api/roadmap/steps/{rng.choice(user.step_ids)}", {
+                "headers": auth(user),
+                "json": {"status": rng.choice(["in_progress", "completed", "not_started"])},
+            })
+        return update_step
+    raise ValueError(endpoint)
+
+
+async def run_endpoint(base_url: str, next_request, total: int, concurrency: int) -> dict:
+    timings = []
+    statuses = Counter()
+    remaining = itertools.count()
+
+    async def worker(http: httpx.AsyncClient):
+        while next(remaining) < total:
+            method, url, kwargs = next_request()
+            start = time.perf_counter()
+            response = await http.request(method, url, **kwargs)
+            timings.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(http) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    errors = sum(count for code, count in statuses.items() if code >= 400)
+    summary = latency_summary(timings, elapsed, errors)
+    summary["status_codes"] = {str(code): count for code, count in sorted(statuses.items())}
+    return summary
+
+
+def print_results(results: dict, baseline: dict = None) -> None:
+    header = f"{'endpoint':<12} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+    if baseline:
+        header += f" {'req/s vs base':>14} {'p95 vs base':>12}"
+    print(header)
+    for endpoint, result in results.items():
+        line = (
+            f"{endpoint:<12} {result['throughput_rps']:>8} {result['p50_ms']:>8} "
+            f"{result['p95_ms']:>8} {result['p99_ms']:>8} {result['errors']:>7}"
+        )
+        base = (baseline or {}).get(endpoint)
+        if base:
+            def change(new, old):
+                return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            line += (
+                f" {change(result['throughput_rps'], base['throughput_rps']):>14}"
+                f" {change(result['p95_ms'], base['p95_ms']):>12}"
+            )
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=200, help="seeded users with roadmaps")
+    parser.add_argument("--generate-users", type=int, default=200, help="seeded users without roadmaps")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="comma-separated subset of " + ",".join(ENDPOINTS))
+    parser.add_argument("--async-db", action="store_true", help="run with ASYNC_DATABASE=true")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/http_load-<commit>-<time>.json)")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args()
+
+    endpoints = [endpoint.strip() for endpoint in args.endpoints.split(",") if endpoint.strip()]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    users = seed_users(args.users, prefix="load")
+    generate_users = seed_users(args.generate_users, prefix="generate", with_roadmaps=False)
+    refresh_tokens = issue_refresh_tokens(users, args.requests) if "refresh" in endpoints else []
+
+    commit = git_commit()
+    started_at = datetime.now(timezone.utc)
+    run_id = started_at.strftime("%Y%m%d%H%M%S")
+    results = {}
+    env = {"ASYNC_DATABASE": "true" if args.async_db else "false"}
+    with run_server(env, workers=args.workers) as base_url:
+        for endpoint in endpoints:
+            next_request = build_requests(endpoint, users, generate_users, refresh_tokens, run_id)
+            results[endpoint] = asyncio.run(
+                run_endpoint(base_url, next_request, args.requests, args.concurrency)
+            )
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    print_results(results, baseline)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"http_load-{commit}-{run_id}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "benchmark": "http_load",
+            "commit": commit,
+            "started_at": started_at.isoformat(),
+            "config": {
+                "users": args.users,
+                "generate_users": args.generate_users,
+                "concurrency": args.concurrency,
+                "requests_per_endpoint": args.requests,
+                "async_db": args.async_db,
+                "workers": args.workers,
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
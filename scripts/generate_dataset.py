@@ -0,0 +1,297 @@
+"""
+Script to generate a large synthetic dataset for capacity testing.
+
+Creates users, each with a student profile and a roadmap generated from an
+active template that matches the profile (seeding the sample templates if
+there are none). Roadmap steps are in realistic mixed states: most students
+have finished a prefix of their roadmap and are working on the next step,
+and a few have skipped ahead or not started at all. The output is fully
+determined by --seed.
+
+Rows are bulk loaded in chunks, one transaction per chunk, and the ORM is
+not used. PostgreSQL loads with COPY ... FROM STDIN; other databases use
+executemany inserts. The cohort analytics are rebuilt at the end. Ids are
+assigned by the script, so run it against a database that nothing else is
+writing to. All users share one pre-computed password hash, so the load
+does not pay for bcrypt per user.
+
+Usage:
+    python -m scripts.generate_dataset --users 200000 [--seed 42] [--prefix synthetic]
+"""
+import argparse
+import csv
+import enum
+import io
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy import Table, func, select
+
+from app.core.security import get_password_hash
+from app.database import get_engine, get_session_factory
+from app.models import RoadmapTemplate, StudentProfile, User, UserRoadmap, UserRoadmapStep
+from app.models.roadmap_steps import StepStatus
+from app.models.student_profile import Branch, CareerGoal
+from app.models.user import UserRole
+from app.services.cohort_analytics import rebuild_cohorts
+from app.services.template_catalog import CatalogTemplate, template_catalog
+from scripts.seed_roadmaps import seed_roadmaps
+
+DEFAULT_PASSWORD = "synthetic-password"
+# Users loaded per transaction
+DEFAULT_CHUNK_SIZE = 5000
+
+# Relative branch sizes, roughly as in an engineering college intake
+BRANCH_WEIGHTS = {
+    Branch.CSE: 30,
+    Branch.ECE: 18,
+    Branch.MECHANICAL: 15,
+    Branch.EEE: 12,
+    Branch.CIVIL: 10,
+    Branch.CHEMICAL: 6,
+    Branch.AEROSPACE: 5,
+    Branch.BIOMEDICAL: 4,
+}
+FIRST_NAMES = ("Aarav", "Diya", "Ishaan", "Ananya", "Kabir", "Meera", "Rohan", "Saanvi", "Vihaan", "Zara")
+LAST_NAMES = ("Sharma", "Iyer", "Patel", "Reddy", "Khan", "Das", "Menon", "Gupta", "Singh", "Nair")
+# Roadmaps are created within this many days before the reference time
+ROADMAP_AGE_DAYS = 540
+
+COLUMNS = {
+    "users": ("id", "email", "hashed_password", "full_name", "role", "is_active"),
+    "student_profiles": (
+        "id", "user_id", "branch", "current_year", "current_semester", "career_goal", "current_skills", "version"
+    ),
+    "user_roadmaps": (
+        "id", "user_id", "template_id", "created_at", "cohort_branch", "cohort_year", "cohort_career_goal",
+        "total_steps", "completed_steps", "in_progress_steps", "not_started_steps", "current_step_id", "version"
+    ),
+    "user_roadmap_steps": ("id", "roadmap_id", "step_id", "status", "notes", "completed_at"),
+}
+TABLES: Dict[str, Table] = {
+    table.name: table
+    for table in (User.__table__, StudentProfile.__table__, UserRoadmap.__table__, UserRoadmapStep.__table__)
+}
+
+
+def _copy_value(value):
+    """Render a value the way COPY's CSV format expects it (None -> unquoted empty = NULL)."""
+    if isinstance(value, enum.Enum):
+        # Enums are stored by name
+        return value.name
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+
+def _load(connection, table_name: str, rows: List[tuple]) -> None:
+    """Bulk load rows (tuples in COLUMNS order) into a table."""
+    if not rows:
+        return
+    columns = COLUMNS[table_name]
+    if connection.dialect.name == "postgresql":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows([_copy_value(value) for value in row] for row in rows)
+        buffer.seek(0)
+        quote = connection.dialect.identifier_preparer.quote
+        cursor = connection.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {quote(table_name)} ({', '.join(quote(column) for column in columns)}) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+    else:
+        connection.execute(TABLES[table_name].insert(), [dict(zip(columns, row)) for row in rows])
+
+
+def _next_ids(connection) -> Dict[str, int]:
+    return {
+        name: (connection.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+        for name, table in TABLES.items()
+    }
+
+
+def _reset_sequences(connection) -> None:
+    """Move PostgreSQL id sequences past the ids assigned by the script."""
+    if connection.dialect.name != "postgresql":
+        return
+    for name in TABLES:
+        connection.exec_driver_sql(
+            f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 1) FROM {name}))"
+        )
+
+
+def _profile_choices() -> List[Tuple[Branch, int, CareerGoal, CatalogTemplate]]:
+    """Every (branch, year, goal) that some active template covers, with its template."""
+    db = get_session_factory()()
+    try:
+        if db.query(RoadmapTemplate).count() == 0:
+            seed_roadmaps()
+        choices = []
+        for branch in Branch:
+            for year in range(1, 5):
+                for goal in CareerGoal:
+                    template = template_catalog.match(db, branch, goal, year)
+                    if template is not None and template.steps:
+                        choices.append((branch, year, goal, template))
+        return choices
+    finally:
+        db.close()
+
+
+def _step_states(rng: random.Random, step_count: int) -> List[StepStatus]:
+    """Statuses for a roadmap's steps, in step order."""
+    statuses = [StepStatus.NOT_STARTED] * step_count
+    if rng.random() < 0.1:
+        # Generated but never touched
+        return statuses
+    completed = min(step_count, int(rng.random() ** 1.5 * (step_count + 1)))
+    for index in range(completed):
+        statuses[index] = StepStatus.COMPLETED
+    if completed < step_count and rng.random() < 0.7:
+        statuses[completed] = StepStatus.IN_PROGRESS
+    if completed + 2 < step_count and rng.random() < 0.15:
+        # Skipped ahead to a later step
+        statuses[rng.randrange(completed + 2, step_count)] = rng.choice(
+            (StepStatus.COMPLETED, StepStatus.IN_PROGRESS)
+        )
+    return statuses
+
+
+def generate(
+    users: int,
+    seed: int,
+    prefix: str,
+    password: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict[str, int]:
+    """Generate and load the dataset; returns the number of rows per table."""
+    rng = random.Random(seed)
+    choices = _profile_choices()
+    if not choices:
+        raise RuntimeError("No active template has steps; seed or import templates first")
+    # Spread each branch's weight over its choices so branch sizes follow BRANCH_WEIGHTS
+    per_branch = {branch: sum(1 for choice in choices if choice[0] == branch) for branch in Branch}
+    weights = [BRANCH_WEIGHTS[branch] / per_branch[branch] for branch, _, _, _ in choices]
+    hashed_password = get_password_hash(password)
+    # Fixed so the same seed produces the same rows
+    reference_time = datetime(2026, 1, 1)
+
+    with get_engine().connect() as connection:
+        taken = connection.execute(
+            select(func.count()).select_from(User.__table__).where(User.email.like(f"{prefix}-%@example.com"))
+        ).scalar()
+        if taken:
+            raise RuntimeError(f"{taken} users with the prefix {prefix!r} already exist; pass another --prefix")
+        ids = _next_ids(connection)
+
+    counts = {name: 0 for name in COLUMNS}
+    for chunk_start in range(0, users, chunk_size):
+        rows: Dict[str, List[tuple]] = {name: [] for name in COLUMNS}
+        for index in range(chunk_start, min(users, chunk_start + chunk_size)):
+            user_id = ids["users"] + index
+            profile_id = ids["student_profiles"] + index
+            roadmap_id = ids["user_roadmaps"] + index
+            branch, year, goal, template = rng.choices(choices, weights)[0]
+
+            full_name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            rows["users"].append((
+                user_id, f"{prefix}-{index}@example.com", hashed_password, full_name, UserRole.STUDENT, True
+            ))
+            rows["student_profiles"].append((
+                profile_id, user_id, branch, year, rng.randint(1, 2), goal, None, 1
+            ))
+
+            created_at = reference_time - timedelta(seconds=rng.randrange(ROADMAP_AGE_DAYS * 86400))
+            statuses = _step_states(rng, len(template.steps))
+            completed_at = created_at
+            current_step_id = None
+            for step, status in zip(template.steps, statuses):
+                finished = None
+                if status == StepStatus.COMPLETED:
+                    completed_at += timedelta(seconds=rng.randrange(1, 21 * 86400))
+                    finished = min(completed_at, reference_time)
+                rows["user_roadmap_steps"].append((
+                    ids["user_roadmap_steps"] + counts["user_roadmap_steps"] + len(rows["user_roadmap_steps"]),
+                    roadmap_id,
+                    step.id,
+                    status,
+                    "Done" if finished is not None and rng.random() < 0.2 else None,
+                    finished,
+                ))
+            # Same rule as the service: first in-progress step, else first not started
+            for wanted in (StepStatus.IN_PROGRESS, StepStatus.NOT_STARTED):
+                current_step_id = next(
+                    (step.id for step, status in zip(template.steps, statuses) if status == wanted), None
+                )
+                if current_step_id is not None:
+                    break
+            rows["user_roadmaps"].append((
+                roadmap_id,
+                user_id,
+                template.id,
+                created_at,
+                branch,
+                year,
+                goal,
+                len(statuses),
+                statuses.count(StepStatus.COMPLETED),
+                statuses.count(StepStatus.IN_PROGRESS),
+                statuses.count(StepStatus.NOT_STARTED),
+                current_step_id,
+                1,
+            ))
+
+        with get_engine().begin() as connection:
+            for name in COLUMNS:
+                _load(connection, name, rows[name])
+        for name in COLUMNS:
+            counts[name] += len(rows[name])
+
+    with get_engine().begin() as connection:
+        _reset_sequences(connection)
+
+    # The bulk load bypasses roadmap_service, so recompute the cohort analytics
+    db = get_session_factory()()
+    try:
+        rebuild_cohorts(db)
+    finally:
+        db.close()
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=100000, help="users to create, each with a profile and roadmap")
+    parser.add_argument("--seed", type=int, default=42, help="random seed; the same seed produces the same rows")
+    parser.add_argument("--prefix", default="synthetic", help="email prefix (<prefix>-<n>@example.com)")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="password shared by every generated user")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="users per transaction")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        counts = generate(args.users, args.seed, args.prefix, args.password, args.chunk_size)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+
+    total = sum(counts.values())
+    for name, count in counts.items():
+        print(f"   {name:<20} {count:>12,}")
+    print(f"✅ Loaded {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s, {get_engine().dialect.name})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Script to import roadmap templates from an NDJSON or CSV file.
+
+The file is streamed and written in batches, so it can be arbitrarily large.
+Templates are upserted by (name, version), so rerunning an import is safe.
+See app/services/template_import.py for the file formats.
+
+Usage:
+    python -m scripts.import_templates templates.ndjson [--format csv] [--batch-size 100]
+"""
+import argparse
+import sys
+
+from app.database import get_session_factory
+from app.services.template_import import (
+    DEFAULT_BATCH_SIZE,
+    FORMATS,
+    TemplateFileError,
+    detect_format,
+    import_templates,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", help="NDJSON (.ndjson/.jsonl) or CSV (.csv) file")
+    parser.add_argument("--format", choices=FORMATS, help="file format (default: from the extension)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="templates per transaction")
+    args = parser.parse_args()
+
+    file_format = args.format or detect_format(args.path)
+    if file_format is None:
+        parser.error("cannot infer the format from the file name; pass --format")
+
+    db = get_session_factory()()
+    try:
+        # newline="" lets the csv module handle line breaks inside quoted fields
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            report = import_templates(db, stream, file_format, batch_size=args.batch_size)
+    except TemplateFileError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        db.close()
+
+    for error in report.errors:
+        print(f"line {error.line}: {error.message}")
+    if report.records_failed > len(report.errors):
+        print(f"... and {report.records_failed - len(report.errors)} more invalid records")
+    print(
+        f"{'❌' if report.records_failed else '✅'} Imported {report.templates_created} new and "
+        f"{report.templates_updated} updated templates, {report.steps_written} steps "
+        f"({report.steps_removed} removed, {report.steps_retained} retained), "
+        f"{report.records_failed} invalid records"
+    )
+    print(f"   {report.elapsed_seconds:.2f}s, {report.steps_per_second:,.0f} steps/s")
+    return 1 if report.records_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+"""
+Script to delete expired refresh tokens.
+
+Rotated and revoked tokens are kept until they expire so that reuse can be
+detected; after that they are dead weight. Run this periodically (e.g.
+daily from cron).
+
+Usage:
+    python -m scripts.purge_refresh_tokens
+"""
+from app.database import get_session_factory
+from app.services.refresh_tokens import purge_expired_refresh_tokens
+
+
+def main():
+    db = get_session_factory()()
+    try:
+        deleted = purge_expired_refresh_tokens(db)
+        print(f"✅ Deleted {deleted} expired refresh tokens")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
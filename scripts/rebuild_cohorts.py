@@ -0,0 +1,30 @@
+"""
+Script to rebuild the cohort analytics from the roadmap progress counters.
+
+Recomputes every row of roadmap_cohorts and drops cohorts that no longer
+have roadmaps. The request path keeps the table current incrementally, so
+this is only needed after bulk loads that bypass roadmap_service, or to
+repair it after user_roadmaps was edited by hand. Progress committed while
+it runs may be overwritten; run it while students are not updating roadmaps.
+
+Usage:
+    python -m scripts.rebuild_cohorts
+"""
+import time
+
+from app.database import get_session_factory
+from app.services.cohort_analytics import rebuild_cohorts
+
+
+def main():
+    db = get_session_factory()()
+    try:
+        started = time.perf_counter()
+        cohorts = rebuild_cohorts(db)
+        print(f"✅ Rebuilt {cohorts} cohorts in {time.perf_counter() - started:.2f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
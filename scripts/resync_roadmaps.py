@@ -0,0 +1,77 @@
+"""
+Script to move user roadmaps onto a new version of their template.
+
+Steps are matched by title, so progress and notes on matched steps are kept.
+Roadmaps are moved in batches, one transaction each, so an interrupted run
+can simply be repeated. See app/services/template_resync.py.
+
+Usage:
+    python -m scripts.resync_roadmaps --from 12 [--to 15] [--batch-size 500] [--dry-run]
+"""
+import argparse
+import sys
+
+from app.database import get_session_factory
+from app.services.template_resync import (
+    DEFAULT_BATCH_SIZE,
+    TemplateResyncError,
+    count_roadmaps,
+    diff_templates,
+    resync_roadmaps,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--from", dest="source", type=int, required=True, help="template id the roadmaps follow")
+    parser.add_argument("--to", dest="target", type=int, help="template id to move them to (default: newest later version)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="roadmaps per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="only print the step changes")
+    args = parser.parse_args()
+
+    db = get_session_factory()()
+    try:
+        try:
+            diff = diff_templates(db, args.source, args.target)
+        except TemplateResyncError as e:
+            print(f"❌ {e}")
+            return 1
+        if diff is None:
+            print("❌ Template not found")
+            return 1
+
+        for step in diff.added:
+            print(f"+ {step['order']:>3} {step['title']}")
+        for step in diff.removed:
+            print(f"- {step['order']:>3} {step['title']}")
+        for step in diff.reordered:
+            print(f"~ {step['from_order']:>3} -> {step['to_order']} {step['title']}")
+        total = count_roadmaps(db, diff.source_template_id)
+        print(
+            f"Template {diff.source_template_id} -> {diff.target_template_id}: {len(diff.step_mapping)} matched, "
+            f"{len(diff.added)} added, {len(diff.removed)} removed, {len(diff.reordered)} reordered steps; "
+            f"{total} roadmaps"
+        )
+        if args.dry_run:
+            return 0
+
+        def progress(report):
+            print(
+                f"   batch {report.batches}: {report.roadmaps_resynced}/{total} roadmaps, "
+                f"{report.rows_per_second:,.0f} rows/s"
+            )
+
+        report = resync_roadmaps(db, diff, batch_size=args.batch_size, on_batch=progress)
+    finally:
+        db.close()
+
+    print(
+        f"✅ Resynced {report.roadmaps_resynced} roadmaps in {report.batches} batches: "
+        f"{report.rows_remapped} step rows kept, {report.rows_deleted} deleted, {report.rows_inserted} added"
+    )
+    print(f"   {report.elapsed_seconds:.2f}s, {report.rows_per_second:,.0f} rows/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
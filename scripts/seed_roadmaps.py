@@ -3,7 +3,7 @@ Script to seed initial roadmap templates and steps.
 Run this after setting up the database to populate some sample roadmaps.
 """
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.database import get_session_factory
 from app.models.roadmap_templates import RoadmapTemplate
 from app.models.roadmap_steps import RoadmapStep
 from app.models.student_profile import Branch, CareerGoal
@@ -11,7 +11,7 @@ from app.models.student_profile import Branch, CareerGoal
 
 def seed_roadmaps():
     """Seed initial roadmap templates."""
-    db: Session = SessionLocal()
+    db: Session = get_session_factory()()
     
     try:
         # Example: Python Backend Developer roadmap for CSE students (Year 1-4)